@@ -27,6 +27,7 @@ import re
 from typing import List
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
@@ -82,9 +83,11 @@ class ConfigletInput(object):
 
 
 class CvConfigletTools(object):
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, max_workers: int = DEFAULT_MAX_WORKERS, max_diff_lines: int = None):
         self._cvp_client = cv_connection
         self._ansible = ansible_module
+        self._max_workers = max_workers
+        self._max_diff_lines = max_diff_lines
         self.WINDOWS_LINE_ENDING = '\r\n'
         self.UNIX_LINE_ENDING = '\n'
 
@@ -108,7 +111,7 @@ class CvConfigletTools(object):
             return content.replace(self.WINDOWS_LINE_ENDING, self.UNIX_LINE_ENDING)
         return None
 
-    def _compare(self, fromText: List[str], toText: List[str], fromName: str = 'CVP', toName: str = 'Ansible', lines: int = 10):
+    def _compare(self, fromText: List[str], toText: List[str], fromName: str = 'CVP', toName: str = 'Ansible', lines: int = 10, max_diff_lines: int = None):
         """
         _compare - Compare text string in 'fromText' with 'toText' and produce
             a boolean to indicate if there is a diff between them, along with
@@ -120,19 +123,43 @@ class CvConfigletTools(object):
             '+ '	line unique to sequence 2
             '  '	line common to both sequences
             '? '	line not present in either input sequence
+
+        Texts are compared with their SHA1 hash first and unified diff is only
+        computed when content is different.
+
+        When max_diff_lines is set, unified diff is truncated to this number of lines
+        and a summary with number of added and removed lines is appended.
+        Set max_diff_lines to 0 to only get the summary.
         """
-        fromlines = self._str_cleanup_line_ending(content=fromText).splitlines(1)
-        tolines = self._str_cleanup_line_ending(content=toText).splitlines(1)
-        diff = list(difflib.unified_diff(
-            fromlines, tolines, fromName, toName, n=lines))
         # Calculate and compare hash values to produce the boolean.
         fromHash = hashlib.sha1(fromText.encode()).hexdigest()
         toHash = hashlib.sha1(toText.encode()).hexdigest()
         if fromHash == toHash:
-            cfglet_changed = False
-        else:
-            cfglet_changed = True
-        return [cfglet_changed, diff]
+            return [False, []]
+        fromlines = self._str_cleanup_line_ending(content=fromText).splitlines(1)
+        tolines = self._str_cleanup_line_ending(content=toText).splitlines(1)
+        diff_generator = difflib.unified_diff(
+            fromlines, tolines, fromName, toName, n=lines)
+        if max_diff_lines is None:
+            return [True, list(diff_generator)]
+        diff = list()
+        truncated = False
+        lines_added = 0
+        lines_removed = 0
+        for index, line in enumerate(diff_generator):
+            # Skip file headers '---' and '+++' from counters
+            if index >= 2 and line.startswith('+'):
+                lines_added += 1
+            elif index >= 2 and line.startswith('-'):
+                lines_removed += 1
+            if index < max_diff_lines:
+                diff.append(line)
+            else:
+                truncated = True
+        if truncated:
+            MODULE_LOGGER.info('Diff between %s and %s is truncated to %s lines', str(fromName), str(toName), str(max_diff_lines))
+            diff.append('[diff truncated] {} line(s) added, {} line(s) removed\n'.format(lines_added, lines_removed))
+        return [True, diff]
 
     def is_present(self, configlet_name: str):
         """
@@ -177,7 +204,39 @@ class CvConfigletTools(object):
             return None
         return data
 
-    def apply(self, configlet_list: list, present: bool = True, note: str = 'Managed by Ansible AVD'):
+    def get_configlets_data_cv(self):
+        """
+        get_configlets_data_cv Get information for all configlets from Cloudvision
+
+        Collect all configlets with a single API call and index them by name.
+
+        Example
+        -------
+        >>> CvConfigletTools.get_configlets_data_cv()
+        {
+            'TEAM01-alias': {
+                'name': 'TEAM01-alias',
+                'key': 'configlet_267cc5b4-791d-47d4-a79c-000fc0732802',
+                'config': 'alias a1 show version',
+                'note': 'Managed by Ansible',
+                ...
+            }
+        }
+
+        Returns
+        -------
+        dict
+            Configlets information indexed by configlet name, None if they cannot be collected
+        """
+        try:
+            cv_data = self._cvp_client.api.get_configlets_and_mappers()
+        except CvpApiError as error:
+            MODULE_LOGGER.error('Error getting list of configlets from Cloudvision: %s', str(error))
+            self._ansible.fail_json(msg='Error getting list of configlets from Cloudvision: {}'.format(str(error)))
+            return None
+        return {configlet['name']: configlet for configlet in cv_data['data']['configlets']}
+
+    def apply(self, configlet_list: list, present: bool = True, note: str = 'Managed by Ansible AVD', prefetch: bool = True):
         """
         apply Worker to configure configlets on Cloudvision
 
@@ -187,6 +246,11 @@ class CvConfigletTools(object):
             List of configlets to apply on Cloudvision
         present : bool, optional
             Selector to create/update or delete configlets, by default True
+        note : str, optional
+            Note to add to configlet on Cloudvision, by default 'Managed by Ansible AVD'
+        prefetch : bool, optional
+            Collect all configlets from Cloudvision in a single API call instead of
+            one call per configlet, by default True
 
         Returns
         -------
@@ -196,31 +260,34 @@ class CvConfigletTools(object):
         to_create = list()
         to_update = list()
         to_delete = list()
-        if present:
-            for configlet in configlet_list:
-                cv_data = self.get_configlet_data_cv(
-                    configlet_name=configlet['name'])
-                if self.is_present(configlet_name=configlet['name']):
+        cv_configlets = None
+        if prefetch:
+            cv_configlets = self.get_configlets_data_cv()
+            MODULE_LOGGER.debug('Collected %s configlets from Cloudvision', str(len(cv_configlets)))
+        for configlet in configlet_list:
+            if cv_configlets is not None:
+                cv_data = cv_configlets.get(configlet['name'])
+            else:
+                cv_data = self.get_configlet_data_cv(configlet_name=configlet['name'])
+            if present:
+                if cv_data is not None:
                     configlet['key'] = cv_data['key']
                     configlet['diff'] = self._compare(
-                        fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible')
+                        fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible',
+                        max_diff_lines=self._max_diff_lines)
                     configlet['notediff'] = self._compare(
                         fromText=cv_data['note'], toText=note, fromName='CVP', toName='Ansible')
                     MODULE_LOGGER.debug("configlet note diff: %s", str(configlet['notediff']))
                     if (configlet['diff'][0]) == True or (configlet['notediff'][0] == True):
                         to_update.append(configlet)
-
                 else:
                     to_create.append(configlet)
-        elif present is False:
-            for configlet in configlet_list:
-                cv_data = self.get_configlet_data_cv(
-                    configlet_name=configlet['name'])
-                if self.is_present(configlet_name=configlet['name']):
-                    configlet['key'] = cv_data['key']
-                    configlet['diff'] = self._compare(
-                        fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible')
-                    to_delete.append(configlet)
+            elif cv_data is not None:
+                configlet['key'] = cv_data['key']
+                configlet['diff'] = self._compare(
+                    fromText=cv_data['config'], toText=configlet['config'], fromName='CVP', toName='Ansible',
+                    max_diff_lines=self._max_diff_lines)
+                to_delete.append(configlet)
         ###
         # Structure Ansible Message output
         ###
@@ -290,75 +357,10 @@ class CvConfigletTools(object):
         list
             List of CvApiResult instances
         """
-        response_data = list()
-        configlets_notes = note
-        for configlet in to_update:
-            change_response = CvApiResult(action_name=configlet['name'])
-            if self._ansible.check_mode:
-                change_response.add_entry('[check mode] to be updated')
-                MODULE_LOGGER.info('[check mode] - Configlet %s updated on cloudvision', str(
-                    configlet['name']))
-                change_response.success = True
-                change_response.diff = configlet['diff']
-            else:
-                try:
-                    update_resp = self._cvp_client.api.update_configlet(config=configlet['config'],
-                                                                        key=configlet['key'],
-                                                                        name=configlet['name'],
-                                                                        wait_task_ids=True)
-                except Exception as error:
-                    # Mark module execution with error
-                    # Build error message to report in ansible output
-                    errorMessage = re.split(':', str(error))[-1]
-                    message = "Configlet %s cannot be updated - %s" % (
-                        configlet['name'], errorMessage)
-                    # Add logging to ansible response.
-                    change_response.add_entry(message)
-                    # Generate logging error message
-                    MODULE_LOGGER.error('Error updating configlet %s: %s', str(
-                        configlet['name']), str(error))
-                    self._ansible.fail_json(msg=message)
-                else:
-                    if "errorMessage" in str(update_resp):
-                        # Mark module execution with error
-                        # Build error message to report in ansible output
-                        message = "Configlet %s cannot be updated - %s" % (
-                            configlet['name'], update_resp['errorMessage'])
-                        # Add logging to ansible response.
-                        change_response.add_entry(message)
-                        # Generate logging error message
-                        MODULE_LOGGER.error('Error updating configlet %s: %s', str(
-                            configlet['name']), str(update_resp['errorMessage']))
-                        self._ansible.fail_json(msg=message)
-                    else:
-                        # Inform module a changed has been done
-                        change_response.changed = False
-                        change_response.success = True
-                        # Add note to configlet to mark as managed by Ansible
-                        self._cvp_client.api.add_note_to_configlet(
-                            configlet['key'], configlets_notes)
-                        # Save configlet diff
-                        change_response.add_entry('configlet updated')
-                        if 'diff' in configlet:
-                            # Change changed flag if diff is True
-                            if configlet['diff'] is not None and configlet['diff'][0] == True:
-                                change_response.diff = configlet['diff']
-                                change_response.changed = True
-                                MODULE_LOGGER.info(
-                                    'Found diff in configlet %s.', str(configlet['name']))
-                        if 'notediff' in configlet:
-                            if configlet['notediff'] is not None and configlet['notediff'][0] == True:
-                                change_response.diff = configlet['notediff']
-                                change_response.changed = True
-                                MODULE_LOGGER.info(
-                                    'Found diff in configlet note of configlet %s.', str(configlet['name']))
-                        # Collect generated tasks
-                        if 'taskIds' in update_resp and len(update_resp['taskIds']) > 0:
-                            change_response.taskIds = update_resp['taskIds']
-                        MODULE_LOGGER.info(
-                            'Configlet %s updated on cloudvision', str(configlet['name']))
-            response_data.append(change_response)
-        return response_data
+        results = run_concurrently(function=lambda configlet: self._update_configlet(configlet=configlet, note=note),
+                                   items=to_update,
+                                   max_workers=self._max_workers)
+        return self._collect_results(results=results)
 
     def create(self, to_create, note: str = 'Managed by Ansible AVD'):
         """
@@ -395,53 +397,10 @@ class CvConfigletTools(object):
         list
             List of CvApiResult instances
         """
-        response_data = list()
-        configlets_notes = note
-
-        for configlet in to_create:
-            # Run section to guess changes when module runs with --check flag
-            change_response = CvApiResult(action_name=configlet['name'])
-            if self._ansible.check_mode:
-                change_response.add_entry('[check mode] to be created')
-                MODULE_LOGGER.info('[check mode] - Configlet %s created on cloudvision', str(
-                    configlet['name']))
-                change_response.success = True
-            else:
-                try:
-                    new_resp = self._cvp_client.api.add_configlet(name=configlet['name'], config=configlet['config'])
-                except Exception as error:
-                    # Mark module execution with error
-                    # Build error message to report in ansible output
-                    errorMessage = re.split(':', str(error))[-1]
-                    message = "Configlet %s cannot be created - %s" % (
-                        configlet['name'], errorMessage)
-                    # Add logging to ansible response.
-                    change_response.add_entry(message)
-                    # Generate logging error message
-                    MODULE_LOGGER.error('Error creating configlet %s: %s', str(
-                        configlet['name']), str(error))
-                    self._ansible.fail_json(msg=message)
-                else:
-                    if "errorMessage" in str(new_resp):
-                        # Mark module execution with error
-                        change_response.success = False
-                        # Build error message to report in ansible output
-                        message = "Configlet %s cannot be created - %s" % (
-                            configlet['name'], new_resp['errorMessage'])
-                        # Add logging to ansible response.
-                        change_response.add_entry(message)
-                        # Generate logging error message
-                        MODULE_LOGGER.error(
-                            'Error creating configlet %s: %s', str(configlet['name']), str(new_resp))
-                        self._ansible.fail_json(msg=message)
-                    else:
-                        self._cvp_client.api.add_note_to_configlet(new_resp, configlets_notes)
-                        change_response.add_entry('configlet created')
-                        change_response.changed = True
-                        change_response.success = True
-                        MODULE_LOGGER.info('Configlet %s created on cloudvision', str(configlet['name']))
-            response_data.append(change_response)
-        return response_data
+        results = run_concurrently(function=lambda configlet: self._create_configlet(configlet=configlet, note=note),
+                                   items=to_create,
+                                   max_workers=self._max_workers)
+        return self._collect_results(results=results)
 
     def delete(self, to_delete):
         """
@@ -476,46 +435,214 @@ class CvConfigletTools(object):
         list
             List of CvApiResult instances
         """
-        response_data = list()
-        for configlet in to_delete:
-            change_response = CvApiResult(action_name=configlet['name'])
-            # Run section to guess changes when module runs with --check flag
-            if self._ansible.check_mode:
-                change_response.add_entry('[check mode] to be deleted')
-                MODULE_LOGGER.info('[check mode] - Configlet %s created on cloudvision', str(
-                    configlet['name']))
-            else:
-                try:
-                    delete_resp = self._cvp_client.api.delete_configlet(
-                        name=configlet['name'], key=configlet['key'])
-                except Exception as error:
-                    # Mark module execution with error
-                    # Build error message to report in ansible output
-                    errorMessage = re.split(':', str(error))[-1]
-                    message = "Configlet %s cannot be deleted - %s" % (
-                        configlet['name'], errorMessage)
-                    # Add logging to ansible response.
-                    change_response.add_entry(message)
-                    # Generate logging error message
-                    MODULE_LOGGER.error('Error deleting configlet %s: %s', str(
-                        configlet['name']), str(error))
-                    self._ansible.fail_json(msg=message)
-                else:
-                    if "errorMessage" in str(delete_resp):
-                        # Mark module execution with error
-                        # Build error message to report in ansible output
-                        message = "Configlet %s cannot be deleted - %s" % (
-                            configlet['name'], delete_resp['errorMessage'])
-                        # Add logging to ansible response.
-                        change_response.add_entry(message)
-                        # Generate logging error message
-                        MODULE_LOGGER.error(
-                            'Error deleting configlet %s: %s', str(configlet['name']), str(delete_resp))
-                        self._ansible.fail_json(msg=message)
-                    else:
-                        change_response.add_entry('configlet deleted')
-                        change_response.changed = True
-                        change_response.success = True  # noqa # pylint: disable=unused-variable
-                        MODULE_LOGGER.info('Configlet %s deleted on cloudvision', str(configlet['name']))
-            response_data.append(change_response)
-        return response_data
+        results = run_concurrently(function=self._delete_configlet,
+                                   items=to_delete,
+                                   max_workers=self._max_workers)
+        return self._collect_results(results=results)
+
+    def _collect_results(self, results: list):
+        """
+        _collect_results Extract CvApiResult from workers output and fail module on first error
+
+        Workers never call fail_json themselves as they may run in parallel threads.
+        Errors are reported once all workers are done, in the same order as the configlets.
+
+        Parameters
+        ----------
+        results : list
+            List of tuples (CvApiResult, error message) returned by workers
+
+        Returns
+        -------
+        list
+            List of CvApiResult instances
+        """
+        for change_response, error_message in results:  # noqa # pylint: disable=unused-variable
+            if error_message is not None:
+                self._ansible.fail_json(msg=error_message)
+        return [result[0] for result in results]
+
+    def _update_configlet(self, configlet: dict, note: str = 'Managed by Ansible AVD'):
+        """
+        _update_configlet Worker to update a single configlet on Cloudvision server
+
+        Parameters
+        ----------
+        configlet : dict
+            Configlet to update with name, key and config
+        note : str, optional
+            Note to add to configlet on Cloudvision, by default 'Managed by Ansible AVD'
+
+        Returns
+        -------
+        tuple
+            CvApiResult instance and error message if any, None otherwise
+        """
+        change_response = CvApiResult(action_name=configlet['name'])
+        if self._ansible.check_mode:
+            change_response.add_entry('[check mode] to be updated')
+            MODULE_LOGGER.info('[check mode] - Configlet %s updated on cloudvision', str(
+                configlet['name']))
+            change_response.success = True
+            change_response.diff = configlet['diff']
+            return change_response, None
+        try:
+            update_resp = self._cvp_client.api.update_configlet(config=configlet['config'],
+                                                                key=configlet['key'],
+                                                                name=configlet['name'],
+                                                                wait_task_ids=True)
+        except Exception as error:
+            # Build error message to report in ansible output
+            errorMessage = re.split(':', str(error))[-1]
+            message = "Configlet %s cannot be updated - %s" % (
+                configlet['name'], errorMessage)
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error('Error updating configlet %s: %s', str(
+                configlet['name']), str(error))
+            return change_response, message
+        if "errorMessage" in str(update_resp):
+            # Build error message to report in ansible output
+            message = "Configlet %s cannot be updated - %s" % (
+                configlet['name'], update_resp['errorMessage'])
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error('Error updating configlet %s: %s', str(
+                configlet['name']), str(update_resp['errorMessage']))
+            return change_response, message
+        # Inform module a changed has been done
+        change_response.changed = False
+        change_response.success = True
+        # Add note to configlet to mark as managed by Ansible
+        self._cvp_client.api.add_note_to_configlet(
+            configlet['key'], note)
+        # Save configlet diff
+        change_response.add_entry('configlet updated')
+        if 'diff' in configlet:
+            # Change changed flag if diff is True
+            if configlet['diff'] is not None and configlet['diff'][0] == True:
+                change_response.diff = configlet['diff']
+                change_response.changed = True
+                MODULE_LOGGER.info(
+                    'Found diff in configlet %s.', str(configlet['name']))
+        if 'notediff' in configlet:
+            if configlet['notediff'] is not None and configlet['notediff'][0] == True:
+                change_response.diff = configlet['notediff']
+                change_response.changed = True
+                MODULE_LOGGER.info(
+                    'Found diff in configlet note of configlet %s.', str(configlet['name']))
+        # Collect generated tasks
+        if 'taskIds' in update_resp and len(update_resp['taskIds']) > 0:
+            change_response.taskIds = update_resp['taskIds']
+        MODULE_LOGGER.info(
+            'Configlet %s updated on cloudvision', str(configlet['name']))
+        return change_response, None
+
+    def _create_configlet(self, configlet: dict, note: str = 'Managed by Ansible AVD'):
+        """
+        _create_configlet Worker to create a single configlet on Cloudvision server
+
+        Parameters
+        ----------
+        configlet : dict
+            Configlet to create with name and config
+        note : str, optional
+            Note to add to configlet on Cloudvision, by default 'Managed by Ansible AVD'
+
+        Returns
+        -------
+        tuple
+            CvApiResult instance and error message if any, None otherwise
+        """
+        # Run section to guess changes when module runs with --check flag
+        change_response = CvApiResult(action_name=configlet['name'])
+        if self._ansible.check_mode:
+            change_response.add_entry('[check mode] to be created')
+            MODULE_LOGGER.info('[check mode] - Configlet %s created on cloudvision', str(
+                configlet['name']))
+            change_response.success = True
+            return change_response, None
+        try:
+            new_resp = self._cvp_client.api.add_configlet(name=configlet['name'], config=configlet['config'])
+        except Exception as error:
+            # Build error message to report in ansible output
+            errorMessage = re.split(':', str(error))[-1]
+            message = "Configlet %s cannot be created - %s" % (
+                configlet['name'], errorMessage)
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error('Error creating configlet %s: %s', str(
+                configlet['name']), str(error))
+            return change_response, message
+        if "errorMessage" in str(new_resp):
+            # Mark module execution with error
+            change_response.success = False
+            # Build error message to report in ansible output
+            message = "Configlet %s cannot be created - %s" % (
+                configlet['name'], new_resp['errorMessage'])
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error(
+                'Error creating configlet %s: %s', str(configlet['name']), str(new_resp))
+            return change_response, message
+        self._cvp_client.api.add_note_to_configlet(new_resp, note)
+        change_response.add_entry('configlet created')
+        change_response.changed = True
+        change_response.success = True
+        MODULE_LOGGER.info('Configlet %s created on cloudvision', str(configlet['name']))
+        return change_response, None
+
+    def _delete_configlet(self, configlet: dict):
+        """
+        _delete_configlet Worker to delete a single configlet on Cloudvision server
+
+        Parameters
+        ----------
+        configlet : dict
+            Configlet to delete with name and key
+
+        Returns
+        -------
+        tuple
+            CvApiResult instance and error message if any, None otherwise
+        """
+        change_response = CvApiResult(action_name=configlet['name'])
+        # Run section to guess changes when module runs with --check flag
+        if self._ansible.check_mode:
+            change_response.add_entry('[check mode] to be deleted')
+            MODULE_LOGGER.info('[check mode] - Configlet %s created on cloudvision', str(
+                configlet['name']))
+            return change_response, None
+        try:
+            delete_resp = self._cvp_client.api.delete_configlet(
+                name=configlet['name'], key=configlet['key'])
+        except Exception as error:
+            # Build error message to report in ansible output
+            errorMessage = re.split(':', str(error))[-1]
+            message = "Configlet %s cannot be deleted - %s" % (
+                configlet['name'], errorMessage)
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error('Error deleting configlet %s: %s', str(
+                configlet['name']), str(error))
+            return change_response, message
+        if "errorMessage" in str(delete_resp):
+            # Build error message to report in ansible output
+            message = "Configlet %s cannot be deleted - %s" % (
+                configlet['name'], delete_resp['errorMessage'])
+            # Add logging to ansible response.
+            change_response.add_entry(message)
+            # Generate logging error message
+            MODULE_LOGGER.error(
+                'Error deleting configlet %s: %s', str(configlet['name']), str(delete_resp))
+            return change_response, message
+        change_response.add_entry('configlet deleted')
+        change_response.changed = True
+        change_response.success = True  # noqa # pylint: disable=unused-variable
+        MODULE_LOGGER.info('Configlet %s deleted on cloudvision', str(configlet['name']))
+        return change_response, None
@@ -30,15 +30,21 @@ __metaclass__ = type
 
 import traceback
 import logging
+import threading
+import time
+from collections import deque
 from typing import List
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_CONFIGLETS
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_CONFIGLETS, CvConfigletIndex
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import FIELD_TASK_ID
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently, ThreadSafeModule, WorkerFailure, DEFAULT_MAX_WORKERS
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import cv_save_topology
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
     from cvprac.cvp_client_errors import CvpClientError  # noqa # pylint: disable=unused-import
-    from cvprac.cvp_client_errors import CvpApiError  # noqa # pylint: disable=unused-import
+    from cvprac.cvp_client_errors import CvpApiError, CvpRequestError  # noqa # pylint: disable=unused-import
     HAS_CVPRAC = True
 except ImportError:
     HAS_CVPRAC = False
@@ -64,6 +70,12 @@ FIELD_KEY = 'key'
 FIELD_TOPOLOGY = 'topology'
 FIELD_CONFIGLETS = 'configlets'
 FIELD_CONTAINER_ID = 'containerId'
+FIELD_CHILDREN = 'childContainerList'
+FIELD_NETELEMENT_ID = 'netElementId'
+FIELD_PARENT_KEY = 'parentContainerKey'
+# Lookups of a new container before failing, as its key is not returned on creation
+CONTAINER_LOOKUP_RETRIES = 3
+CONTAINER_LOOKUP_DELAY = 1
 
 
 class ContainerInput(object):
@@ -78,6 +90,10 @@ class ContainerInput(object):
         self.__parent_field: str = FIELD_PARENT_NAME
         self.__root_name = container_root_name
         self.__schema = schema
+        self.__ordered_list = None
+        self.__ordered_levels = None
+        self.__orphan_containers = list()
+        self.__cyclic_containers = list()
         self.__normalize()
 
     def __normalize(self):
@@ -125,6 +141,59 @@ class ContainerInput(object):
             return False
         return True
 
+    def __sort_containers(self):
+        """
+        __sort_containers Topological sort of containers using Kahn algorithm
+
+        Containers attached to root container or to a container not defined in
+        topology (expected to exist on Cloudvision) are used as starting points.
+        Every container is then listed after its parent. Result is saved in
+        instance as topology is not updated after object creation.
+
+        Containers attached to a parent not part of topology are reported as
+        orphans. Containers part of a loop cannot be sorted: they are reported
+        as cyclic and appended at the end of the list.
+        """
+        children = dict()
+        sources = list()
+        self.__orphan_containers = list()
+        self.__cyclic_containers = list()
+        for container_name, container in self.__topology.items():
+            parent_name = container[self.__parent_field]
+            if parent_name in self.__topology and parent_name != container_name:
+                children.setdefault(parent_name, []).append(container_name)
+            elif parent_name == container_name:
+                # Container attached to itself is a loop
+                continue
+            else:
+                if parent_name != self.__root_name:
+                    self.__orphan_containers.append(container_name)
+                sources.append(container_name)
+        if len(self.__orphan_containers) > 0:
+            MODULE_LOGGER.warning('Following containers have a parent not defined in topology, it must exist on Cloudvision: %s',
+                                  str(self.__orphan_containers))
+
+        result_list = list()
+        result_levels = list()
+        queue = deque((container_name, 0) for container_name in sources)
+        while len(queue) > 0:
+            container_name, depth = queue.popleft()
+            result_list.append(container_name)
+            if depth == len(result_levels):
+                result_levels.append(list())
+            result_levels[depth].append(container_name)
+            queue.extend((child, depth + 1) for child in children.get(container_name, []))
+
+        if len(result_list) < len(self.__topology):
+            sorted_containers = set(result_list)
+            self.__cyclic_containers = [item for item in self.__topology if item not in sorted_containers]
+            MODULE_LOGGER.error('Following containers are part of a loop in topology and cannot be sorted: %s',
+                                str(self.__cyclic_containers))
+            result_list = result_list + self.__cyclic_containers
+            result_levels = result_levels + [[item] for item in self.__cyclic_containers]
+        self.__ordered_list = result_list
+        self.__ordered_levels = result_levels
+
     @property
     def ordered_list_containers(self):
         """
@@ -135,29 +204,55 @@ class ContainerInput(object):
         list
             List of containers
         """
-        result_list = list()
-        MODULE_LOGGER.info("Build list of container to create from %s", str(self.__topology))
-
-        while(len(result_list) < len(self.__topology)):
-            container_added = False
-            for container in self.__topology:
-                if self.__topology[container][self.__parent_field] == self.__root_name and container not in result_list:
-                    container_added = True
-                    result_list.append(container)
-                if (any(element == self.__topology[container][self.__parent_field] for element in result_list)
-                        and container not in result_list):
-                    container_added = True
-                    result_list.append(container)
-            if container_added is False:
-                containerWithoutParent = [item for item in self.__topology.keys() if item not in result_list]
-                MODULE_LOGGER.warning(
-                    'Breaking the while loop as the following containers dont have a parent present in the topology %s',
-                    str(containerWithoutParent))
-                result_list = result_list + containerWithoutParent
-                break
+        if self.__ordered_list is None:
+            MODULE_LOGGER.info("Build list of container to create from %s", str(self.__topology))
+            self.__sort_containers()
+            MODULE_LOGGER.info('List of containers to apply on CV: %s', str(self.__ordered_list))
+        return self.__ordered_list
+
+    @property
+    def ordered_levels_containers(self):
+        """
+        ordered_levels_containers List of containers grouped by depth from root to the bottom
 
-        MODULE_LOGGER.info('List of containers to apply on CV: %s', str(result_list))
-        return result_list
+        Containers of a same level do not depend on each other.
+
+        Returns
+        -------
+        list
+            List of list of containers
+        """
+        if self.__ordered_list is None:
+            self.__sort_containers()
+        return self.__ordered_levels
+
+    @property
+    def orphan_containers(self):
+        """
+        orphan_containers List of containers attached to a parent not defined in topology
+
+        Returns
+        -------
+        list
+            List of containers
+        """
+        if self.__ordered_list is None:
+            self.__sort_containers()
+        return self.__orphan_containers
+
+    @property
+    def cyclic_containers(self):
+        """
+        cyclic_containers List of containers part of a loop in topology
+
+        Returns
+        -------
+        list
+            List of containers
+        """
+        if self.__ordered_list is None:
+            self.__sort_containers()
+        return self.__cyclic_containers
 
     def get_parent(self, container_name: str, parent_key: str = FIELD_PARENT_NAME):
         """
@@ -216,15 +311,186 @@ class ContainerInput(object):
         return True
 
 
+class CvContainerSnapshot(object):
+    """
+    CvContainerSnapshot Cloudvision containers topology fetched once and indexed for O(1) lookups
+
+    Containers are indexed by name and key, with list of children for every
+    container. Snapshot is a local view of Cloudvision: it has to be updated
+    with add and remove when containers are created or deleted by the module.
+    """
+
+    def __init__(self, data: dict):
+        self.__lock = threading.Lock()
+        self.__by_name = dict()
+        self.__by_key = dict()
+        self.__children = dict()
+        nodes = deque([data] if data is not None else [])
+        while len(nodes) > 0:
+            node = nodes.popleft()
+            nodes.extend(node.get(FIELD_CHILDREN) or [])
+            self.__index(node={k: v for k, v in node.items() if k != FIELD_CHILDREN})
+        MODULE_LOGGER.debug('Containers snapshot built with %s containers', str(len(self.__by_key)))
+
+    def __index(self, node: dict):
+        """
+        __index Add a container to all indexes
+
+        Parameters
+        ----------
+        node : dict
+            Container data from Cloudvision
+        """
+        self.__by_name[node[FIELD_NAME]] = node
+        self.__by_key[node[FIELD_KEY]] = node
+        self.__children.setdefault(node[FIELD_KEY], list())
+        if node.get(FIELD_PARENT_ID) is not None:
+            self.__children.setdefault(node[FIELD_PARENT_ID], list())
+            if node[FIELD_KEY] not in self.__children[node[FIELD_PARENT_ID]]:
+                self.__children[node[FIELD_PARENT_ID]].append(node[FIELD_KEY])
+
+    def get(self, search_value: str, search_by: str = FIELD_NAME):
+        """
+        get Get container data from snapshot
+
+        Parameters
+        ----------
+        search_value : str
+            Container content to look for
+        search_by : str, optional
+            Field to use to search container (name or key), by default name
+
+        Returns
+        -------
+        dict
+            Container data from Cloudvision, None if not found
+        """
+        if search_by == FIELD_KEY:
+            return self.__by_key.get(search_value)
+        return self.__by_name.get(search_value)
+
+    def get_children(self, container_id: str):
+        """
+        get_children Get keys of containers attached to a container
+
+        Parameters
+        ----------
+        container_id : str
+            Key of the parent container
+
+        Returns
+        -------
+        list
+            List of children keys
+        """
+        return self.__children.get(container_id, list())
+
+    def add(self, container_name: str, container_id: str, parent_id: str):
+        """
+        add Register a container created on Cloudvision
+
+        Parameters
+        ----------
+        container_name : str
+            Name of the new container
+        container_id : str
+            Key of the new container
+        parent_id : str
+            Key of the parent container
+        """
+        with self.__lock:
+            self.__index(node={FIELD_KEY: container_id, FIELD_NAME: container_name, FIELD_PARENT_ID: parent_id,
+                               FIELD_COUNT_CONTAINERS: 0, FIELD_COUNT_DEVICES: 0})
+            parent = self.__by_key.get(parent_id)
+            if parent is not None:
+                parent[FIELD_COUNT_CONTAINERS] = len(self.__children[parent_id])
+
+    def remove(self, container_name: str):
+        """
+        remove Unregister a container deleted from Cloudvision
+
+        Parameters
+        ----------
+        container_name : str
+            Name of the deleted container
+        """
+        with self.__lock:
+            node = self.__by_name.pop(container_name, None)
+            if node is None:
+                return
+            self.__by_key.pop(node[FIELD_KEY], None)
+            self.__children.pop(node[FIELD_KEY], None)
+            siblings = self.__children.get(node.get(FIELD_PARENT_ID), list())
+            if node[FIELD_KEY] in siblings:
+                siblings.remove(node[FIELD_KEY])
+            parent = self.__by_key.get(node.get(FIELD_PARENT_ID))
+            if parent is not None:
+                parent[FIELD_COUNT_CONTAINERS] = len(siblings)
+
+
 class CvContainerTools(object):
     """
     CvContainerTools Class to manage container actions for arista.cvp.cv_container module
     """
 
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False, max_workers: int = DEFAULT_MAX_WORKERS):
         self.__cvp_client = cv_connection
         self.__ansible = ansible_module
         self.__check_mode = ansible_module.check_mode if ansible_module is not None else check_mode
+        self.__max_workers = max_workers
+        self.__configlet_index = None
+        self.__topology = None
+        self.__staged_actions = list()
+        self.__lock = threading.Lock()
+
+    #############################################
+    #   Getters & Setters
+    #############################################
+
+    @property
+    def configlet_index(self):
+        """
+        configlet_index Getter for Cloudvision configlets and mappers index
+
+        Configlets and mappers are collected from Cloudvision on first access only.
+
+        Returns
+        -------
+        CvConfigletIndex
+            Indexed Cloudvision configlets
+        """
+        with self.__lock:
+            if self.__configlet_index is None:
+                self.__configlet_index = CvConfigletIndex(data=self.__cvp_client.api.get_configlets_and_mappers()['data'])
+        return self.__configlet_index
+
+    @property
+    def topology(self):
+        """
+        topology Getter for Cloudvision containers topology snapshot
+
+        Topology is collected from Cloudvision on first access only.
+
+        Returns
+        -------
+        CvContainerSnapshot
+            Indexed Cloudvision containers topology
+        """
+        with self.__lock:
+            if self.__topology is None:
+                try:
+                    cv_data = self.__cvp_client.api.filter_topology(node_id='root')
+                except (CvpApiError, CvpClientError) as error:
+                    message = "Error getting containers topology: " + str(error)
+                    MODULE_LOGGER.error(message)
+                    self.__ansible.fail_json(msg=message)
+                else:
+                    if cv_data is None or FIELD_TOPOLOGY not in cv_data:
+                        message = "Error getting containers topology: " + str(cv_data)
+                        MODULE_LOGGER.error(message)
+                        self.__ansible.fail_json(msg=message)
+                    self.__topology = CvContainerSnapshot(data=cv_data[FIELD_TOPOLOGY])
+        return self.__topology
 
     #############################################
     #   Private functions
@@ -273,14 +539,7 @@ class CvContainerTools(object):
         list
             List of dict {key:, name:} of attached configlets
         """
-        list_configlet = list()
-        info = self.__cvp_client.api.get_configlets_by_container_id(
-            c_id=container_name)
-        info = {k.lower(): v for k, v in info.items()}
-        for attached_configlet in info['configletList']:
-            list_configlet.append(
-                self.__standard_output(source=attached_configlet))
-        return list_configlet
+        return [self.__standard_output(source=configlet) for configlet in self.get_configlets(container_name=container_name)]
 
     def __get_all_configlets(self):
         """
@@ -301,17 +560,14 @@ class CvContainerTools(object):
         list
             List of dict {key:, name:} of attached configlets
         """
-        result = list()
-        list_configlets = self.__cvp_client.api.get_configlets()
-        list_configlets = {k.lower(): v for k, v in list_configlets.items()}
-        for configlet in list_configlets['data']:
-            result.append(self.__standard_output(source=configlet))
-        return result
+        return [self.__standard_output(source=configlet) for configlet in self.configlet_index.configlets]
 
     def __get_configlet_info(self, configlet_name: str):
         """
         __get_configlet_info Get information of a configlet from CV
 
+        Configlet is read from configlet index built with a single call to Cloudvision.
+
         Example
 
         >>> CvContainerTools._get_configlet_info(configlet_name='test')
@@ -331,7 +587,7 @@ class CvContainerTools(object):
             Configlet information in a filtered maner
         """
         MODULE_LOGGER.info('Getting information for configlet %s', str(configlet_name))
-        data = self.__cvp_client.api.get_configlet_by_name(name=configlet_name)
+        data = self.configlet_index.get(search_value=configlet_name, search_by=FIELD_NAME)
         if data is not None:
             return self.__standard_output(source=data)
         return None
@@ -397,12 +653,17 @@ class CvContainerTools(object):
                     MODULE_LOGGER.error(message)
                     self.__ansible.fail_json(msg=message)
                 else:
-                    if 'data' in resp and resp['data']['status'] == 'success':
+                    if not save_topology:
+                        # Action is only staged: taskIds are set by save_topology
+                        self.__stage_action(container=container, result_data=change_response)
+                        self.configlet_index.update_container_configlets(container_id=container[FIELD_KEY], configlets=configlets)
+                    elif 'data' in resp and resp['data']['status'] == 'success':
                         # We assume there is a change as API does not provide information
                         # resp = {'data': {'taskIds': [], 'status': 'success'}}
                         change_response.taskIds = resp['data']['taskIds']
                         change_response.success = True
                         change_response.changed = True
+                        self.configlet_index.update_container_configlets(container_id=container[FIELD_KEY], configlets=configlets)
 
         return change_response
 
@@ -460,15 +721,100 @@ class CvContainerTools(object):
                 MODULE_LOGGER.error(message)
                 self.__ansible.fail_json(msg=message)
             else:
-                if 'data' in resp and resp['data']['status'] == 'success':
+                if not save_topology:
+                    # Action is only staged: taskIds are set by save_topology
+                    self.__stage_action(container=container, result_data=change_response)
+                    self.configlet_index.update_container_configlets(container_id=container[FIELD_KEY], configlets=configlets, remove=True)
+                elif 'data' in resp and resp['data']['status'] == 'success':
                     change_response.taskIds = resp['data']['taskIds']
                     # We assume there is a change as API does not provide information
                     # resp = {'data': {'taskIds': [], 'status': 'success'}}
                     change_response.success = True
                     change_response.changed = True
+                    self.configlet_index.update_container_configlets(container_id=container[FIELD_KEY], configlets=configlets, remove=True)
 
         return change_response
 
+    def __stage_action(self, container: dict, result_data: CvApiResult):
+        """
+        __stage_action Register a configlet action staged on Cloudvision
+
+        Parameters
+        ----------
+        container : dict
+            Container information used in API call. Format: {key:'', name:''}
+        result_data : CvApiResult
+            Result of the action
+        """
+        result_data.success = True
+        result_data.changed = True
+        with self.__lock:
+            self.__staged_actions.append((container[FIELD_KEY], result_data))
+
+    def __get_task_container(self, container_id: str, staged_containers: set):
+        """
+        __get_task_container Get staged container managing a container
+
+        Parameters
+        ----------
+        container_id : str
+            Key of the container where device is attached
+        staged_containers : set
+            Keys of containers with staged actions
+
+        Returns
+        -------
+        str
+            Key of the first staged container in parents of container_id, None if not found
+        """
+        while container_id is not None and container_id not in staged_containers:
+            node = self.topology.get(search_value=container_id, search_by=FIELD_KEY)
+            container_id = node.get(FIELD_PARENT_ID) if node is not None else None
+        return container_id
+
+    def save_topology(self):
+        """
+        save_topology Save all staged actions with a single saveTopology call
+
+        Tasks generated by Cloudvision are collected with a single call and
+        reported to the staged container managing the task device. Containers
+        staged together must not be nested, which is the case for containers
+        of a same level.
+
+        Returns
+        -------
+        list
+            List of taskIds created on Cloudvision
+        """
+        if len(self.__staged_actions) == 0:
+            return list()
+        staged_actions = self.__staged_actions
+        self.__staged_actions = list()
+        try:
+            resp = cv_save_topology(self.__cvp_client)
+        except CvpApiError as error:
+            resp = str(error)
+        if not isinstance(resp, dict) or resp['data']['status'] != 'success':
+            error_message = 'Error saving topology on Cloudvision: {}'.format(str(resp))
+            MODULE_LOGGER.error(error_message)
+            self.__ansible.fail_json(msg=error_message)
+        task_ids = [str(task_id) for task_id in resp['data']['taskIds']]
+        MODULE_LOGGER.info('Topology saved for %s actions, tasks created: %s', str(len(staged_actions)), str(task_ids))
+        staged_containers = {container_id for container_id, result_data in staged_actions}
+        tasks_by_container = dict()
+        if len(staged_containers) == 1:
+            tasks_by_container[next(iter(staged_containers))] = task_ids
+        elif len(task_ids) > 0:
+            devices_container = {device.get(FIELD_KEY): device.get(FIELD_PARENT_KEY) for device in self.__cvp_client.api.get_inventory()}
+            for task in self.__cvp_client.api.get_tasks_by_status('Pending'):
+                if str(task.get(FIELD_TASK_ID)) in task_ids:
+                    container_id = self.__get_task_container(container_id=devices_container.get(task.get(FIELD_NETELEMENT_ID)),
+                                                             staged_containers=staged_containers)
+                    tasks_by_container.setdefault(container_id, list()).append(str(task[FIELD_TASK_ID]))
+        for container_id, result_data in staged_actions:
+            result_data.taskIds = tasks_by_container.get(container_id, list())
+        return task_ids
+
     #############################################
     #   Generic functions
     #############################################
@@ -477,7 +823,7 @@ class CvContainerTools(object):
         """
         get_container_info Collect container information from CV
 
-        Extract information from Cloudvision using provisioning/filterTopology call
+        Extract information from containers topology snapshot
 
         Example
         -------
@@ -501,13 +847,8 @@ class CvContainerTools(object):
         dict
             A standard dictionary with Key, Name, ParentID, Number of children and devices.
         """
-        cv_response = self.__cvp_client.api.get_container_by_name(
-            name=container_name)
-        MODULE_LOGGER.debug('Get container ID (%s) response from cv for container %s', str(cv_response), str(container_name))
-        if cv_response is not None and FIELD_KEY in cv_response:
-            container_id = cv_response[FIELD_KEY]
-            container_facts = self.__cvp_client.api.filter_topology(node_id=container_id)[
-                FIELD_TOPOLOGY]
+        container_facts = self.topology.get(search_value=container_name)
+        if container_facts is not None:
             MODULE_LOGGER.debug('Return info for container %s', str(container_name))
             return self.__standard_output(source=container_facts)
         return None
@@ -516,6 +857,8 @@ class CvContainerTools(object):
         """
         get_configlets Get list of configured configlets for a container
 
+        Configlets are read from configlet index built with a single call to Cloudvision.
+
         Example
         -------
 
@@ -553,17 +896,8 @@ class CvContainerTools(object):
             List of configlets configured on container
         """
         container_id = self.get_container_id(container_name=container_name)
-        configlets_and_mappers = self.__cvp_client.api.get_configlets_and_mappers()
-        configlets_list = configlets_and_mappers['data']['configlets']
-        mappers = configlets_and_mappers['data']['configletMappers']
-        configlets_configured = list()
         MODULE_LOGGER.info('container %s has id %s', str(container_name), str(container_id))
-        for mapper in mappers:
-            if mapper['objectId'] == container_id:
-                MODULE_LOGGER.info(
-                    'Found 1 mappers for container %s : %s', str(container_name), str(mapper))
-                configlets_configured.append(
-                    next((x for x in configlets_list if x['key'] == mapper['configletId'])))
+        configlets_configured = self.configlet_index.get_container_configlets(container_id=container_id)
         MODULE_LOGGER.debug('List of configlets from CV is: %s', str(
             [x['name'] for x in configlets_configured]))
         return configlets_configured
@@ -586,9 +920,8 @@ class CvContainerTools(object):
         str
             Container ID sent by CV
         """
-        container_info = self.__cvp_client.api.get_container_by_name(
-            name=container_name)
-        if FIELD_KEY in container_info:
+        container_info = self.topology.get(search_value=container_name)
+        if container_info is not None and FIELD_KEY in container_info:
             return container_info[FIELD_KEY]
         return None
 
@@ -616,8 +949,9 @@ class CvContainerTools(object):
             True if container has no child nor devices
         """
         container = self.get_container_info(container_name=container_name)
-        if FIELD_COUNT_CONTAINERS in container and FIELD_COUNT_DEVICES in container:
-            if container[FIELD_COUNT_CONTAINERS] == 0 and container[FIELD_COUNT_DEVICES] == 0:
+        if container is not None and FIELD_COUNT_CONTAINERS in container and FIELD_COUNT_DEVICES in container:
+            if (len(self.topology.get_children(container_id=container[FIELD_KEY])) == 0
+                    and container[FIELD_COUNT_DEVICES] == 0):
                 return True
         return False
 
@@ -640,16 +974,7 @@ class CvContainerTools(object):
         bool
             True if container exists, False if not
         """
-        try:
-            cv_data = self.__cvp_client.api.get_container_by_name(name=container_name)
-        except (CvpApiError, CvpClientError) as error:
-            message = "Error getting information for container " + \
-                str(container_name) + \
-                ": " + str(error)
-            MODULE_LOGGER.error(message)
-            self.__ansible.fail_json(msg=message)
-            return True
-        if cv_data is not None:
+        if self.topology.get(search_value=container_name) is not None:
             return True
         return False
 
@@ -657,6 +982,31 @@ class CvContainerTools(object):
     #   Public API
     #############################################
 
+    def __get_created_container(self, container_name: str):
+        """
+        __get_created_container Get data of a container created by the module from CV
+
+        Lookup is retried as a new container may not be listed right after its creation.
+
+        Parameters
+        ----------
+        container_name : str
+            Name of the created container
+
+        Returns
+        -------
+        dict
+            Container data from Cloudvision, None if not found
+        """
+        for attempt in range(CONTAINER_LOOKUP_RETRIES):
+            if attempt > 0:
+                time.sleep(CONTAINER_LOOKUP_DELAY)
+            cv_data = self.__cvp_client.api.get_container_by_name(name=container_name)
+            if cv_data is not None:
+                return cv_data
+            MODULE_LOGGER.warning('Container %s not found on CV after creation (attempt %s)', str(container_name), str(attempt + 1))
+        return None
+
     def create_container(self, container: str, parent: str):
         """
         create_container Worker to send container creation API call to CV
@@ -685,14 +1035,13 @@ class CvContainerTools(object):
         resp = dict()
         change_result = CvApiResult(action_name=container)
         if self.is_container_exists(container_name=parent):
-            parent_id = self.__cvp_client.api.get_container_by_name(name=parent)[
-                FIELD_KEY]
+            parent_id = self.get_container_id(container_name=parent)
             MODULE_LOGGER.debug('Parent container (%s) for container %s exists', str(parent), str(container))
             if self.is_container_exists(container_name=container) is False:
                 if self.__check_mode:
                     change_result.success = True
                     change_result.changed = True
-                    change_result.add_entry(container['name'])
+                    change_result.add_entry(container)
                 else:
                     try:
                         resp = self.__cvp_client.api.add_container(
@@ -708,6 +1057,14 @@ class CvContainerTools(object):
                             change_result.success = True
                             change_result.changed = True
                             change_result.count += 1
+                            # Cloudvision does not return key of the new container
+                            cv_data = self.__get_created_container(container_name=container)
+                            if cv_data is None:
+                                message = "Container " + str(container) + " is created but not found on CV"
+                                MODULE_LOGGER.error(message)
+                                self.__ansible.fail_json(msg=message)
+                            else:
+                                self.topology.add(container_name=container, container_id=cv_data[FIELD_KEY], parent_id=parent_id)
         else:
             message = "Parent container (" + str(
                 parent) + ") is missing for container " + str(container)
@@ -763,7 +1120,7 @@ class CvContainerTools(object):
             # ----------------------------------------------------------------#
             if self.__check_mode:
                 change_result.success = True
-                change_result.add_entry(container['name'])
+                change_result.add_entry(container)
 
             else:
                 try:
@@ -780,9 +1137,10 @@ class CvContainerTools(object):
                         change_result.success = True
                         change_result.changed = True
                         change_result.count += 1
+                        self.topology.remove(container_name=container)
         return change_result
 
-    def configlets_attach(self, container: str, configlets: List[str], strict: bool = False):
+    def configlets_attach(self, container: str, configlets: List[str], strict: bool = False, save_topology: bool = True):
         """
         configlets_attach Worker to send configlet attach to container API call
 
@@ -804,6 +1162,8 @@ class CvContainerTools(object):
             List of configlets to attach
         strict : bool, optional
             Remove configlet not listed in configlets var -- NOT SUPPORTED -- , by default False
+        save_topology : bool, optional
+            Send a save-topology, by default True. Otherwise action is staged until save_topology is called
 
         Returns
         -------
@@ -816,9 +1176,9 @@ class CvContainerTools(object):
             data = self.__get_configlet_info(configlet_name=configlet)
             if data is not None:
                 attach_configlets.append(data)
-        return self.__configlet_add(container=container_info, configlets=attach_configlets)
+        return self.__configlet_add(container=container_info, configlets=attach_configlets, save_topology=save_topology)
 
-    def configlets_detach(self, container: str, configlets: List[str]):
+    def configlets_detach(self, container: str, configlets: List[str], save_topology: bool = True):
         """
         configlets_attach Worker to send configlet detach from container API call
 
@@ -838,6 +1198,8 @@ class CvContainerTools(object):
             Name of the container
         configlets : List[str]
             List of configlets to detach
+        save_topology : bool, optional
+            Send a save-topology, by default True. Otherwise action is staged until save_topology is called
 
         Returns
         -------
@@ -852,7 +1214,101 @@ class CvContainerTools(object):
             if data is not None:
                 detach_configlets.append(data)
         MODULE_LOGGER.info('Sending data to self.__configlet_del: %s', str(detach_configlets))
-        return self.__configlet_del(container=container_info, configlets=detach_configlets)
+        return self.__configlet_del(container=container_info, configlets=detach_configlets, save_topology=save_topology)
+
+    def __run_level(self, function, containers: list):
+        """
+        __run_level Execute function for all containers of a same topology level
+
+        Containers are processed in parallel when max_workers is greater than 1.
+        Any call to fail_json from a worker is reported once all workers are done.
+        Cloudvision has no API to discard only temp actions of this run: actions
+        already staged are not saved and are listed in the failure message so
+        they can be discarded from Cloudvision.
+
+        Parameters
+        ----------
+        function : callable
+            Function to execute with container name as unique argument
+        containers : list
+            List of container names of a same level
+
+        Returns
+        -------
+        list
+            List of function results ordered like containers
+        """
+        if self.__ansible is None:
+            return run_concurrently(function=function, items=containers, max_workers=self.__max_workers)
+        ansible_module = self.__ansible
+        self.__ansible = ThreadSafeModule(ansible_module)
+        try:
+            return run_concurrently(function=function, items=containers, max_workers=self.__max_workers)
+        except WorkerFailure as failure:
+            fail_args = dict(failure.fail_args)
+            if self.__staged_actions:
+                fail_args['msg'] = '{} - actions staged on Cloudvision and not saved: {}'.format(
+                    fail_args.get('msg'), ', '.join(result_data.name for container_id, result_data in self.__staged_actions))
+                self.__staged_actions = list()
+            ansible_module.fail_json(**fail_args)
+        finally:
+            self.__ansible = ansible_module
+        return list()
+
+    def __stage_attach(self, user_topology: ContainerInput, user_container: str):
+        """
+        __stage_attach Stage configlets attachment for a container
+
+        Actions are staged on Cloudvision without saveTopology: saveTopology
+        commits every temp action, including ones staged by other workers.
+
+        Parameters
+        ----------
+        user_topology : ContainerInput
+            User defined containers topology to build
+        user_container : str
+            Name of the container to build
+
+        Returns
+        -------
+        CvApiResult
+            Result of configlets attachment, None when not run
+        """
+        # No API call when container is defined with an empty list of configlets
+        if user_topology.has_configlets(container_name=user_container) and len(user_topology.get_configlets(container_name=user_container)) > 0:
+            return self.configlets_attach(
+                container=user_container, configlets=user_topology.get_configlets(container_name=user_container), save_topology=False)
+        return None
+
+    def __stage_detach(self, user_topology: ContainerInput, user_container: str):
+        """
+        __stage_detach Stage detachment of configlets not listed for a container
+
+        cvprac builds detach action from configlets saved on Cloudvision and
+        overwrites any attachment staged for the same container: attachments
+        must be saved before detachments are staged.
+
+        Parameters
+        ----------
+        user_topology : ContainerInput
+            User defined containers topology to build
+        user_container : str
+            Name of the container to build
+
+        Returns
+        -------
+        CvApiResult
+            Result of configlets detachment, None when not run
+        """
+        if user_topology.has_configlets(container_name=user_container):
+            attached_configlets = self.get_configlets(container_name=user_container)
+            configlet_to_remove = list()
+            for attach_configlet in attached_configlets:
+                if attach_configlet['name'] not in user_topology.get_configlets(container_name=user_container):
+                    configlet_to_remove.append(attach_configlet)
+            if len(configlet_to_remove) > 0:
+                return self.configlets_detach(container=user_container, configlets=configlet_to_remove, save_topology=False)
+        return None
 
     def build_topology(self, user_topology: ContainerInput, present: bool = True, apply_mode: str = 'loose'):
         """
@@ -862,7 +1318,11 @@ class CvContainerTools(object):
         - Create or delete containers
         - Attach or detach configlets to containers
 
-        Creation or deleation is managed with present flag
+        Creation or deleation is managed with present flag. Containers are
+        created level by level, one at a time. Configlets changes of a same
+        level are staged in parallel when max_workers is greater than 1 and
+        saved with a single saveTopology call per level, plus one for
+        detachments in strict mode.
 
         Parameters
         ----------
@@ -889,26 +1349,28 @@ class CvContainerTools(object):
 
         # Create containers topology in Cloudvision
         if present is True:
-            for user_container in user_topology.ordered_list_containers:
-                MODULE_LOGGER.info('Start creation process for container %s under %s', str(
-                    user_container), str(user_topology.get_parent(container_name=user_container)))
-                resp = self.create_container(
-                    container=user_container, parent=user_topology.get_parent(container_name=user_container))
-                container_add_manager.add_change(resp)
-
-                if user_topology.has_configlets(container_name=user_container):
-                    resp = self.configlets_attach(
-                        container=user_container, configlets=user_topology.get_configlets(container_name=user_container))
-                    cv_configlets_attach.add_change(resp)
-                    if apply_mode == 'strict':
-                        attached_configlets = self.get_configlets(container_name=user_container)
-                        configlet_to_remove = list()
-                        for attach_configlet in attached_configlets:
-                            if attach_configlet['name'] not in user_topology.get_configlets(container_name=user_container):
-                                configlet_to_remove.append(attach_configlet)
-                        if len(configlet_to_remove) > 0:
-                            resp = self.configlets_detach(container=user_container, configlets=configlet_to_remove)
-                            cv_configlets_detach.add_change(resp)
+            for level in user_topology.ordered_levels_containers:
+                # add_container always saves topology: containers are created before staging any action
+                for user_container in level:
+                    MODULE_LOGGER.info('Start creation process for container %s under %s', str(
+                        user_container), str(user_topology.get_parent(container_name=user_container)))
+                    container_add_manager.add_change(self.create_container(
+                        container=user_container, parent=user_topology.get_parent(container_name=user_container)))
+                results = self.__run_level(function=lambda user_container: self.__stage_attach(user_topology=user_topology,
+                                                                                              user_container=user_container),
+                                           containers=level)
+                self.save_topology()
+                for attach_resp in results:
+                    if attach_resp is not None:
+                        cv_configlets_attach.add_change(attach_resp)
+                if apply_mode == 'strict':
+                    results = self.__run_level(function=lambda user_container: self.__stage_detach(user_topology=user_topology,
+                                                                                                  user_container=user_container),
+                                               containers=level)
+                    self.save_topology()
+                    for detach_resp in results:
+                        if detach_resp is not None:
+                            cv_configlets_detach.add_change(detach_resp)
 
         # Remove containers topology from Cloudvision
         else:
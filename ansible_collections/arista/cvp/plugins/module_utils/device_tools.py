@@ -29,6 +29,9 @@ from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
 from ansible_collections.arista.cvp.plugins.module_utils.generic_tools import CvElement
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import FIELD_TASK_ID
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently, DEFAULT_MAX_WORKERS
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import cv_save_topology
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v3 as schema
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
@@ -52,13 +55,25 @@ MODULE_LOGGER.info('Start device_tools module execution')
 # ------------------------------------------ #
 
 FIELD_FQDN = 'fqdn'
+FIELD_HOSTNAME = 'hostname'
 FIELD_SYSMAC = 'systemMacAddress'
 FIELD_SERIAL = 'serialNumber'
 FIELD_CONFIGLETS = 'configlets'
 FIELD_ID = 'key'
+FIELD_NAME = 'name'
 FIELD_CONTAINER_NAME = 'containerName'
 FIELD_PARENT_NAME = 'parentContainerName'
 FIELD_PARENT_ID = 'parentContainerId'
+FIELD_NETELEMENT_ID = 'netElementId'
+FIELD_DEVICES_TASKS = 'devices_taskIds'
+FIELD_DEVICES_PLAN = 'devices_plan'
+# Fields name used in device action plan
+PLAN_DEPLOY = 'deploy'
+PLAN_MOVE = 'move'
+PLAN_CONTAINER_CURRENT = 'container_current'
+PLAN_CONTAINER_TARGET = 'container_target'
+PLAN_ATTACH = 'configlets_attach'
+PLAN_DETACH = 'configlets_detach'
 # Not yet implemented
 FIELD_IMAGE_BUNDLE = 'image_bundle'
 UNDEFINED_CONTAINER = 'undefined_container'
@@ -274,17 +289,242 @@ class DeviceInventory(object):
         return None
 
 
+class CvInventorySnapshot(object):
+    """
+    CvInventorySnapshot Cloudvision inventory fetched once and indexed for O(1) lookups
+
+    Devices are indexed by fqdn, hostname, systemMacAddress and serialNumber.
+    Snapshot is a local view of Cloudvision: it has to be updated with
+    update_container when a device is deployed or moved by the module.
+    """
+
+    def __init__(self, data: list):
+        self.__devices = list(data) if data is not None else list()
+        self.__indexes = {FIELD_FQDN: dict(), FIELD_HOSTNAME: dict(), FIELD_SYSMAC: dict(), FIELD_SERIAL: dict()}
+        for device in self.__devices:
+            for field, index in self.__indexes.items():
+                if device.get(field) is not None:
+                    index.setdefault(device[field], device)
+        MODULE_LOGGER.debug('Inventory snapshot built with %s devices', str(len(self.__devices)))
+
+    @property
+    def devices(self):
+        """
+        devices Getter to list all devices from Cloudvision inventory
+
+        Returns
+        -------
+        list
+            List of devices as returned by Cloudvision
+        """
+        return self.__devices
+
+    def get(self, search_value: str, search_by: str = FIELD_FQDN):
+        """
+        get Get device data from snapshot
+
+        Parameters
+        ----------
+        search_value : str
+            Device content to look for
+        search_by : str, optional
+            Field to use to search device (fqdn, hostname, systemMacAddress or serialNumber), by default FQDN
+
+        Returns
+        -------
+        dict
+            Device data from Cloudvision, None if not found
+        """
+        if search_by not in self.__indexes:
+            MODULE_LOGGER.error('Unsupported search method for inventory snapshot: %s', str(search_by))
+            return None
+        return self.__indexes[search_by].get(search_value)
+
+    def update_container(self, device_mac: str, container_name: str, container_id: str):
+        """
+        update_container Update container where a device is attached in snapshot
+
+        Parameters
+        ----------
+        device_mac : str
+            systemMacAddress of the device
+        container_name : str
+            Name of the new parent container
+        container_id : str
+            Key of the new parent container
+        """
+        device = self.get(search_value=device_mac, search_by=FIELD_SYSMAC)
+        if device is not None:
+            device[FIELD_CONTAINER_NAME] = container_name
+            device[FIELD_PARENT_ID] = container_id
+
+
+class CvConfigletIndex(object):
+    """
+    CvConfigletIndex Cloudvision configlets and mappers fetched once and indexed for O(1) lookups
+
+    Configlets are indexed by name and key. Configlet mappers are used to
+    build list of configlets attached to each device and to each container,
+    sorted like Cloudvision applies them.
+    """
+
+    def __init__(self, data: dict):
+        data = data if data is not None else dict()
+        self.__configlets = data.get('configlets', list())
+        self.__indexes = {FIELD_NAME: dict(), FIELD_ID: dict()}
+        for configlet in self.__configlets:
+            for field, index in self.__indexes.items():
+                if configlet.get(field) is not None:
+                    index.setdefault(configlet[field], configlet)
+        self.__devices_configlets = dict()
+        self.__containers_configlets = dict()
+        for mapper in sorted(data.get('configletMappers', list()), key=lambda mapper: mapper.get('order', 0)):
+            configlet = self.__indexes[FIELD_ID].get(mapper.get('configletId'))
+            if configlet is None:
+                continue
+            if mapper.get('type') == 'netelement':
+                self.__devices_configlets.setdefault(mapper['objectId'], list()).append(configlet)
+            elif mapper.get('type') == 'container':
+                self.__containers_configlets.setdefault(mapper['objectId'], list()).append(configlet)
+        MODULE_LOGGER.debug('Configlet index built with %s configlets', str(len(self.__configlets)))
+
+    @property
+    def configlets(self):
+        """
+        configlets Getter to list all configlets from Cloudvision
+
+        Returns
+        -------
+        list
+            List of configlets as returned by Cloudvision
+        """
+        return self.__configlets
+
+    def get(self, search_value: str, search_by: str = FIELD_NAME):
+        """
+        get Get configlet data from index
+
+        Parameters
+        ----------
+        search_value : str
+            Configlet content to look for
+        search_by : str, optional
+            Field to use to search configlet (name or key), by default name
+
+        Returns
+        -------
+        dict
+            Configlet data from Cloudvision, None if not found
+        """
+        if search_by not in self.__indexes:
+            MODULE_LOGGER.error('Unsupported search method for configlet index: %s', str(search_by))
+            return None
+        return self.__indexes[search_by].get(search_value)
+
+    def get_device_configlets(self, device_id: str):
+        """
+        get_device_configlets Get configlets mapped to a device
+
+        Parameters
+        ----------
+        device_id : str
+            Device key (systemMacAddress)
+
+        Returns
+        -------
+        list
+            List of configlets data
+        """
+        return self.__devices_configlets.get(device_id, list())
+
+    def get_container_configlets(self, container_id: str):
+        """
+        get_container_configlets Get configlets mapped to a container
+
+        Parameters
+        ----------
+        container_id : str
+            Container key
+
+        Returns
+        -------
+        list
+            List of configlets data
+        """
+        return self.__containers_configlets.get(container_id, list())
+
+    def update_device_configlets(self, device_id: str, configlets: list, remove: bool = False):
+        """
+        update_device_configlets Update configlets mapped to a device in index
+
+        Parameters
+        ----------
+        device_id : str
+            Device key (systemMacAddress)
+        configlets : list
+            List of configlets data attached or detached by the module
+        remove : bool, optional
+            Configlets are detached from device when set to True, by default False
+        """
+        self.__update_mapping(mapping=self.__devices_configlets, object_id=device_id, configlets=configlets, remove=remove)
+
+    def update_container_configlets(self, container_id: str, configlets: list, remove: bool = False):
+        """
+        update_container_configlets Update configlets mapped to a container in index
+
+        Parameters
+        ----------
+        container_id : str
+            Container key
+        configlets : list
+            List of configlets data attached or detached by the module
+        remove : bool, optional
+            Configlets are detached from container when set to True, by default False
+        """
+        self.__update_mapping(mapping=self.__containers_configlets, object_id=container_id, configlets=configlets, remove=remove)
+
+    def __update_mapping(self, mapping: dict, object_id: str, configlets: list, remove: bool = False):
+        """
+        __update_mapping Update configlets mapped to a device or a container
+
+        Parameters
+        ----------
+        mapping : dict
+            Configlets indexed by object key to update
+        object_id : str
+            Device or container key
+        configlets : list
+            List of configlets data attached or detached by the module
+        remove : bool, optional
+            Configlets are detached from object when set to True, by default False
+        """
+        configlets_keys = {configlet[FIELD_ID] for configlet in configlets}
+        object_configlets = [configlet for configlet in mapping.get(object_id, list())
+                             if configlet[FIELD_ID] not in configlets_keys]
+        if remove is False:
+            object_configlets.extend(self.get(search_value=configlet[FIELD_ID], search_by=FIELD_ID) or configlet
+                                     for configlet in configlets)
+        mapping[object_id] = object_configlets
+
+
 class CvDeviceTools(object):
     """
     CvDeviceTools Object to operate Device operation on Cloudvision
     """
 
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, search_by: str = FIELD_FQDN, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, search_by: str = FIELD_FQDN, check_mode: bool = False,
+                 batch_mode: bool = False, max_workers: int = DEFAULT_MAX_WORKERS):
         self.__cv_client = cv_connection
         self.__ansible = ansible_module
         self.__search_by = search_by
-        self.__configlets_and_mappers_cache = None
+        self.__configlet_index = None
+        self.__inventory_snapshot = None
         self.__check_mode = check_mode
+        self.__batch_mode = batch_mode
+        self.__max_workers = max_workers
+        self.__staged_actions = list()
+        self.__devices_tasks = dict()
+        self.__containers_info = dict()
 
     # ------------------------------------------ #
     # Getters & Setters
@@ -314,6 +554,59 @@ class CvDeviceTools(object):
         """
         self.__search_by = mode
 
+    @property
+    def batch_mode(self):
+        """
+        batch_mode Getter to expose batch mode
+
+        In batch mode, move and configlet actions are staged on Cloudvision and
+        saved with save_topology instead of one saveTopology call per device.
+
+        Returns
+        -------
+        bool
+            True if batch mode is active
+        """
+        return self.__batch_mode
+
+    @property
+    def inventory_snapshot(self):
+        """
+        inventory_snapshot Getter for Cloudvision inventory snapshot
+
+        Inventory is collected from Cloudvision on first access only.
+
+        Returns
+        -------
+        CvInventorySnapshot
+            Indexed Cloudvision inventory
+        """
+        if self.__inventory_snapshot is None:
+            self.__inventory_snapshot = CvInventorySnapshot(data=self.__cv_client.api.get_inventory())
+        return self.__inventory_snapshot
+
+    @property
+    def configlet_index(self):
+        """
+        configlet_index Getter for Cloudvision configlets and mappers index
+
+        Configlets and mappers are collected from Cloudvision on first access only.
+
+        Returns
+        -------
+        CvConfigletIndex
+            Indexed Cloudvision configlets
+        """
+        if self.__configlet_index is None:
+            self.__configlet_index = CvConfigletIndex(data=self.__cv_client.api.get_configlets_and_mappers()['data'])
+        return self.__configlet_index
+
+    def refresh_inventory_snapshot(self):
+        """
+        refresh_inventory_snapshot Force a new collection of Cloudvision inventory on next lookup
+        """
+        self.__inventory_snapshot = None
+
     # ------------------------------------------ #
     # Private functions
     # ------------------------------------------ #
@@ -322,32 +615,27 @@ class CvDeviceTools(object):
         """
         __get_device Method to get data from Cloudvision
 
-        Search on cloudvision information related to given device.
+        Search information related to given device in Cloudvision inventory snapshot.
 
         Parameters
         ----------
         search_value : str
-            Device content to look for (FQDN or SYSMAC)
+            Device content to look for (FQDN, hostname, SYSMAC or serial number)
         search_by : str, optional
             Field to use to search information, by default FQDN
 
         Returns
         -------
         dict
-            Information returns by Cloudvision
+            Information returns by Cloudvision, None if device is not found
         """
-        cv_data: dict = dict()
-        if search_by == FIELD_FQDN:
-            cv_data = self.__cv_client.api.get_device_by_name(fqdn=search_value)
-        if search_by == FIELD_SYSMAC:
-            cv_data = self.__cv_client.api.get_device_by_mac(device_mac=search_value)
-        return cv_data
+        return self.inventory_snapshot.get(search_value=search_value, search_by=search_by)
 
     def __get_configlet_info(self, configlet_name: str):
         """
         __get_configlet_info Provides mechanism to get information about a configlet.
 
-        Extract information from CV configlet mapper and save as a cache in instance.
+        Search information in Cloudvision configlets index.
 
         Parameters
         ----------
@@ -357,14 +645,78 @@ class CvDeviceTools(object):
         Returns
         -------
         dict
-            Configlet data
+            Configlet data, None if configlet is not found
         """
-        if self.__configlets_and_mappers_cache is None:
-            self.__configlets_and_mappers_cache = self.__cv_client.api.get_configlets_and_mappers()
-        for configlet in self.__configlets_and_mappers_cache['data']['configlets']:
-            if configlet_name == configlet['name']:
-                return configlet
-        return None
+        return self.configlet_index.get(search_value=configlet_name, search_by=FIELD_NAME)
+
+    def __plan_inventory(self, user_inventory: DeviceInventory, devices_plan: dict, action: str):
+        """
+        __plan_inventory Build inventory of devices with given action in plan
+
+        Parameters
+        ----------
+        user_inventory : DeviceInventory
+            User defined inventory from Ansible input
+        devices_plan : dict
+            Action plan indexed by device FQDN
+        action : str
+            Action to look for in plan
+
+        Returns
+        -------
+        DeviceInventory
+            Inventory of devices with action to run
+        """
+        return DeviceInventory(data=[device.info for device in user_inventory.devices
+                                     if device.fqdn in devices_plan and devices_plan[device.fqdn][action]])
+
+    def __merge_tasks(self, devices_tasks: dict, new_tasks: dict):
+        """
+        __merge_tasks Merge taskIds indexed by device FQDN in devices_tasks
+
+        Parameters
+        ----------
+        devices_tasks : dict
+            List of taskIds indexed by device FQDN to update
+        new_tasks : dict
+            List of taskIds indexed by device FQDN to add
+        """
+        for fqdn, task_ids in new_tasks.items():
+            devices_tasks.setdefault(fqdn, list())
+            devices_tasks[fqdn] += [task_id for task_id in task_ids if task_id not in devices_tasks[fqdn]]
+
+    def __register_action(self, device: DeviceElement, result_data: CvApiResult, resp: dict):
+        """
+        __register_action Report result of a provisioning action in result_data
+
+        Action is staged when resp is None (batch mode or deployment): its
+        taskIds are set by save_topology.
+
+        Parameters
+        ----------
+        device : DeviceElement
+            Device managed by the action
+        result_data : CvApiResult
+            Result of the action
+        resp : dict
+            Response from cvprac, None when action is staged
+
+        Returns
+        -------
+        bool
+            True if action is saved or staged on Cloudvision
+        """
+        if resp is None:
+            result_data.changed = True
+            result_data.success = True
+            self.__staged_actions.append((device, result_data))
+            return True
+        if resp['data']['status'] == 'success':
+            result_data.changed = True
+            result_data.success = True
+            result_data.taskIds = resp['data']['taskIds']
+            return True
+        return False
 
     # ------------------------------------------ #
     # Get CV data functions
@@ -411,6 +763,8 @@ class CvDeviceTools(object):
         """
         get_device_configlets Retrieve configlets attached to a device
 
+        Configlets are read from configlet index built with a single call to Cloudvision.
+
         Parameters
         ----------
         device_lookup : str
@@ -422,8 +776,6 @@ class CvDeviceTools(object):
             List of CvElement with KEY and NAME of every configlet.
         """
         if self.__search_by == FIELD_FQDN:
-            configlet_list = list()
-            # get_configlets_by_device_id
             try:
                 device_id = self.get_device_id(device_lookup=device_lookup)
             except CvpApiError:
@@ -431,11 +783,7 @@ class CvDeviceTools(object):
             else:
                 if device_id is None:
                     MODULE_LOGGER.error('Error cannot get device ID from Cloudvision')
-                configlets_data = self.__cv_client.api.get_configlets_by_device_id(
-                    mac=device_id)
-                for configlet in configlets_data:
-                    configlet_list.append(CvElement(cv_data=configlet))
-                return configlet_list
+                return [CvElement(cv_data=configlet) for configlet in self.configlet_index.get_device_configlets(device_id=device_id)]
         return None
 
     def get_device_container(self, device_lookup: str):
@@ -461,6 +809,8 @@ class CvDeviceTools(object):
         """
         get_container_info Retrieve container information from Cloudvision
 
+        Result is cached for every existing container.
+
         Parameters
         ----------
         container_name : str
@@ -471,12 +821,16 @@ class CvDeviceTools(object):
         dict
             Data from Cloudvision
         """
+        if container_name in self.__containers_info:
+            return self.__containers_info[container_name]
         try:
             resp = self.__cv_client.api.get_container_by_name(name=str(container_name))
         except CvpApiError:
             MODULE_LOGGER.debug(
                 'Error getting container ID from Cloudvision')
         else:
+            if resp is not None:
+                self.__containers_info[container_name] = resp
             return resp
         return None
 
@@ -494,8 +848,8 @@ class CvDeviceTools(object):
         dict
             A dict with key and name
         """
-        container_id = self.__cv_client.api.get_device_by_mac(device_mac=device_mac)
-        if FIELD_PARENT_ID in container_id:
+        container_id = self.__get_device(search_value=device_mac, search_by=FIELD_SYSMAC)
+        if container_id is not None and FIELD_PARENT_ID in container_id:
             return {'name': container_id[FIELD_CONTAINER_NAME], 'key': container_id[FIELD_PARENT_ID]}
         else:
             return None
@@ -568,6 +922,12 @@ class CvDeviceTools(object):
         - Deploy devices
         - Move deployed devices to container
         - Attach configlets to devices
+        - Detach configlets from devices in strict mode
+
+        Actions are computed first for all devices with plan, and each step
+        only runs for devices with an action to execute. Configlets to detach
+        from devices deployed by this run are computed once deployment is saved.
+        Plan is exposed in output under devices_plan.
 
         Parameters
         ----------
@@ -590,38 +950,34 @@ class CvDeviceTools(object):
         cv_configlets_attach = CvManagerResult(builder_name='configlets_attached')
         cv_configlets_detach = CvManagerResult(builder_name='configlets_detached')
 
-        # Check if the devices defined exist in CVP
-        list_non_existing_devices = self.check_device_exist(user_inventory=user_inventory, search_mode=search_mode)
-        if list_non_existing_devices is not None and len(list_non_existing_devices) > 0:
-            error_message = 'Error - the following devices do not exist in CVP {} but are defined in the playbook. \
-            \nMake sure that the devices are provisioned and defined with the full fqdn name (including the domain name) if needed.'.format(str(list_non_existing_devices))
-            MODULE_LOGGER.error(error_message)
-            self.__ansible.fail_json(msg=error_message)
-
+        # Compute actions to run for every device from Cloudvision snapshots
+        devices_plan = self.plan(user_inventory=user_inventory, search_mode=search_mode, apply_mode=apply_mode)
 
-        # Need to collect all missing device systemMacAddress
-        # deploy needs to locate devices by mac-address
-        if self.__search_by == FIELD_FQDN or search_mode == FIELD_FQDN:
-            user_inventory = self.refresh_systemMacAddress(user_inventory=user_inventory)
-
-        action_result = self.deploy_device(user_inventory=user_inventory)
+        action_result = self.deploy_device(user_inventory=self.__plan_inventory(user_inventory, devices_plan, PLAN_DEPLOY))
         if action_result is not None:
             for update in action_result:
                 cv_deploy.add_change(change=update)
+        if apply_mode == 'strict':
+            self.__plan_deployed_detach(user_inventory=user_inventory, devices_plan=devices_plan)
 
-        action_result = self.move_device(user_inventory=user_inventory)
+        # In batch mode, topology is saved once per step: a device is managed
+        # once per step, so staged actions never overlap.
+        action_result = self.move_device(user_inventory=self.__plan_inventory(user_inventory, devices_plan, PLAN_MOVE))
+        self.save_topology()
         if action_result is not None:
             for update in action_result:
                 cv_move.add_change(change=update)
 
-        action_result = self.apply_configlets(user_inventory=user_inventory)
+        action_result = self.apply_configlets(user_inventory=self.__plan_inventory(user_inventory, devices_plan, PLAN_ATTACH))
+        self.save_topology()
         if action_result is not None:
             for update in action_result:
                 cv_configlets_attach.add_change(change=update)
 
         if apply_mode == 'strict':
             action_result = self.detach_configlets(
-                user_inventory=user_inventory)
+                user_inventory=self.__plan_inventory(user_inventory, devices_plan, PLAN_DETACH))
+            self.save_topology()
             if action_result is not None:
                 for update in action_result:
                     cv_configlets_detach.add_change(change=update)
@@ -631,7 +987,168 @@ class CvDeviceTools(object):
         response.add_manager(cv_configlets_attach)
         response.add_manager(cv_configlets_detach)
 
-        return response.content
+        result = response.content
+        result[FIELD_DEVICES_PLAN] = devices_plan
+        if self.__batch_mode:
+            result[FIELD_DEVICES_TASKS] = self.__devices_tasks
+        return result
+
+    def plan(self, user_inventory: DeviceInventory, search_mode: str = FIELD_FQDN, apply_mode: str = 'loose'):
+        """
+        plan Compute actions to run on Cloudvision for every device
+
+        Plan is built in a single pass from Cloudvision inventory snapshot and
+        configlets index, without any per-device call to Cloudvision. Configlets
+        to attach and detach are only computed for devices already deployed.
+        Module fails when a device, a target container or a configlet does not
+        exist on Cloudvision.
+
+        Missing systemMacAddress are updated in user_inventory.
+
+        Example
+        -------
+        >>> CvDeviceTools.plan(user_inventory=inventory, apply_mode='strict')
+        {
+            "CV-ANSIBLE-EOS01": {
+                "systemMacAddress": "50:8d:00:e3:78:aa",
+                "container_current": "ANSIBLE",
+                "container_target": "ANSIBLE2",
+                "deploy": false,
+                "move": true,
+                "configlets_attach": ["CV-EOS-ANSIBLE01"],
+                "configlets_detach": []
+            }
+        }
+
+        Parameters
+        ----------
+        user_inventory : DeviceInventory
+            User defined inventory from Ansible input
+        search_mode : str, optional
+            Search method to get device information from Cloudvision, by default FQDN
+        apply_mode: str, optional
+            Define how manager will apply configlets to device: loose (only attach listed configlet) or strict (attach listed configlet, remove others)
+
+        Returns
+        -------
+        dict
+            Action plan indexed by device FQDN
+        """
+        devices_plan = dict()
+        devices_deployed = list()
+        list_non_existing_devices = list()
+        for device in user_inventory.devices:
+            if self.__search_by == FIELD_FQDN or search_mode == FIELD_FQDN:
+                device_lookup = device.fqdn
+                cv_data = self.__get_device(search_value=device.fqdn, search_by=FIELD_FQDN)
+            else:
+                device_lookup = device.system_mac
+                cv_data = self.__get_device(search_value=device.system_mac, search_by=FIELD_SYSMAC)
+            if cv_data is None:
+                list_non_existing_devices.append(device_lookup)
+                MODULE_LOGGER.error('Device not present in CVP but in the user_inventory: %s', device_lookup)
+                continue
+            if device.system_mac is None:
+                device.system_mac = cv_data[FIELD_SYSMAC]
+            if self.get_container_info(container_name=device.container) is None:
+                error_message = 'The target container \'{}\' for the device \'{}\' does not exist on CVP.'.format(device.container, device.fqdn)
+                MODULE_LOGGER.error(error_message)
+                self.__ansible.fail_json(msg=error_message)
+            for configlet in device.configlets:
+                if self.__get_configlet_info(configlet_name=configlet) is None:
+                    error_message = "The configlet \'{}\' defined to be applied on the device \'{}\' does not exist on the CVP server.".format(str(configlet), str(device.fqdn))
+                    MODULE_LOGGER.error(error_message)
+                    self.__ansible.fail_json(msg=error_message)
+            undefined = cv_data.get(FIELD_PARENT_ID) == UNDEFINED_CONTAINER
+            devices_plan[device.fqdn] = {
+                FIELD_SYSMAC: device.system_mac,
+                PLAN_CONTAINER_CURRENT: cv_data.get(FIELD_CONTAINER_NAME),
+                PLAN_CONTAINER_TARGET: device.container,
+                PLAN_DEPLOY: undefined,
+                PLAN_MOVE: not undefined and cv_data.get(FIELD_CONTAINER_NAME) != device.container,
+                PLAN_ATTACH: list(),
+                PLAN_DETACH: list()
+            }
+            if not undefined:
+                devices_deployed.append(device)
+
+        if len(list_non_existing_devices) > 0:
+            error_message = 'Error - the following devices do not exist in CVP {} but are defined in the playbook. \
+            \nMake sure that the devices are provisioned and defined with the full fqdn name (including the domain name) if needed.'.format(str(list_non_existing_devices))
+            MODULE_LOGGER.error(error_message)
+            self.__ansible.fail_json(msg=error_message)
+
+        for device in devices_deployed:
+            attached_names = [configlet[FIELD_NAME] for configlet in self.configlet_index.get_device_configlets(device_id=device.system_mac)]
+            devices_plan[device.fqdn][PLAN_ATTACH] = [configlet for configlet in device.configlets if configlet not in attached_names]
+            if apply_mode == 'strict':
+                devices_plan[device.fqdn][PLAN_DETACH] = [configlet for configlet in attached_names if configlet not in device.configlets]
+        MODULE_LOGGER.debug('Devices action plan is: %s', str(devices_plan))
+        return devices_plan
+
+    def __plan_deployed_detach(self, user_inventory: DeviceInventory, devices_plan: dict):
+        """
+        __plan_deployed_detach Compute configlets to detach from devices deployed by manager
+
+        Deployment keeps configlets proposed by Cloudvision for a device, which are
+        only known once deployment is saved: configlets index is collected again
+        with a single call and devices_plan is updated in place.
+
+        Parameters
+        ----------
+        user_inventory : DeviceInventory
+            User defined inventory from Ansible input
+        devices_plan : dict
+            Action plan indexed by device FQDN
+        """
+        devices_deployed = [device for device in user_inventory.devices
+                            if device.fqdn in devices_plan and devices_plan[device.fqdn][PLAN_DEPLOY]]
+        if self.__check_mode or len(devices_deployed) == 0:
+            return
+        self.__configlet_index = None
+        for device in devices_deployed:
+            attached_names = [configlet[FIELD_NAME] for configlet in self.configlet_index.get_device_configlets(device_id=device.system_mac)]
+            devices_plan[device.fqdn][PLAN_DETACH] = [configlet for configlet in attached_names if configlet not in device.configlets]
+
+    def save_topology(self):
+        """
+        save_topology Save all staged actions with a single saveTopology call
+
+        TaskIds generated by Cloudvision are collected with a single call and
+        set on the CvApiResult of every staged action.
+
+        Returns
+        -------
+        dict
+            List of taskIds indexed by device FQDN
+        """
+        devices_tasks = dict()
+        if len(self.__staged_actions) == 0:
+            return devices_tasks
+        staged_actions = self.__staged_actions
+        self.__staged_actions = list()
+        try:
+            resp = cv_save_topology(self.__cv_client)
+        except CvpApiError as error:
+            error_message = 'Error saving topology on Cloudvision: {}'.format(str(error))
+            MODULE_LOGGER.error(error_message)
+            self.__ansible.fail_json(msg=error_message)
+        if resp is None or resp['data']['status'] != 'success':
+            error_message = 'Error saving topology on Cloudvision: {}'.format(str(resp))
+            MODULE_LOGGER.error(error_message)
+            self.__ansible.fail_json(msg=error_message)
+        task_ids = [str(task_id) for task_id in resp['data']['taskIds']]
+        MODULE_LOGGER.info('Topology saved for %s actions, tasks created: %s', str(len(staged_actions)), str(task_ids))
+        tasks_by_mac = dict()
+        if len(task_ids) > 0:
+            for task in self.__cv_client.api.get_tasks_by_status('Pending'):
+                if str(task.get(FIELD_TASK_ID)) in task_ids:
+                    tasks_by_mac.setdefault(task.get(FIELD_NETELEMENT_ID), list()).append(str(task[FIELD_TASK_ID]))
+        for device, result_data in staged_actions:
+            result_data.taskIds = tasks_by_mac.get(device.system_mac, list())
+            self.__merge_tasks(devices_tasks, {device.fqdn: result_data.taskIds})
+        self.__merge_tasks(self.__devices_tasks, devices_tasks)
+        return devices_tasks
 
     def move_device(self, user_inventory: DeviceInventory):
         """
@@ -663,7 +1180,7 @@ class CvDeviceTools(object):
                 current_container_info = self.get_container_current(device_mac=device.system_mac)
                 # Move devices when they are not in undefined container
                 if (current_container_info is not None
-                    and current_container_info['name'] != UNDEFINED_CONTAINER
+                    and current_container_info['key'] != UNDEFINED_CONTAINER
                         and current_container_info['name'] != device.container):
                     if self.__check_mode:
                         result_data.changed = True
@@ -674,16 +1191,16 @@ class CvDeviceTools(object):
                             resp = self.__cv_client.api.move_device_to_container(app_name='CvDeviceTools.move_device',
                                                                                  device=device.info,
                                                                                  container=new_container_info,
-                                                                                 create_task=True)
+                                                                                 create_task=not self.__batch_mode)
                         except CvpApiError:
                             error_message = 'Error to move device {} to container {}'.format(device.fqdn, *device.container)
                             MODULE_LOGGER.error(error_message)
                             self.__ansible.fail_json(msg=error_message)
                         else:
-                            if resp['data']['status'] == 'success':
-                                result_data.changed = True
-                                result_data.success = True
-                                result_data.taskIds = resp['data']['taskIds']
+                            if self.__register_action(device=device, result_data=result_data, resp=resp):
+                                self.inventory_snapshot.update_container(device_mac=device.system_mac,
+                                                                         container_name=device.container,
+                                                                         container_id=new_container_info['key'])
 
                     result_data.add_entry('{}-{}'.format(device.fqdn, *device.container))
             results.append(result_data)
@@ -713,15 +1230,16 @@ class CvDeviceTools(object):
             current_container_info = self.get_container_current(
                 device_mac=device.system_mac)
             if (device.configlets is not None
-                    and current_container_info['name'] != UNDEFINED_CONTAINER):
+                    and current_container_info['key'] != UNDEFINED_CONTAINER):
                 # get configlet information from CV
                 configlets_info = list()
                 configlets_attached = self.get_device_configlets(
                     device_lookup=device.fqdn)
                 MODULE_LOGGER.debug('Attached configlets for device %s : %s', str(device.fqdn), str(configlets_attached))
+                configlets_attached_names = {x.name for x in configlets_attached}
                 # For each configlet not in the list, add to list of configlets to remove
                 for configlet in device.configlets:
-                    if configlet not in [x.name for x in configlets_attached]:
+                    if configlet not in configlets_attached_names:
                         new_configlet = self.__get_configlet_info(configlet_name=configlet)
                         if new_configlet is None:
                             error_message = "The configlet \'{}\' defined to be applied on the device \'{}\' does not exist on the CVP server.".format(str(configlet), str(device.fqdn))
@@ -732,25 +1250,31 @@ class CvDeviceTools(object):
                 # get device facts from CV
                 device_facts = dict()
                 if self.__search_by == FIELD_FQDN:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn)
+                    device_facts = self.__get_device(
+                        search_value=device.fqdn, search_by=FIELD_FQDN)
                 # Attach configlets to device
-                if len(configlets_info) > 0:
+                if len(configlets_info) > 0 and self.__check_mode:
+                    result_data.changed = True
+                    result_data.success = True
+                    result_data.taskIds = ['unsupported_in_check_mode']
+                    result_data.add_entry('{} adds {}'.format(
+                        device.fqdn, *device.configlets))
+                    result_data.add_entry('{} to {}'.format(device.fqdn, *device.container))
+                elif len(configlets_info) > 0:
                     try:
                         resp = self.__cv_client.api.apply_configlets_to_device(app_name='CvDeviceTools.apply_configlets',
                                                                                dev=device_facts,
                                                                                new_configlets=configlets_info,
-                                                                               create_task=True)
+                                                                               create_task=not self.__batch_mode)
                     except CvpApiError:
                         MODULE_LOGGER.error('Error applying configlets to device')
                         self.__ansible.fail_json(msg='Error applying configlets to device')
                     else:
-                        if resp['data']['status'] == 'success':
-                            result_data.changed = True
-                            result_data.success = True
-                            result_data.taskIds = resp['data']['taskIds']
+                        if self.__register_action(device=device, result_data=result_data, resp=resp):
                             result_data.add_entry('{} adds {}'.format(
                                 device.fqdn, *device.configlets))
+                            self.configlet_index.update_device_configlets(device_id=device.system_mac,
+                                                                          configlets=configlets_info)
                     result_data.add_entry('{} to {}'.format(device.fqdn, *device.container))
                 else:
                     result_data.name = result_data.name + ' - nothing attached'
@@ -766,8 +1290,8 @@ class CvDeviceTools(object):
             if device.configlets is not None:
                 device_facts = dict()
                 if self.__search_by == FIELD_FQDN:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn)
+                    device_facts = self.__get_device(
+                        search_value=device.fqdn, search_by=FIELD_FQDN)
                 configlets_to_remove = list()
                 # get list of configured configlets
                 configlets_attached = self.get_device_configlets(device_lookup=device.fqdn)
@@ -778,22 +1302,28 @@ class CvDeviceTools(object):
                         result_data.name = result_data.name + ' - ' + configlet.name
                         configlets_to_remove.append(configlet.data)
                 # Detach configlets to device
-                if len(configlets_to_remove) > 0:
+                if len(configlets_to_remove) > 0 and self.__check_mode:
+                    result_data.changed = True
+                    result_data.success = True
+                    result_data.taskIds = ['unsupported_in_check_mode']
+                    result_data.add_entry('{} removes {}'.format(
+                        device.fqdn, *device.configlets))
+                elif len(configlets_to_remove) > 0:
                     try:
                         resp = self.__cv_client.api.remove_configlets_from_device(app_name='CvDeviceTools.detach_configlets',
                                                                                   dev=device_facts,
                                                                                   del_configlets=configlets_to_remove,
-                                                                                  create_task=True)
+                                                                                  create_task=not self.__batch_mode)
                     except CvpApiError as catch_error:
                         MODULE_LOGGER.error('Error applying configlets to device: %s', str(catch_error))
                         self.__ansible.fail_json(msg='Error detaching configlets from device ' + device.fqdn + ': ' + catch_error)
                     else:
-                        if resp['data']['status'] == 'success':
-                            result_data.changed = True
-                            result_data.success = True
-                            result_data.taskIds = resp['data']['taskIds']
+                        if self.__register_action(device=device, result_data=result_data, resp=resp):
                             result_data.add_entry('{} removes {}'.format(
                                 device.fqdn, *device.configlets))
+                            self.configlet_index.update_device_configlets(device_id=device.system_mac,
+                                                                          configlets=configlets_to_remove,
+                                                                          remove=True)
                 else:
                     result_data.name = result_data.name + ' - nothing detached'
                 results.append(result_data)
@@ -815,8 +1345,8 @@ class CvDeviceTools(object):
                 # get device facts from CV
                 device_facts = dict()
                 if self.__search_by == FIELD_FQDN:
-                    device_facts = self.__cv_client.api.get_device_by_name(
-                        fqdn=device.fqdn)
+                    device_facts = self.__get_device(
+                        search_value=device.fqdn, search_by=FIELD_FQDN)
                 # Attach configlets to device
                 try:
                     resp = self.__cv_client.api.remove_configlets_from_device(app_name='CvDeviceTools.remove_configlets',
@@ -844,6 +1374,19 @@ class CvDeviceTools(object):
         attached configlets to this device as well.
         This method is defined to ONLY support onboarding process
 
+        Deployment is done in 3 steps:
+        - Resolve configlets, target container and device data for all devices
+          from Cloudvision snapshots. Any missing resource fails module before
+          any change is sent to Cloudvision.
+        - Stage deployment of every device in parallel with max_workers threads.
+          A device failing deployment does not stop other devices.
+        - Save topology once for all staged devices.
+
+        A failed deployment can leave partial temp actions and Cloudvision has
+        no API to discard only temp actions of this run: when any device fails,
+        module fails without saving topology and lists devices staged on
+        Cloudvision, so their temp actions can be discarded from Cloudvision.
+
         Parameters
         ----------
         user_inventory : DeviceInventory
@@ -855,61 +1398,96 @@ class CvDeviceTools(object):
             List of CvApiResult for all API calls
         """
         results = list()
+        devices_to_deploy = list()
+        containers_info = dict()
         for device in user_inventory.devices:
             result_data = CvApiResult(action_name=device.fqdn + '_deployed')
-            if device.system_mac is not None:
-                configlets_info = list()
-                for configlet in device.configlets:
-                    new_configlet = self.__get_configlet_info(configlet_name=configlet)
-                    if new_configlet is None:
-                        error_message = "The configlet \'{}\' defined to be applied on the device \'{}\' does not exist on the CVP server.".format(str(configlet), str(device.fqdn))
+            results.append(result_data)
+            if device.system_mac is None:
+                continue
+            configlets_info = list()
+            for configlet in device.configlets:
+                new_configlet = self.__get_configlet_info(configlet_name=configlet)
+                if new_configlet is None:
+                    error_message = "The configlet \'{}\' defined to be applied on the device \'{}\' does not exist on the CVP server.".format(str(configlet), str(device.fqdn))
+                    MODULE_LOGGER.error(error_message)
+                    self.__ansible.fail_json(msg=error_message)
+                else:
+                    configlets_info.append(new_configlet)
+            # Deploy devices only when they are in undefined container
+            current_container_info = self.get_container_current(
+                device_mac=device.system_mac)
+            MODULE_LOGGER.debug('Device {} is currently under {}'.format(
+                device.fqdn, *current_container_info['name']))
+            if (current_container_info['name'] == 'Undefined'):
+                if self.__check_mode:
+                    result_data.changed = True
+                    result_data.success = True
+                    result_data.taskIds = ['unsupported_in_check_mode']
+                else:
+                    ## Check if the target container exists
+                    if device.container not in containers_info:
+                        containers_info[device.container] = self.get_container_info(container_name=device.container)
+                    if containers_info[device.container] is None:
+                        error_message = 'The target container \'{}\' for the device \'{}\' does not exist on CVP.'.format(device.container, device.fqdn)
                         MODULE_LOGGER.error(error_message)
                         self.__ansible.fail_json(msg=error_message)
-                    else:
-                        configlets_info.append(new_configlet)
-                # Move devices when they are not in undefined container
-                current_container_info = self.get_container_current(
-                    device_mac=device.system_mac)
-                MODULE_LOGGER.debug('Device {} is currently under {}'.format(
-                    device.fqdn, *current_container_info['name']))
-                device_info = self.get_device_facts(device_lookup=device.fqdn)
-                if (current_container_info['name'] == 'Undefined'):
-                    if self.__check_mode:
-                        result_data.changed = True
-                        result_data.success = True
-                        result_data.taskIds = ['unsupported_in_check_mode']
-                    else:
-                        ## Check if the target container exists
-                        target_container_info = self.get_container_info(container_name=device.container)
-                        if target_container_info is None:
-                            error_message = 'The target container \'{}\' for the device \'{}\' does not exist on CVP.'.format(device.container, device.fqdn)
-                            MODULE_LOGGER.error(error_message)
-                            self.__ansible.fail_json(msg=error_message)
-                        try:
-                            MODULE_LOGGER.debug('Ansible is going to deploy device %s in container %s with configlets %s',
-                                                str(device.fqdn),
-                                                str(device.container),
-                                                str(configlets_info))
-                            resp = self.__cv_client.api.deploy_device(app_name='CvDeviceTools.deploy',
-                                                                      device=device_info,
-                                                                      container=device.container,
-                                                                      configlets=configlets_info,
-                                                                      create_task=True)
-                        except CvpApiError as error:
-                            self.__ansible.fail_json(msg='Error to deploy device {} to container {}'.format(
-                                device.fqdn, *device.container))
-                            MODULE_LOGGER.critical('Error deploying device {} : {}'.format(device.fqdn, *error))
-                        else:
-                            if resp['data']['status'] == 'success':
-                                result_data.changed = True
-                                result_data.success = True
-                                result_data.taskIds = resp['data']['taskIds']
-
-                    result_data.add_entry('{} deployed to {}'.format(
-                        device.fqdn, *device.container))
-            results.append(result_data)
+                    devices_to_deploy.append((device, result_data, self.get_device_facts(device_lookup=device.fqdn), configlets_info))
+                result_data.add_entry('{} deployed to {}'.format(
+                    device.fqdn, *device.container))
+
+        errors = run_concurrently(function=self.__stage_deploy, items=devices_to_deploy, max_workers=self.__max_workers)
+        failures = list()
+        for deployment, error in zip(devices_to_deploy, errors):
+            device, result_data, device_info, configlets_info = deployment  # noqa # pylint: disable=unused-variable
+            if error is not None:
+                failures.append('{} to container {}: {}'.format(device.fqdn, device.container, error))
+        if len(failures) > 0:
+            # Failed deployment may have staged a move without its configlets: topology must not be saved
+            error_message = 'Error to deploy devices {} - actions staged on Cloudvision and not saved for: {}'.format(
+                ', '.join(failures), ', '.join(deployment[0].fqdn for deployment in devices_to_deploy))
+            MODULE_LOGGER.critical(error_message)
+            self.__ansible.fail_json(msg=error_message)
+            return results
+        for device, result_data, device_info, configlets_info in devices_to_deploy:
+            if self.__register_action(device=device, result_data=result_data, resp=None):
+                self.inventory_snapshot.update_container(device_mac=device.system_mac,
+                                                         container_name=device.container,
+                                                         container_id=containers_info[device.container]['key'])
+        self.save_topology()
         return results
 
+    def __stage_deploy(self, deployment: tuple):
+        """
+        __stage_deploy Stage deployment of a device on Cloudvision without saving topology
+
+        Method is thread safe and is executed in parallel for all devices to deploy.
+
+        Parameters
+        ----------
+        deployment : tuple
+            Device to deploy as DeviceElement, its CvApiResult, its Cloudvision data and list of configlets data
+
+        Returns
+        -------
+        str
+            Error message, None if deployment is staged
+        """
+        device, result_data, device_info, configlets_info = deployment  # noqa # pylint: disable=unused-variable
+        try:
+            MODULE_LOGGER.debug('Ansible is going to deploy device %s in container %s with configlets %s',
+                                str(device.fqdn),
+                                str(device.container),
+                                str(configlets_info))
+            self.__cv_client.api.deploy_device(app_name='CvDeviceTools.deploy',
+                                               device=device_info,
+                                               container=device.container,
+                                               configlets=configlets_info,
+                                               create_task=False)
+        except (CvpApiError, CvpRequestError) as error:
+            return str(error)
+        return None
+
     # ------------------------------------------ #
     # Helpers function
     # ------------------------------------------ #
@@ -23,9 +23,12 @@ __metaclass__ = type
 
 import traceback
 import logging
+import time
+import random
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult, CvAnsibleResponse
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently, DEFAULT_MAX_WORKERS
 try:
     from cvprac.cvp_client import CvpClient  # noqa # pylint: disable=unused-import
     from cvprac.cvp_client_errors import CvpApiError, CvpRequestError  # noqa # pylint: disable=unused-import
@@ -38,34 +41,179 @@ except ImportError:
 MODULE_LOGGER = logging.getLogger('arista.cvp.task_tools')
 MODULE_LOGGER.info('Start task_tools module execution')
 
+FIELD_TASK_ID = 'workOrderId'
+FIELD_TASK_STATUS = 'workOrderUserDefinedStatus'
+# Status of tasks still processed by Cloudvision
+TASK_ACTIVE_STATES = ['Pending', 'In-Progress']
+# Status of tasks Cloudvision will not process anymore
+TASK_TERMINAL_STATES = ['Completed', 'Cancelled', 'Failed']
+
+
+class CvTaskWatcher():
+    """
+    CvTaskWatcher Class to wait for a set of Cloudvision tasks to reach a terminal state
+
+    Every poll runs one bulk query per active status and matches task IDs
+    locally. Tasks that are not listed anymore are fetched once to get their
+    final state. Delay between polls grows exponentially with some jitter.
+
+    Example
+    -------
+    >>> watcher = CvTaskWatcher(cv_connection=cv_client)
+    >>> watcher.wait(task_ids=['666', '667'], timeout=60)
+    {
+        "666": {"workOrderId": "666", "workOrderUserDefinedStatus": "Completed", ...},
+        "667": {"workOrderId": "667", "workOrderUserDefinedStatus": "In-Progress", ...}
+    }
+    """
+
+    def __init__(self, cv_connection, initial_delay: float = 1, max_delay: float = 30, backoff: float = 2):
+        self.__cv_client = cv_connection
+        self.__initial_delay = initial_delay
+        self.__max_delay = max_delay
+        self.__backoff = backoff
+
+    def __poll(self, task_ids: list):
+        """
+        __poll Get current data of a list of tasks from Cloudvision
+
+        Parameters
+        ----------
+        task_ids : list
+            List of task IDs to poll
+
+        Returns
+        -------
+        dict
+            Task data indexed by task ID
+        """
+        tasks_data = dict()
+        watched_ids = set(task_ids)
+        for status in TASK_ACTIVE_STATES:
+            for task in self.__cv_client.api.get_tasks_by_status(status):
+                task_id = str(task.get(FIELD_TASK_ID))
+                if task_id in watched_ids and task.get(FIELD_TASK_STATUS) in TASK_ACTIVE_STATES:
+                    tasks_data[task_id] = task
+        for task_id in task_ids:
+            if task_id not in tasks_data:
+                tasks_data[task_id] = self.__cv_client.api.get_task_by_id(task_id)
+        return tasks_data
+
+    @staticmethod
+    def is_terminal(task_data: dict):
+        """
+        is_terminal Test if a task has reached a terminal state
+
+        Parameters
+        ----------
+        task_data : dict
+            Task data from Cloudvision
+
+        Returns
+        -------
+        bool
+            True if task is Completed, Cancelled or Failed
+        """
+        if task_data is not None:
+            return task_data.get(FIELD_TASK_STATUS) in TASK_TERMINAL_STATES
+        return False
+
+    def wait(self, task_ids: list, timeout: float):
+        """
+        wait Poll Cloudvision until all tasks reach a terminal state or timeout expires
+
+        Tasks are removed from polling as soon as they reach a terminal state.
+
+        Parameters
+        ----------
+        task_ids : list
+            List of task IDs to watch
+        timeout : float
+            Maximum time to wait in seconds. At least one poll is always done.
+
+        Returns
+        -------
+        dict
+            Last known data of every task indexed by task ID as provided in task_ids
+        """
+        watched = {str(task_id): task_id for task_id in task_ids}
+        results = dict()
+        pending = list(watched.keys())
+        delay = self.__initial_delay
+        deadline = time.time() + timeout
+        while len(pending) > 0:
+            for task_id, task_data in self.__poll(task_ids=pending).items():
+                results[watched[task_id]] = task_data
+            # Unknown tasks are not watched anymore
+            pending = [task_id for task_id in pending
+                       if results[watched[task_id]] is not None and not self.is_terminal(results[watched[task_id]])]
+            remaining = deadline - time.time()
+            if len(pending) == 0 or remaining <= 0:
+                break
+            MODULE_LOGGER.debug('%s task(s) still running, next poll in %ss', str(len(pending)), str(delay))
+            time.sleep(min(remaining, random.uniform(delay / 2, delay)))
+            delay = min(delay * self.__backoff, self.__max_delay)
+        return results
+
 
 class CvTaskTools():
     """
     CvTaskTools Class to manage Cloudvision tasks execution
     """
 
-    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False):
+    def __init__(self, cv_connection, ansible_module: AnsibleModule = None, check_mode: bool = False, max_workers: int = DEFAULT_MAX_WORKERS):
         self.__cv_client = cv_connection
         self.__ansible = ansible_module
         self.__check_mode = check_mode
+        self.__max_workers = max_workers
+
+    def __get_pending_tasks(self):
+        """
+        __get_pending_tasks Get all pending tasks from Cloudvision in a single call
+
+        Returns
+        -------
+        dict
+            Cloudvision data about pending tasks indexed by task ID
+        """
+        pending_tasks = dict()
+        for task in self.__cv_client.api.get_tasks_by_status('Pending'):
+            pending_tasks[str(task.get(FIELD_TASK_ID))] = task
+        return pending_tasks
 
-    def __get_task_data(self, task_id: str):
+    def __action_task(self, task_id: str, state: str):
         """
-        __get_task_data Get all data for a task from Cloudvision
+        __action_task Add a note to a task and execute or cancel it on Cloudvision
+
+        Workers never call fail_json themselves as they may run in parallel threads:
+        error is returned with the result and reported once all workers are done.
 
         Parameters
         ----------
         task_id : str
-            Cloudvision Task ID to get
+            Task ID to action
+        state : str
+            How to action task: executed/cancelled
 
         Returns
         -------
-        dict
-            Cloudvision data about task
+        tuple
+            Result of the action (CvApiResult) and error message, None if action succeeded
         """
-        data: dict = None
-        data = self.__cv_client.api.get_task_by_id(task_id=task_id)
-        return data
+        api_result = CvApiResult(action_name='task_' + str(task_id))
+        try:
+            self.__cv_client.api.add_note_to_task(task_id, "Executed by Ansible")
+            if state == "executed":
+                api_result.add_entry(self.execute_task(task_id))
+            elif state == "cancelled":
+                api_result.add_entry(self.cancel_task(task_id))
+        except (CvpApiError, CvpRequestError) as error:
+            MODULE_LOGGER.error('Error actioning task %s: %s', str(task_id), str(error))
+            return api_result, 'Error actioning task {}: {}'.format(task_id, str(error))
+        if state in ["executed", "cancelled"]:
+            api_result.changed = True
+            api_result.success = True
+        return api_result, None
 
     def is_actionable(self, task_data: dict):
         """
@@ -117,7 +265,7 @@ class CvTaskTools():
         """
         return self.__cv_client.api.cancel_task(task_id)
 
-    def tasker(self, taskIds_list: list, state: str = 'executed'):
+    def tasker(self, taskIds_list: list, state: str = 'executed', wait: int = 0):
         """
         tasker Generic entry point to manage a set of tasks
 
@@ -127,6 +275,8 @@ class CvTaskTools():
             List of task IDs from user input
         state : str, optional
             How to action tasks: executed/cancelled, by default 'executed'
+        wait : int, optional
+            Time in seconds to wait for executed tasks to complete, by default 0 (no wait)
 
         Returns
         -------
@@ -135,23 +285,64 @@ class CvTaskTools():
         """
         ansible_response = CvAnsibleResponse()
         tasker_manager = CvManagerResult(builder_name='actions_manager')
-        for task_id in taskIds_list:
-            api_result = CvApiResult(action_name='task_' + str(task_id))
-            if self.is_actionable(task_data=self.__get_task_data(task_id)):
-                if self.__ansible.check_mode is False:
-                    self.__cv_client.api.add_note_to_task(task_id, "Executed by Ansible")
-                    if state == "executed":
-                        api_result.add_entry(self.execute_task(task_id))
-                        api_result.changed = True
-                        api_result.success = True
-                    elif state == "cancelled":
-                        api_result.add_entry(self.cancel_task(task_id))
-                        api_result.changed = True
-                        api_result.success = True
-                else:
-                    api_result.add_entry('check_mode')
-                    api_result.changed = False
-                    api_result.success = True
-                tasker_manager.add_change(api_result)
+        pending_tasks = self.__get_pending_tasks()
+        actionable_tasks = [task_id for task_id in taskIds_list
+                            if self.is_actionable(task_data=pending_tasks.get(str(task_id)))]
+        MODULE_LOGGER.info('%s actionable task(s) out of %s', str(len(actionable_tasks)), str(len(taskIds_list)))
+        if self.__ansible.check_mode is False:
+            workers_output = run_concurrently(function=lambda task_id: self.__action_task(task_id=task_id, state=state),
+                                              items=actionable_tasks,
+                                              max_workers=self.__max_workers)
+            errors = [error_message for api_result, error_message in workers_output if error_message is not None]
+            if len(errors) > 0:
+                self.__ansible.fail_json(msg='\n'.join(errors))
+            results = [api_result for api_result, error_message in workers_output]
+        else:
+            results = list()
+            for task_id in actionable_tasks:
+                api_result = CvApiResult(action_name='task_' + str(task_id))
+                api_result.add_entry('check_mode')
+                api_result.changed = False
+                api_result.success = True
+                results.append(api_result)
+        for api_result in results:
+            tasker_manager.add_change(api_result)
+        executed_tasks = actionable_tasks if state == "executed" and self.__ansible.check_mode is False else list()
         ansible_response.add_manager(tasker_manager)
+        if wait > 0 and len(executed_tasks) > 0:
+            ansible_response.add_manager(self.wait_tasks(taskIds_list=executed_tasks, wait=wait))
         return ansible_response
+
+    def wait_tasks(self, taskIds_list: list, wait: int):
+        """
+        wait_tasks Wait for a list of tasks to complete on Cloudvision
+
+        A warning is sent to Ansible for every task not completed before timeout.
+
+        Parameters
+        ----------
+        taskIds_list : list
+            List of task IDs to wait for
+        wait : int
+            Maximum time to wait in seconds
+
+        Returns
+        -------
+        CvManagerResult
+            Manager listing tasks completed on Cloudvision
+        """
+        completion_manager = CvManagerResult(builder_name='tasks_completed')
+        tasks_data = CvTaskWatcher(cv_connection=self.__cv_client).wait(task_ids=taskIds_list, timeout=wait)
+        for task_id in taskIds_list:
+            task_data = tasks_data.get(task_id)
+            status = task_data.get(FIELD_TASK_STATUS) if task_data is not None else None
+            api_result = CvApiResult(action_name='task_' + str(task_id))
+            if status == 'Completed':
+                api_result.add_entry(status)
+                api_result.success = True
+                completion_manager.add_change(api_result)
+            elif status in TASK_TERMINAL_STATES:
+                self.__ansible.warn('Task {} is {}'.format(task_id, status))
+            else:
+                self.__ansible.warn('Task {} has not completed in {} seconds'.format(task_id, wait))
+        return completion_manager
@@ -73,18 +73,17 @@ def compare(fromText, toText, fromName='', toName='', lines=10):
           '  '    line common to both sequences
           '? '    line not present in either input sequence
     """
-    fromlines = str_cleanup_line_ending(content=fromText).splitlines(1)
-    tolines = str_cleanup_line_ending(content=toText).splitlines(1)
-    diff = list(difflib.unified_diff(
-        fromlines, tolines, fromName, toName, n=lines))
     # Calculate and compare hash values to produce the boolean.
     fromHash = hashlib.sha1(fromText.encode()).hexdigest()
     toHash = hashlib.sha1(toText.encode()).hexdigest()
     if fromHash == toHash:
-        cfglet_changed = False
-    else:
-        cfglet_changed = True
-    return [cfglet_changed, diff]
+        # Identical content, no need to compute unified diff
+        return [False, []]
+    fromlines = str_cleanup_line_ending(content=fromText).splitlines(1)
+    tolines = str_cleanup_line_ending(content=toText).splitlines(1)
+    diff = list(difflib.unified_diff(
+        fromlines, tolines, fromName, toName, n=lines))
+    return [True, diff]
 
 
 def isIterable(testing_object=None):
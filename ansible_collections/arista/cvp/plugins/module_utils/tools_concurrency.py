@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+
+LOGGER = logging.getLogger('arista.cvp.tools_concurrency')
+
+# Default number of API calls sent in parallel to Cloudvision
+DEFAULT_MAX_WORKERS = 4
+
+
+def run_concurrently(function, items: list, max_workers: int = DEFAULT_MAX_WORKERS):
+    """
+    run_concurrently Execute a function for every item using a bounded pool of threads.
+
+    Results are returned in the same order as items, whatever the order in which
+    workers complete. When max_workers is 1 or lower, items are processed serially
+    in the calling thread.
+
+    Example
+    -------
+    >>> run_concurrently(function=lambda x: x * 2, items=[1, 2, 3], max_workers=2)
+    [2, 4, 6]
+
+    Parameters
+    ----------
+    function : callable
+        Function to execute with every item as unique argument
+    items : list
+        List of items to process
+    max_workers : int, optional
+        Maximum number of threads running in parallel, by default DEFAULT_MAX_WORKERS
+
+    Returns
+    -------
+    list
+        List of function results ordered like items
+    """
+    items = list(items)
+    if max_workers is None or max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    LOGGER.debug('Running %s jobs with %s workers', str(len(items)), str(max_workers))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(function, items))
+
+
+class WorkerFailure(Exception):
+    """
+    WorkerFailure Exception raised in a worker thread instead of AnsibleModule.fail_json
+    """
+
+    def __init__(self, fail_args: dict):
+        super(WorkerFailure, self).__init__(fail_args.get('msg'))
+        self.fail_args = fail_args
+
+
+class ThreadSafeModule(object):
+    """
+    ThreadSafeModule AnsibleModule proxy to use in worker threads
+
+    AnsibleModule.fail_json prints module output and exits: it must be called
+    from the main thread only. This proxy raises WorkerFailure instead, so
+    failure can be reported by the main thread once workers are done. All
+    other attributes are read from the wrapped AnsibleModule.
+
+    Example
+    -------
+    >>> proxy = ThreadSafeModule(ansible_module)
+    >>> try:
+    ...     run_concurrently(function=lambda item: worker(item, proxy), items=items)
+    ... except WorkerFailure as failure:
+    ...     ansible_module.fail_json(**failure.fail_args)
+    """
+
+    def __init__(self, ansible_module):
+        self.__ansible = ansible_module
+
+    def fail_json(self, **kwargs):
+        """
+        fail_json Raise WorkerFailure with arguments for AnsibleModule.fail_json
+        """
+        LOGGER.error('Worker failure: %s', str(kwargs.get('msg')))
+        raise WorkerFailure(fail_args=kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.__ansible, name)
@@ -23,35 +23,305 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 import logging
 import traceback
+import os
+import json
+import time
+import hashlib
 from ansible.module_utils.connection import Connection
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsStore, FACTS_DEVICES, FACTS_CONTAINERS, FACTS_CONFIGLETS
 try:
+    from cvprac import __version__ as CVPRAC_VERSION
     from cvprac.cvp_client import CvpClient
-    from cvprac.cvp_client_errors import CvpLoginError
+    from cvprac.cvp_client_errors import CvpLoginError, CvpApiError, CvpRequestError, CvpSessionLogOutError
+    from requests.adapters import HTTPAdapter
+    from requests.exceptions import RequestException
+    from requests.utils import cookiejar_from_dict, dict_from_cookiejar
     HAS_CVPRAC = True
 except ImportError:
     HAS_CVPRAC = False
     CVPRAC_IMP_ERR = traceback.format_exc()
+    CvpClient = object
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
 
 LOGGER = logging.getLogger('arista.cvp.cv_tools')
 
+# Reuse CVP sessions across module executions (disable with ANSIBLE_CVP_SESSION_CACHE=false)
+SESSION_CACHE_ENABLED = os.getenv('ANSIBLE_CVP_SESSION_CACHE', 'true').lower() in ['true', 'yes', '1']
+# Number of seconds a cached session is considered as valid
+SESSION_CACHE_TTL = int(os.getenv('ANSIBLE_CVP_SESSION_TTL', '600'))
+# Name of the session cache file created in Ansible persistent connection directory
+SESSION_CACHE_FILENAME = 'arista.cvp.sessions.json'
+# Share cv_facts output with next modules (enable with ANSIBLE_CVP_FACTS_CACHE=true)
+FACTS_STORE_ENABLED = os.getenv('ANSIBLE_CVP_FACTS_CACHE', 'false').lower() in ['true', 'yes', '1']
+# Number of seconds shared facts are considered as valid
+FACTS_STORE_TTL = int(os.getenv('ANSIBLE_CVP_FACTS_TTL', '300'))
+# Number of HTTP connection pools cached per session (one pool per Cloudvision node)
+POOL_CONNECTIONS = int(os.getenv('ANSIBLE_CVP_POOL_CONNECTIONS', '10'))
+# Maximum number of connections kept open per pool, raised to max_workers of module if lower
+POOL_MAXSIZE = int(os.getenv('ANSIBLE_CVP_POOL_MAXSIZE', '10'))
+# Wait for a free connection instead of opening a connection which is not kept when pool is full
+POOL_BLOCK = os.getenv('ANSIBLE_CVP_POOL_BLOCK', 'false').lower() in ['true', 'yes', '1']
+
+
+class CvpPooledClient(CvpClient):
+    """
+    CvpPooledClient CvpClient with tuned HTTP connection pools and keep-alive
+
+    cvprac creates a new requests session on every login. Every session is
+    configured as soon as it is set on client, before any request is sent, so
+    TLS connections are kept open and reused by all threads sharing the client.
+
+    Example
+    -------
+    >>> client = CvpPooledClient(pool_maxsize=16, pool_block=True)
+    >>> client.connect(nodes=['cv.example.com'], username='ansible', password='ansible')
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 pool_block: bool = POOL_BLOCK):
+        self.__pool_args = dict(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.__session = None
+        super(CvpPooledClient, self).__init__()
+
+    @property
+    def session(self):
+        """
+        session Getter for requests session used by cvprac
+
+        Returns
+        -------
+        requests.Session
+            Current session, None if client is not connected
+        """
+        return self.__session
+
+    @session.setter
+    def session(self, session):
+        if session is not None:
+            session.mount('https://', HTTPAdapter(**self.__pool_args))
+            session.headers['Connection'] = 'keep-alive'
+        self.__session = session
+
+
+def session_cache_key(host, port, user):
+    """
+    session_cache_key Build key to use in session cache file for a given CV instance and user.
+
+    Parameters
+    ----------
+    host : str
+        Cloudvision hostname or IP address
+    port : int
+        Cloudvision HTTPS port
+    user : str
+        Username used to authenticate against Cloudvision
+
+    Returns
+    -------
+    str
+        SHA256 digest of host, port and user
+    """
+    return hashlib.sha256('{}:{}:{}'.format(host, port, user).encode('utf-8')).hexdigest()
+
+
+def session_cache_update(cache_file, key, session=None, remove=False):
+    """
+    session_cache_update Read and update session cache file under an exclusive lock.
+
+    Expired sessions are purged from the file. If session is set, it is saved
+    under key. If remove is True, entry for key is deleted.
+
+    Parameters
+    ----------
+    cache_file : str
+        Path to the session cache file
+    key : str
+        Key of the session to read or update, see session_cache_key
+    session : dict, optional
+        Session data to save, by default None
+    remove : bool, optional
+        Delete session saved under key, by default False
+
+    Returns
+    -------
+    dict
+        Session saved under key before the update. None if not found or expired.
+    """
+    if not HAS_FCNTL:
+        return None
+    file_descriptor = os.open(cache_file, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(file_descriptor, 'r+') as cache:
+        # Lock is released when file is closed
+        fcntl.flock(cache, fcntl.LOCK_EX)
+        try:
+            sessions = json.loads(cache.read() or '{}')
+        except ValueError:
+            LOGGER.warning('Session cache %s is corrupted, resetting it', cache_file)
+            sessions = dict()
+        now = time.time()
+        sessions = {k: v for k, v in sessions.items() if v.get('expiry', 0) > now}
+        previous_session = sessions.get(key)
+        if session is not None:
+            sessions[key] = session
+        elif remove:
+            sessions.pop(key, None)
+        cache.seek(0)
+        cache.truncate()
+        json.dump(sessions, cache)
+    return previous_session
+
+
+def session_cache_get(cache_file, key):
+    """
+    session_cache_get Get a valid session from cache file.
+
+    Parameters
+    ----------
+    cache_file : str
+        Path to the session cache file
+    key : str
+        Key of the session to get, see session_cache_key
+
+    Returns
+    -------
+    dict
+        Session data with session_id, cookies and expiry. None if not found or expired.
+    """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        return session_cache_update(cache_file=cache_file, key=key)
+    except (IOError, OSError) as error:
+        LOGGER.warning('Cannot read session cache %s: %s', cache_file, str(error))
+    return None
+
+
+def session_cache_set(cache_file, key, client, ttl=SESSION_CACHE_TTL):
+    """
+    session_cache_set Save session of a connected CvpClient in cache file.
+
+    Parameters
+    ----------
+    cache_file : str
+        Path to the session cache file
+    key : str
+        Key of the session to save, see session_cache_key
+    client : CvpClient
+        Connected CvpClient
+    ttl : int, optional
+        Number of seconds session is considered as valid, by default SESSION_CACHE_TTL
+    """
+    if 'APP_SESSION_ID' not in client.headers or client.cookies is None:
+        return
+    session = {
+        'session_id': client.headers['APP_SESSION_ID'],
+        'cookies': dict_from_cookiejar(client.cookies),
+        'expiry': time.time() + ttl
+    }
+    try:
+        session_cache_update(cache_file=cache_file, key=key, session=session)
+    except (IOError, OSError) as error:
+        LOGGER.warning('Cannot save session in cache %s: %s', cache_file, str(error))
+
+
+def session_cache_delete(cache_file, key):
+    """
+    session_cache_delete Remove a session from cache file.
+
+    Parameters
+    ----------
+    cache_file : str
+        Path to the session cache file
+    key : str
+        Key of the session to remove, see session_cache_key
+    """
+    try:
+        session_cache_update(cache_file=cache_file, key=key, remove=True)
+    except (IOError, OSError) as error:
+        LOGGER.warning('Cannot remove session from cache %s: %s', cache_file, str(error))
+
+
+def cv_restore_session(client, session, connect_args):
+    """
+    cv_restore_session Connect a CvpClient using a cached session instead of a login request.
+
+    Cached session token is given to cvprac as api_token, so connection does
+    not run any login request. Client is then switched back to session cookies
+    and username/password authentication: cvprac runs a regular login if it has
+    to re-create session later on.
+
+    Session is validated with a getCvpInfo call which is required by cvprac to
+    discover API version anyway. If Cloudvision rejects the session (expired or
+    logged out), function returns False and caller has to authenticate again.
+
+    Parameters
+    ----------
+    client : CvpClient
+        CvpClient to connect
+    session : dict
+        Cached session data
+    connect_args : dict
+        Arguments to pass to CvpClient.connect
+
+    Returns
+    -------
+    bool
+        True if client is connected with cached session, False otherwise
+    """
+    try:
+        client.connect(**dict(connect_args, api_token=session['session_id']))
+    except CvpLoginError:
+        return False
+    client.api_token = None
+    client.headers.pop('Authorization', None)
+    client.cookies = cookiejar_from_dict(session['cookies'])
+    client.headers['APP_SESSION_ID'] = session['session_id']
+    try:
+        client.api.get_cvp_info()
+    except (CvpApiError, CvpRequestError, CvpSessionLogOutError, RequestException, ValueError) as error:
+        LOGGER.info('Cached session has been rejected by CVP: %s', str(error))
+        return False
+    return True
+
 
-def cv_connect(module):
+def cv_connect(module, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+               pool_block: bool = POOL_BLOCK):
     """
     cv_connect CV Connection method.
 
     Generic Cloudvision connection method to connect to either on-prem or cvaas instances.
 
+    Sessions opened with username and password are saved in a cache file
+    located in the Ansible persistent connection directory and reused by next
+    modules until they expire or are rejected by Cloudvision.
+
+    HTTP connections are kept alive and pooled. Pool is sized to at least
+    max_workers of the module, so every worker thread reuses its own TLS connection.
+
     Parameters
     ----------
     module : AnsibleModule
         Ansible module information
+    pool_connections : int, optional
+        Number of connection pools cached, by default POOL_CONNECTIONS
+    pool_maxsize : int, optional
+        Maximum number of connections kept open per pool, by default POOL_MAXSIZE
+    pool_block : bool, optional
+        Wait for a free connection when pool is full, by default POOL_BLOCK
 
     Returns
     -------
     CvpClient
         Instanciated CvpClient with connection information.
     """
-    client = CvpClient()
+    pool_args = dict(pool_connections=pool_connections,
+                     pool_maxsize=max(pool_maxsize, module.params.get('max_workers') or 0),
+                     pool_block=pool_block)
+    client = CvpPooledClient(**pool_args)
     LOGGER.info('Connecting to CVP')
     connection = Connection(module._socket_path)
     host = connection.get_option("host")
@@ -74,27 +344,171 @@ def cv_connect(module):
                  str(host),
                  str(ansible_connect_timeout),
                  str(ansible_command_timeout))
+    LOGGER.debug('  Using HTTP connection pools: %s', str(pool_args))
+    connect_args = dict(nodes=[host],
+                        username=user,
+                        cvaas_token=cvaas_token,
+                        password=user_authentication,
+                        protocol="https",
+                        is_cvaas=is_cvaas,
+                        port=port,
+                        cert=cert_validation,
+                        request_timeout=ansible_command_timeout,
+                        connect_timeout=ansible_connect_timeout
+                        )
+
+    cache_file = None
+    if SESSION_CACHE_ENABLED and HAS_FCNTL and not is_cvaas:
+        cache_file = os.path.join(os.path.dirname(module._socket_path), SESSION_CACHE_FILENAME)
+        cache_key = session_cache_key(host=host, port=port, user=user)
+        cached_session = session_cache_get(cache_file=cache_file, key=cache_key)
+        if cached_session is not None:
+            if cv_restore_session(client=client, session=cached_session, connect_args=connect_args):
+                if client.headers.get('APP_SESSION_ID') != cached_session['session_id']:
+                    # cvprac had to login again during validation
+                    session_cache_set(cache_file=cache_file, key=cache_key, client=client)
+                LOGGER.info('Connected to CVP using cached session')
+                return client
+            session_cache_delete(cache_file=cache_file, key=cache_key)
+            client = CvpPooledClient(**pool_args)
+
     try:
-        client.connect(nodes=[host],
-                       username=user,
-                       cvaas_token=cvaas_token,
-                       password=user_authentication,
-                       protocol="https",
-                       is_cvaas=is_cvaas,
-                       port=port,
-                       cert=cert_validation,
-                       request_timeout=ansible_command_timeout,
-                       connect_timeout=ansible_connect_timeout
-                       )
+        client.connect(**connect_args)
     except CvpLoginError as e:
         module.fail_json(msg=str(e))
         LOGGER.error('Cannot connect to CVP: %s', str(e))
 
+    if cache_file is not None:
+        session_cache_set(cache_file=cache_file, key=cache_key, client=client)
     LOGGER.info('Connected to CVP')
 
     return client
 
 
+def cv_save_topology(client):
+    """
+    cv_save_topology Save all actions staged on Cloudvision with a single saveTopology call
+
+    cvprac saves topology only when an action is sent with create_task=True
+    and does not expose any public method to save actions staged with
+    create_task=False. Its private method is only called here so a cvprac
+    change is managed in a single place.
+
+    Parameters
+    ----------
+    client : CvpClient
+        cvprac client connected to Cloudvision
+
+    Returns
+    -------
+    dict
+        Cloudvision response with status and taskIds, None if request failed
+
+    Raises
+    ------
+    CvpApiError
+        Installed cvprac version does not support saving staged actions
+    """
+    save_topology = getattr(client.api, '_save_topology_v2', None)
+    if save_topology is None:
+        raise CvpApiError(msg='cvprac {} cannot save staged actions, please upgrade cvprac'.format(CVPRAC_VERSION))
+    return save_topology([])
+
+
+def cv_facts_store(module):
+    """
+    cv_facts_store Get store of facts shared by cv_facts for Cloudvision instance and user of module connection.
+
+    Store is located in the Ansible persistent connection directory, next to
+    session cache file. Like sessions, facts are not shared between users as
+    they may not have the same permissions on Cloudvision.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module information
+
+    Returns
+    -------
+    CvFactsStore
+        Store of shared facts, None if ANSIBLE_CVP_FACTS_CACHE is not enabled
+    """
+    if not FACTS_STORE_ENABLED:
+        return None
+    connection = Connection(module._socket_path)
+    return CvFactsStore(store_dir=os.path.dirname(module._socket_path),
+                        host=session_cache_key(host=connection.get_option("host"),
+                                               port=connection.get_option("port"),
+                                               user=connection.get_option("remote_user")),
+                        ttl=FACTS_STORE_TTL)
+
+
+def cv_facts_load(module):
+    """
+    cv_facts_load Load facts shared by cv_facts when cvp_facts is not set by playbook.
+
+    Module fails if no valid facts with devices, containers and configlets are shared.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module information
+
+    Returns
+    -------
+    dict
+        Facts to use as cvp_facts
+    """
+    facts_store = cv_facts_store(module)
+    facts = facts_store.get() if facts_store is not None else None
+    if facts is None or any(facts_type not in facts for facts_type in [FACTS_DEVICES, FACTS_CONTAINERS, FACTS_CONFIGLETS]):
+        module.fail_json(msg='cvp_facts is required: no valid facts shared by cv_facts, '
+                             'run cv_facts first with ANSIBLE_CVP_FACTS_CACHE=true')
+    return facts
+
+
+def cv_facts_invalidate(module):
+    """
+    cv_facts_invalidate Discard facts shared by cv_facts once module has changed Cloudvision.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module information
+    """
+    facts_store = cv_facts_store(module)
+    if facts_store is not None:
+        facts_store.invalidate()
+
+
+def cv_facts_invalidate_on_failure(module):
+    """
+    cv_facts_invalidate_on_failure Discard facts shared by cv_facts when module fails.
+
+    A module failing after some of its changes have been sent to Cloudvision
+    leaves shared facts outdated as well. fail_json of module is wrapped to
+    invalidate facts before failing, except in check_mode.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module information
+    """
+    if not FACTS_STORE_ENABLED:
+        return
+    fail_json = module.fail_json
+
+    def fail_json_invalidate(*args, **kwargs):
+        if not module.check_mode:
+            try:
+                cv_facts_invalidate(module)
+            except Exception as error:
+                LOGGER.error('Cannot invalidate facts shared by cv_facts: %s', str(error))
+        fail_json(*args, **kwargs)
+
+    module.fail_json = fail_json_invalidate
+
+
 def isIterable(testing_object=None):
     """
     Test if an object is iterable or not.
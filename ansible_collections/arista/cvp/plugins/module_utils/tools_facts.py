@@ -0,0 +1,752 @@
+#!/usr/bin/env python
+# coding: utf-8 -*-
+#
+# GNU General Public License v3.0+
+#
+# Copyright 2019 Arista Networks AS-EMEA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import logging
+import os
+import re
+import json
+import gzip
+import fnmatch
+import hashlib
+import tempfile
+import time
+import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
+
+LOGGER = logging.getLogger('arista.cvp.tools_facts')
+
+# Fields name used in cv_facts output
+FACTS_DEVICES = 'devices'
+FACTS_CONTAINERS = 'containers'
+FACTS_CONFIGLETS = 'configlets'
+FACTS_TASKS = 'tasks'
+FIELD_HOSTNAME = 'hostname'
+FIELD_SYSMAC = 'systemMacAddress'
+FIELD_KEY = 'key'
+FIELD_NAME = 'name'
+# Containers are indexed with fields name used by Cloudvision inventory API
+FIELD_CONTAINER_KEY = 'Key'
+FIELD_CONTAINER_NAME = 'Name'
+# Markers of Cloudvision data used to validate cached facts details
+# Image bundles with devices and containers they are applied to
+MARKER_IMAGES = 'images'
+# Marker each cached detail depends on: detail is collected again when marker has changed.
+# Details without marker, like device running configuration, are never cached.
+DETAILS_MARKERS = {
+    'imageBundle': MARKER_IMAGES
+}
+# Fields of Cloudvision objects cached details depend on
+MARKER_FIELDS = {
+    FACTS_DEVICES: ['key', 'systemMacAddress', 'parentContainerKey'],
+    FACTS_CONTAINERS: ['key', 'name']
+}
+
+
+class CvFactsIndex(object):
+    """
+    CvFactsIndex Facts from cv_facts indexed once for O(1) lookups
+
+    Devices are indexed by hostname, key and system MAC address, containers
+    by name and key and configlets by name and key. When a value is found more
+    than once, first entry is kept to mimic a linear search in facts.
+
+    Example
+    -------
+    >>> index = CvFactsIndex(facts=module.params['cvp_facts'])
+    >>> index.get_device(search_value='veos01')
+    {'hostname': 'veos01', 'key': '50:8d:00:e3:78:aa', ...}
+    >>> index.get_configlet(search_value='veos01-basic-configuration')['key']
+    'configlet_1234_5678'
+    """
+
+    def __init__(self, facts: dict):
+        facts = facts if facts is not None else dict()
+        self.__indexes = {
+            FACTS_DEVICES: self.__build(facts.get(FACTS_DEVICES), [FIELD_HOSTNAME, FIELD_KEY, FIELD_SYSMAC]),
+            FACTS_CONTAINERS: self.__build(facts.get(FACTS_CONTAINERS), [FIELD_CONTAINER_NAME, FIELD_CONTAINER_KEY]),
+            FACTS_CONFIGLETS: self.__build(facts.get(FACTS_CONFIGLETS), [FIELD_NAME, FIELD_KEY])
+        }
+        LOGGER.debug('Facts index built with %s devices, %s containers and %s configlets',
+                     str(len(self.__indexes[FACTS_DEVICES][FIELD_HOSTNAME])),
+                     str(len(self.__indexes[FACTS_CONTAINERS][FIELD_CONTAINER_NAME])),
+                     str(len(self.__indexes[FACTS_CONFIGLETS][FIELD_NAME])))
+
+    def __build(self, entries: list, fields: list):
+        """
+        __build Index a list of facts entries by a list of fields
+
+        Parameters
+        ----------
+        entries : list
+            List of entries from cv_facts
+        fields : list
+            List of fields to index entries with
+
+        Returns
+        -------
+        dict
+            Dict of indexes, one per field, with entries indexed by field value
+        """
+        indexes = {field: dict() for field in fields}
+        for entry in entries if entries is not None else list():
+            for field, index in indexes.items():
+                if entry.get(field) is not None:
+                    index.setdefault(entry[field], entry)
+        return indexes
+
+    def __get(self, facts_type: str, search_value: str, search_by: str):
+        if search_by not in self.__indexes[facts_type]:
+            LOGGER.error('Unsupported search method for %s index: %s', str(facts_type), str(search_by))
+            return None
+        return self.__indexes[facts_type][search_by].get(search_value)
+
+    def get_device(self, search_value: str, search_by: str = FIELD_HOSTNAME):
+        """
+        get_device Get device facts from index
+
+        Parameters
+        ----------
+        search_value : str
+            Value to look for
+        search_by : str, optional
+            Field to use to search device (hostname, key or systemMacAddress), by default hostname
+
+        Returns
+        -------
+        dict
+            Device facts, None if not found
+        """
+        return self.__get(facts_type=FACTS_DEVICES, search_value=search_value, search_by=search_by)
+
+    def get_container(self, search_value: str, search_by: str = FIELD_CONTAINER_NAME):
+        """
+        get_container Get container facts from index
+
+        Parameters
+        ----------
+        search_value : str
+            Value to look for
+        search_by : str, optional
+            Field to use to search container (Name or Key), by default Name
+
+        Returns
+        -------
+        dict
+            Container facts, None if not found
+        """
+        return self.__get(facts_type=FACTS_CONTAINERS, search_value=search_value, search_by=search_by)
+
+    def get_configlet(self, search_value: str, search_by: str = FIELD_NAME):
+        """
+        get_configlet Get configlet facts from index
+
+        Parameters
+        ----------
+        search_value : str
+            Value to look for
+        search_by : str, optional
+            Field to use to search configlet (name or key), by default name
+
+        Returns
+        -------
+        dict
+            Configlet facts, None if not found
+        """
+        return self.__get(facts_type=FACTS_CONFIGLETS, search_value=search_value, search_by=search_by)
+
+
+def facts_marker(data, fields: list = None):
+    """
+    facts_marker Compute a marker to detect any change in data between 2 executions
+
+    Parameters
+    ----------
+    data : any
+        JSON serializable data
+    fields : list, optional
+        Only use these fields of data, to ignore volatile fields like device status. By default all data is used
+
+    Returns
+    -------
+    str
+        SHA256 digest of data
+    """
+    if fields is not None:
+        data = {field: data.get(field) for field in fields}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class CvFactsCache(object):
+    """
+    CvFactsCache Facts details saved between executions to collect only what changed on Cloudvision
+
+    Cache file is a JSON document with one section per facts type (devices,
+    containers). Every entry of a section is saved with a marker of the
+    Cloudvision object it has been collected for, and section saves markers of
+    Cloudvision data details depend on (see DETAILS_MARKERS). A cached
+    detail is reused if object marker and marker of the detail are unchanged.
+    Only details with a marker are saved.
+
+    Cache is reset when Cloudvision host or version is not the one saved in file.
+
+    Example
+    -------
+    >>> cache = CvFactsCache(cache_file='cv_facts.json', host='https://cv:443/web', version='2021.1.0')
+    >>> cache.set_marker(name=MARKER_IMAGES, data=module.client.api.get_image_bundles()['data'])
+    >>> marker = facts_marker(device, fields=MARKER_FIELDS['devices'])
+    >>> details = cache.get(facts_type='devices', key=device['key'], marker=marker)
+    >>> cache.set(facts_type='devices', key=device['key'], marker=marker, details=details)
+    >>> cache.save()
+    """
+
+    def __init__(self, cache_file: str, host: str, version: str):
+        self.__cache_file = cache_file
+        self.__host = host
+        self.__version = version
+        self.__markers = dict()
+        self.__previous = self.__load()
+        self.__current = dict()
+        self.__hits = 0
+
+    def __load(self):
+        """
+        __load Read cache file and check it has been built for current Cloudvision
+
+        Returns
+        -------
+        dict
+            Content of cache file, empty dict if file is missing, invalid or outdated
+        """
+        if not os.path.exists(self.__cache_file):
+            LOGGER.info('Facts cache %s not found, collecting all facts', str(self.__cache_file))
+            return dict()
+        try:
+            with open(self.__cache_file, 'r') as cache:
+                data = json.load(cache)
+        except (IOError, OSError, ValueError) as error:
+            LOGGER.warning('Cannot read facts cache %s: %s', str(self.__cache_file), str(error))
+            return dict()
+        if data.get('host') != self.__host or data.get('version') != self.__version:
+            LOGGER.info('Facts cache %s built for another Cloudvision instance or version, collecting all facts',
+                        str(self.__cache_file))
+            return dict()
+        return data
+
+    @property
+    def hits(self):
+        """
+        hits Getter for number of entries found in cache during execution
+
+        Returns
+        -------
+        int
+            Number of entries with at least one detail reused from cache
+        """
+        return self.__hits
+
+    def set_marker(self, name: str, data):
+        """
+        set_marker Set marker of Cloudvision data details depend on
+
+        Parameters
+        ----------
+        name : str
+            Name of the marker, see DETAILS_MARKERS
+        data : any
+            Current Cloudvision data to compute marker from
+        """
+        self.__markers[name] = facts_marker(data)
+
+    def get(self, facts_type: str, key: str, marker: str):
+        """
+        get Get details still valid for a Cloudvision object
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers)
+        key : str
+            Key of the Cloudvision object
+        marker : str
+            Marker of the Cloudvision object, see facts_marker
+
+        Returns
+        -------
+        dict
+            Details which can be reused, empty dict if object has changed
+        """
+        section = self.__previous.get(facts_type, dict())
+        entry = section.get('entries', dict()).get(key)
+        if entry is None or entry.get('marker') != marker:
+            return dict()
+        previous_markers = section.get('markers', dict())
+        details = dict()
+        for field, value in entry.get('details', dict()).items():
+            marker_name = DETAILS_MARKERS.get(field)
+            if (marker_name is not None and marker_name in self.__markers
+                    and previous_markers.get(marker_name) == self.__markers[marker_name]):
+                details[field] = value
+        if len(details) > 0:
+            self.__hits += 1
+        return details
+
+    def set(self, facts_type: str, key: str, marker: str, details: dict):
+        """
+        set Save details collected for a Cloudvision object
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers)
+        key : str
+            Key of the Cloudvision object
+        marker : str
+            Marker of the Cloudvision object, see facts_marker
+        details : dict
+            Details collected for the object, details without marker are not saved
+        """
+        section = self.__current.setdefault(facts_type, {'markers': dict(self.__markers), 'entries': dict()})
+        section['entries'][key] = {'marker': marker,
+                                   'details': {field: value for field, value in details.items() if field in DETAILS_MARKERS}}
+
+    def save(self):
+        """
+        save Write cache file
+
+        Sections not collected during execution are kept from previous cache
+        file. File is replaced atomically so a failed execution never leaves a
+        partial cache.
+        """
+        data = dict(self.__previous)
+        data.update(self.__current)
+        data['host'] = self.__host
+        data['version'] = self.__version
+        cache_dir = os.path.dirname(os.path.abspath(self.__cache_file))
+        try:
+            file_descriptor, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix='.cv_facts')
+            with os.fdopen(file_descriptor, 'w') as cache:
+                json.dump(data, cache)
+            os.replace(tmp_file, self.__cache_file)
+        except (IOError, OSError) as error:
+            LOGGER.warning('Cannot save facts cache %s: %s', str(self.__cache_file), str(error))
+            return
+        LOGGER.info('Facts cache %s saved with %s entries reused', str(self.__cache_file), str(self.__hits))
+
+
+class CvFactsWriter(object):
+    """
+    CvFactsWriter Write facts to a newline-delimited JSON file while they are collected
+
+    Every line is a JSON document with type of facts and entry:
+    {"facts": "devices", "data": {"hostname": "veos01", ...}}
+
+    File is written in a temporary file and moved to its destination when
+    closed, so destination file is never a partial output. Temporary file is
+    removed by abort when collection fails.
+
+    Example
+    -------
+    >>> writer = CvFactsWriter(output_file='cv_facts.ndjson.gz', compress=True)
+    >>> try:
+    ...     writer.write(facts_type='devices', data=device)
+    ...     writer.close()
+    ... finally:
+    ...     writer.abort()
+    >>> writer.summary
+    {'devices': 1}
+    """
+
+    def __init__(self, output_file: str, compress: bool = False):
+        self.__output_file = output_file
+        self.__summary = dict()
+        file_descriptor, self.__tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_file)),
+                                                            prefix='.cv_facts')
+        os.close(file_descriptor)
+        self.__closed = False
+        if compress:
+            self.__output = gzip.open(self.__tmp_file, 'wt')
+        else:
+            self.__output = open(self.__tmp_file, 'w')
+
+    @property
+    def summary(self):
+        """
+        summary Getter for number of entries written per type of facts
+
+        Returns
+        -------
+        dict
+            Number of entries indexed by type of facts
+        """
+        return self.__summary
+
+    def write(self, facts_type: str, data):
+        """
+        write Write a facts entry as a new line of output file
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers, configlets, tasks)
+        data : any
+            JSON serializable entry
+        """
+        self.__output.write(json.dumps({'facts': facts_type, 'data': data}, default=str))
+        self.__output.write('\n')
+        self.__summary[facts_type] = self.__summary.get(facts_type, 0) + 1
+
+    def close(self):
+        """
+        close Close output and move it to destination file
+        """
+        self.__output.close()
+        os.replace(self.__tmp_file, self.__output_file)
+        self.__closed = True
+        LOGGER.info('Facts written to %s: %s', str(self.__output_file), str(self.__summary))
+
+    def abort(self):
+        """
+        abort Close output and remove temporary file, destination file is not updated
+
+        Nothing is done when output has already been moved to destination file.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__output.close()
+        try:
+            os.remove(self.__tmp_file)
+        except OSError as error:
+            LOGGER.warning('Cannot remove temporary facts file %s: %s', str(self.__tmp_file), str(error))
+            return
+        LOGGER.info('Facts not written to %s', str(self.__output_file))
+
+
+class CvFactsStore(object):
+    """
+    CvFactsStore Facts collected by cv_facts shared with next modules on Ansible controller
+
+    Facts are saved in one JSON file per Cloudvision host and user and are valid for
+    ttl seconds after their collection started. Modules changing Cloudvision
+    invalidate saved facts, and facts collected before an invalidation are
+    never saved.
+
+    Example
+    -------
+    >>> store = CvFactsStore(store_dir='~/.ansible/pc', host='cv.example.com:443', ttl=300)
+    >>> store.set(facts=facts, params={'facts': ['all'], 'gather_subset': ['default']})
+    >>> store.get()
+    {'cvp_info': {...}, 'devices': [...], ...}
+    >>> store.invalidate()
+    >>> store.get() is None
+    True
+    """
+
+    def __init__(self, store_dir: str, host: str, ttl: int = 300):
+        self.__store_file = os.path.join(store_dir, 'arista.cvp.facts.{}.json'.format(
+            hashlib.sha256(host.encode('utf-8')).hexdigest()))
+        self.__host = host
+        self.__ttl = ttl
+        self.__started = time.time()
+
+    def __read(self):
+        """
+        __read Read store file
+
+        Returns
+        -------
+        dict
+            Content of store file, empty dict if file is missing or invalid
+        """
+        if not os.path.exists(self.__store_file):
+            return dict()
+        try:
+            with open(self.__store_file, 'r') as store:
+                data = json.load(store)
+        except (IOError, OSError, ValueError) as error:
+            LOGGER.warning('Cannot read facts store %s: %s', str(self.__store_file), str(error))
+            return dict()
+        return data if data.get('host') == self.__host else dict()
+
+    def __write(self, data: dict):
+        """
+        __write Replace store file atomically
+
+        Parameters
+        ----------
+        data : dict
+            Content of store file
+        """
+        data['host'] = self.__host
+        try:
+            file_descriptor, tmp_file = tempfile.mkstemp(dir=os.path.dirname(self.__store_file), prefix='.cv_facts')
+            with os.fdopen(file_descriptor, 'w') as store:
+                json.dump(data, store, default=str)
+            os.chmod(tmp_file, 0o600)
+            os.replace(tmp_file, self.__store_file)
+        except (IOError, OSError) as error:
+            LOGGER.warning('Cannot write facts store %s: %s', str(self.__store_file), str(error))
+
+    def get(self, params: dict = None):
+        """
+        get Get facts saved for Cloudvision host
+
+        Parameters
+        ----------
+        params : dict, optional
+            cv_facts parameters facts must have been collected with, by default None to accept any
+
+        Returns
+        -------
+        dict
+            Facts saved by cv_facts, None if not found, expired or collected with other parameters
+        """
+        data = self.__read()
+        if 'facts' not in data:
+            LOGGER.info('No facts saved for %s', str(self.__host))
+            return None
+        if time.time() - data.get('timestamp', 0) > self.__ttl:
+            LOGGER.info('Facts saved for %s have expired', str(self.__host))
+            return None
+        if params is not None and data.get('params') != params:
+            LOGGER.info('Facts saved for %s have been collected with other parameters', str(self.__host))
+            return None
+        LOGGER.info('Using facts saved for %s', str(self.__host))
+        return data['facts']
+
+    def set(self, facts: dict, params: dict):
+        """
+        set Save facts collected for Cloudvision host
+
+        Facts are not saved if store has been invalidated since object has been
+        created, as they may have been collected before Cloudvision changed.
+
+        Parameters
+        ----------
+        facts : dict
+            Facts built by cv_facts
+        params : dict
+            cv_facts parameters facts have been collected with
+        """
+        if self.__read().get('invalidated', 0) >= self.__started:
+            LOGGER.warning('Facts for %s not saved: Cloudvision changed during collection', str(self.__host))
+            return
+        self.__write({'timestamp': self.__started, 'params': params, 'facts': facts})
+
+    def invalidate(self):
+        """
+        invalidate Discard facts saved for Cloudvision host
+        """
+        self.__write({'invalidated': time.time()})
+        LOGGER.info('Facts saved for %s invalidated', str(self.__host))
+
+
+class CvFactsSelector(object):
+    """
+    CvFactsSelector Select facts entries and fields to collect
+
+    Entries are selected by name using glob or regex patterns defined per
+    type of facts, and optionally by container subtree. Fields returned for
+    each entry can be restricted per type of facts, and details not returned
+    do not have to be collected from Cloudvision.
+
+    Example
+    -------
+    >>> selector = CvFactsSelector(filters={'devices': ['DC1-*']}, fields={'devices': ['fqdn', 'systemMacAddress']})
+    >>> selector.is_selected(facts_type='devices', name='DC1-LEAF1A')
+    True
+    >>> selector.is_wanted(facts_type='devices', field='config')
+    False
+    >>> selector.project(facts_type='devices', data={'fqdn': 'DC1-LEAF1A', 'systemMacAddress': '50:8d:00:e3:78:aa', 'config': '...'})
+    {'fqdn': 'DC1-LEAF1A', 'systemMacAddress': '50:8d:00:e3:78:aa'}
+    """
+
+    # Types of facts supporting filters (by name) and fields
+    FILTERS_TYPES = [FACTS_DEVICES, FACTS_CONTAINERS, FACTS_CONFIGLETS]
+    FIELDS_TYPES = [FACTS_DEVICES, FACTS_CONTAINERS, FACTS_CONFIGLETS, FACTS_TASKS]
+    FILTER_MODES = ['glob', 'regex']
+
+    def __init__(self, filters: dict = None, filter_mode: str = 'glob', fields: dict = None):
+        self.__filters = dict()
+        self.__fields = dict()
+        self.__subtree = None
+        if filter_mode not in self.FILTER_MODES:
+            raise ValueError('Unsupported filter mode: {}'.format(filter_mode))
+        for facts_type, patterns in self.__check(options=filters, facts_types=self.FILTERS_TYPES).items():
+            try:
+                if filter_mode == 'glob':
+                    self.__filters[facts_type] = [re.compile(fnmatch.translate(pattern)).match for pattern in patterns]
+                else:
+                    self.__filters[facts_type] = [re.compile(pattern).search for pattern in patterns]
+            except re.error as error:
+                raise ValueError('Invalid filter for {}: {}'.format(facts_type, str(error)))
+        for facts_type, fields_list in self.__check(options=fields, facts_types=self.FIELDS_TYPES).items():
+            self.__fields[facts_type] = list(fields_list)
+
+    def __check(self, options: dict, facts_types: list):
+        """
+        __check Check options are lists indexed by supported type of facts
+
+        Parameters
+        ----------
+        options : dict
+            Filters or fields indexed by type of facts
+        facts_types : list
+            Supported types of facts
+
+        Returns
+        -------
+        dict
+            Options, empty dict if None
+        """
+        if options is None:
+            return dict()
+        for facts_type, values in options.items():
+            if facts_type not in facts_types:
+                raise ValueError('Unsupported type of facts: {}, expecting one of {}'.format(facts_type, facts_types))
+            if not isinstance(values, list):
+                raise ValueError('Expecting a list for {}, got {}'.format(facts_type, str(values)))
+        return options
+
+    def set_subtree(self, containers: list, container_name: str):
+        """
+        set_subtree Restrict selection to a container and all its children
+
+        Parameters
+        ----------
+        containers : list
+            Containers list extracted from CVP, with name, key and parentName fields
+        container_name : str
+            Name of the container at the top of the subtree
+
+        Returns
+        -------
+        bool
+            True if container exists, False otherwise
+        """
+        names = {container['key']: container['name'] for container in containers}
+        children = dict()
+        keys = dict()
+        for container in containers:
+            parent_name = container.get('parentName')
+            if parent_name is None:
+                parent_name = names.get(container.get('parentId', container.get('parentContainerId')))
+            children.setdefault(parent_name, list()).append(container['name'])
+            keys[container['name']] = container['key']
+        if container_name not in keys:
+            return False
+        subtree = [container_name]
+        seen = {container_name}
+        for name in subtree:
+            for child in children.get(name, []):
+                if child not in seen:
+                    seen.add(child)
+                    subtree.append(child)
+        self.__subtree = {keys[name] for name in subtree}
+        LOGGER.debug('Facts restricted to %s containers under %s', str(len(self.__subtree)), str(container_name))
+        return True
+
+    @property
+    def subtree(self):
+        """
+        subtree Getter for keys of containers in selected subtree
+
+        Returns
+        -------
+        set
+            Keys of containers in subtree, None if no subtree is selected
+        """
+        return self.__subtree
+
+    def in_subtree(self, container_key: str):
+        """
+        in_subtree Check a container is part of selected subtree
+
+        Parameters
+        ----------
+        container_key : str
+            Key of the container
+
+        Returns
+        -------
+        bool
+            True if container is in subtree or no subtree is selected
+        """
+        return self.__subtree is None or container_key in self.__subtree
+
+    def is_selected(self, facts_type: str, name: str):
+        """
+        is_selected Check an entry matches filters defined for its type of facts
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers, configlets, tasks)
+        name : str
+            Name of the entry
+
+        Returns
+        -------
+        bool
+            True if name matches one of the patterns or no filter is defined
+        """
+        if facts_type not in self.__filters:
+            return True
+        return name is not None and any(match(name) for match in self.__filters[facts_type])
+
+    def is_wanted(self, facts_type: str, field: str):
+        """
+        is_wanted Check a field has to be returned for a type of facts
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers, configlets, tasks)
+        field : str
+            Name of the field
+
+        Returns
+        -------
+        bool
+            True if field is listed or no fields are defined for this type of facts
+        """
+        return facts_type not in self.__fields or field in self.__fields[facts_type]
+
+    def project(self, facts_type: str, data: dict):
+        """
+        project Keep only fields to return for a type of facts
+
+        Parameters
+        ----------
+        facts_type : str
+            Type of facts (devices, containers, configlets, tasks)
+        data : dict
+            Entry to project
+
+        Returns
+        -------
+        dict
+            Entry with only fields to return
+        """
+        if facts_type not in self.__fields:
+            return data
+        return {field: data[field] for field in self.__fields[facts_type] if field in data}
@@ -75,3 +75,54 @@ def find_containerName_by_containerId(containers_list, container_id):
             if container['Key'] == container_id:
                 return container['Name']
     return None
+
+
+def index_hostname_by_mac(inventory):
+    """
+    Function to index devices hostname by System Mac Address.
+
+    Index gives same result as find_hostname_by_mac for every Mac address
+    and is built in a single pass over inventory.
+
+    Parameters
+    ----------
+    inventory : list
+        Inventory list extracted from CVP.
+
+    Returns
+    -------
+    dict
+        Device hostname indexed by System Mac Address.
+    """
+    index = dict()
+    for device in inventory:
+        if 'systemMacAddress' in device:
+            if 'name' in device:
+                index.setdefault(device['systemMacAddress'], device['name'])
+            elif 'hostname' in device:
+                index.setdefault(device['systemMacAddress'], device['hostname'])
+    return index
+
+
+def index_containerName_by_containerId(containers_list):
+    """
+    Function to index containers name by container ID.
+
+    Index gives same result as find_containerName_by_containerId for every
+    container ID and is built in a single pass over containers list.
+
+    Parameters
+    ----------
+    containers_list : list
+        Containers list extracted from CVP.
+
+    Returns
+    -------
+    dict
+        Container name indexed by container ID.
+    """
+    index = dict()
+    for container in containers_list:
+        if 'Key' in container:
+            index.setdefault(container['Key'], container['Name'])
+    return index
@@ -118,6 +118,108 @@ def tree_to_list(json_data, myList):
     return myList
 
 
+def tree_build_from_edges(edges, root='Tenant'):
+    """
+    Build a tree based on a list of (name, parent) tuples.
+
+    Children are indexed by parent in a single pass and tree is then walked
+    once from root, so build time is linear with the number of containers.
+    Output is the same JSON structure as treelib Tree.to_json(): a node with
+    children is a dict, a leaf is a string and children are sorted by name.
+
+    Containers whose parent is not part of the tree (orphans) or which are
+    part of a parent loop (cycles) can't be attached to root: they are logged
+    and excluded from the tree. When a name is defined more than once, only
+    its first definition is used.
+
+    Example:
+    --------
+        >>> edges = [('Fabric', 'Tenant'), ('Spines', 'Fabric'), ('Leaves', 'Fabric'),
+                     ('MLAG01', 'Leaves'), ('MLAG02', 'Leaves')]
+        >>> print(tree_build_from_edges(edges=edges))
+            {"Tenant": {"children": [{"Fabric": {"children": [{"Leaves": {"children": ["MLAG01", "MLAG02"]}}, "Spines"]}}]}}
+
+    Parameters
+    ----------
+    edges : list
+        List of (container name, parent container name) tuples
+    root: string, optional
+        Name of container to consider as root for topology, by default Tenant
+
+    Returns
+    -------
+    json
+        tree topology
+    """
+    parents = dict()
+    children = dict()
+    for name, parent in edges:
+        if name == root or name in parents:
+            LOGGER.warning('container %s is defined more than once, using first definition', str(name))
+            continue
+        parents[name] = parent
+        children.setdefault(parent, list()).append(name)
+
+    # Walk tree from root to list attached containers
+    attached = {root}
+    queue = [root]
+    for node in queue:
+        for child in children.get(node, []):
+            attached.add(child)
+            queue.append(child)
+
+    detached = [name for name in parents if name not in attached]
+    if len(detached) > 0:
+        orphans, cycles = tree_check_detached(parents=parents, detached=detached)
+        if len(orphans) > 0:
+            LOGGER.warning('containers without parent in topology are ignored: %s', str(orphans))
+        if len(cycles) > 0:
+            LOGGER.warning('containers in a parent loop are ignored: %s', str(cycles))
+
+    # Build JSON structure from leaves to root (reverse order of the walk)
+    nodes = dict()
+    for node in reversed(queue):
+        node_children = sorted(children.get(node, []))
+        if len(node_children) == 0:
+            nodes[node] = node
+        else:
+            nodes[node] = {node: {'children': [nodes.pop(child) for child in node_children]}}
+    return json.dumps(nodes[root])
+
+
+def tree_check_detached(parents, detached):
+    """
+    Sort containers not attached to root between orphans and cycles.
+
+    A container is part of a cycle when walking up its parents leads back to
+    itself, otherwise it is an orphan: one of its ancestors has a parent which
+    is not defined.
+
+    Parameters
+    ----------
+    parents : dict
+        Parent name indexed by container name
+    detached : list
+        Name of containers not attached to root
+
+    Returns
+    -------
+    tuple
+        List of orphan containers and list of containers in a cycle
+    """
+    cycles = set()
+    for name in detached:
+        seen = set()
+        node = name
+        while node in parents and node not in seen:
+            seen.add(node)
+            node = parents[node]
+        if node == name:
+            cycles.add(name)
+    orphans = [name for name in detached if name not in cycles]
+    return orphans, [name for name in detached if name in cycles]
+
+
 def tree_build_from_dict(containers=None, root='Tenant'):
     """
     Build a tree based on a unsorted dictConfig(config).
@@ -157,35 +259,11 @@ def tree_build_from_dict(containers=None, root='Tenant'):
     json
         tree topology
     """
-    # Create tree object
-    tree = Tree()  # Create the base node
-    previously_created = list()
-    # Create root node to mimic CVP behavior
     LOGGER.debug('containers list is %s', str(containers))
     LOGGER.debug('root container is set to: %s', str(root))
-    tree.create_node(root, root)
-    # Iterate for first level of containers directly attached under root.
-    for container_name, container_info in containers.items():
-        if container_info['parent_container'] in [root]:
-            previously_created.append(container_name)
-            tree.create_node(container_name, container_name,
-                             parent=container_info['parent_container'])
-            LOGGER.debug(
-                'create root tree entry with: %s', str(container_name))
-    # Loop since expected tree is not equal to number of entries in container topology
-    while (len(tree.all_nodes()) < len(containers) + 1):
-        LOGGER.debug(
-            ' Tree has size: %s - Containers has size: %s', str(len(tree.all_nodes())), str(len(containers)))
-        for container_name, container_info in containers.items():
-            if tree.contains(container_info['parent_container']) and container_info['parent_container'] not in [root]:
-                try:
-                    LOGGER.debug(
-                        'create new node with: %s', str(container_name))
-                    tree.create_node(container_name, container_name,
-                                     parent=container_info['parent_container'])
-                except:  # noqa E722
-                    continue
-    return tree.to_json()
+    edges = [(container_name, container_info['parent_container'])
+             for container_name, container_info in containers.items()]
+    return tree_build_from_edges(edges=edges, root=root)
 
 
 def tree_build_from_list(containers, root='Tenant'):
@@ -233,33 +311,11 @@ def tree_build_from_list(containers, root='Tenant'):
     json
         tree topology
     """
-    # Create tree object
-    tree = Tree()  # Create the base node
-    previously_created = list()
-    # Create root node to mimic CVP behavior
     LOGGER.debug('containers list is %s', str(containers))
-    tree.create_node(root, root)
-    # Iterate for first level of containers directly attached under root.
-    for cvp_container in containers:
-        if cvp_container['parentName'] is None:
-            continue
-        if cvp_container['parentName'] in [root]:
-            LOGGER.debug(
-                'found container attached to %s: %s', str(root), str(cvp_container))
-            previously_created.append(cvp_container['name'])
-            tree.create_node(
-                cvp_container['name'], cvp_container['name'], parent=cvp_container['parentName'])
-    # Loop since expected tree is not equal to number of entries in container topology
-    while len(tree.all_nodes()) < len(containers):
-        for cvp_container in containers:
-            # and cvp_container['parentName'] not in ['Tenant']
-            if tree.contains(cvp_container['parentName']):
-                try:
-                    tree.create_node(
-                        cvp_container['name'], cvp_container['name'], parent=cvp_container['parentName'])
-                except:  # noqa E722
-                    continue
-    return tree.to_json()
+    edges = [(cvp_container['name'], cvp_container['parentName'])
+             for cvp_container in containers
+             if cvp_container['parentName'] is not None]
+    return tree_build_from_edges(edges=edges, root=root)
 
 
 def tree_build(containers=None, root='Tenant'):
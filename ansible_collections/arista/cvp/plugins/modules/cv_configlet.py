@@ -49,8 +49,10 @@ options:
     default: 'Managed by Ansible'
     type: str
   cvp_facts:
-    description: Facts extracted from CVP servers using cv_facts module
-    required: true
+    description:
+      - Facts extracted from CVP servers using cv_facts module
+      - If not set, facts shared by last cv_facts execution are used when ANSIBLE_CVP_FACTS_CACHE is enabled.
+    required: false
     type: dict
   configlet_filter:
     description: Filter to apply intended mode on a set of configlet.
@@ -663,7 +665,7 @@ def main():
     argument_spec = dict(
         configlets=dict(type='dict', required=True),
         configlets_notes=dict(type='str', default='Managed by Ansible', required=False),
-        cvp_facts=dict(type='dict', required=True),
+        cvp_facts=dict(type='dict', required=False),
         configlet_filter=dict(type='list', default='none', elements='str'),
         filter_mode=dict(type='str',
                          choices=['loose', 'strict'],
@@ -701,15 +703,24 @@ def main():
         module.fail_json(
             msg='Configlet input data are not compliant with module.')
 
+    # Load facts shared by cv_facts when not set by playbook
+    if module.params['cvp_facts'] is None:
+        module.params['cvp_facts'] = tools_cv.cv_facts_load(module)
+
     result = dict(changed=False, data={})
     # messages = dict(issues=False)
     # Connect to CVP instance
     if not module.check_mode:
         module.client = tools_cv.cv_connect(module)
+        tools_cv.cv_facts_invalidate_on_failure(module)
 
     # Pass module params to configlet_action to act on configlet
     result = action_manager(module)
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not module.check_mode:
+        tools_cv.cv_facts_invalidate(module)
+
     module.exit_json(**result)
 
 
@@ -49,6 +49,19 @@ options:
     required: false
     default: 'Managed by Ansible'
     type: str
+  max_diff_lines:
+    description:
+        - Maximum number of lines of unified diff reported for every configlet.
+        - Diff is truncated and a summary of added and removed lines is appended.
+        - If set to 0, only summary is reported. By default, complete diff is reported.
+        - Negative values are rejected.
+    required: false
+    type: int
+  max_workers:
+    description: Maximum number of configlets created, updated or deleted in parallel on CVP server.
+    required: false
+    default: 4
+    type: int
   state:
     description:
         - If absent, configlets will be removed from CVP if they are not bound
@@ -140,7 +153,12 @@ def main():
                    choices=['present', 'absent']),
         configlets_notes=dict(type='str',
                               default='Managed by Ansible',
-                              required=False)
+                              required=False),
+        max_workers=dict(type='int',
+                         default=4,
+                         required=False),
+        max_diff_lines=dict(type='int',
+                            required=False)
     )
 
     # Make module global to use it in all functions when required
@@ -167,12 +185,20 @@ def main():
         ansible_module.fail_json(
             msg='Error, your input is not valid against current schema:\n {}'.format(*ansible_module.params['configlets']))
 
+    if ansible_module.params['max_diff_lines'] is not None and ansible_module.params['max_diff_lines'] < 0:
+        ansible_module.fail_json(
+            msg='Error, max_diff_lines must be positive or 0, got {}'.format(ansible_module.params['max_diff_lines']))
+
     # Create CVPRAC client
     cv_client = tools_cv.cv_connect(ansible_module)
+    tools_cv.cv_facts_invalidate_on_failure(ansible_module)
 
     # Instantiate data
     cv_configlet_manager = CvConfigletTools(
-        cv_connection=cv_client, ansible_module=ansible_module)
+        cv_connection=cv_client,
+        ansible_module=ansible_module,
+        max_workers=ansible_module.params['max_workers'],
+        max_diff_lines=ansible_module.params['max_diff_lines'])
 
     # if ansible_module.check_mode is True:
     #     ansible_module.fail_json(msg="Not yet implemented !")
@@ -181,6 +207,10 @@ def main():
         configlet_list=user_configlets.configlets, present=is_present, note=ansible_module.params['configlets_notes'])
     result = cv_response.content
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not ansible_module.check_mode:
+        tools_cv.cv_facts_invalidate(ansible_module)
+
     ansible_module.exit_json(**result)
 
 
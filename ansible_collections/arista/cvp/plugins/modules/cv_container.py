@@ -40,8 +40,10 @@ options:
     required: true
     type: dict
   cvp_facts:
-    description: Facts from CVP collected by cv_facts module
-    required: true
+    description:
+      - Facts from CVP collected by cv_facts module
+      - If not set, facts shared by last cv_facts execution are used when ANSIBLE_CVP_FACTS_CACHE is enabled.
+    required: false
     type: dict
   mode:
     description: Allow to save topology or not
@@ -813,7 +815,7 @@ def main():
     """
     argument_spec = dict(
         topology=dict(type='dict', required=True),
-        cvp_facts=dict(type='dict', required=True),
+        cvp_facts=dict(type='dict', required=False),
         configlet_filter=dict(type='list', default='none', elements='str'),
         mode=dict(type='str',
                   required=False,
@@ -846,6 +848,10 @@ def main():
         module.fail_json(
             msg='Container input data are not compliant with module.')
 
+    # Load facts shared by cv_facts when not set by playbook
+    if module.params['cvp_facts'] is None:
+        module.params['cvp_facts'] = tools_cv.cv_facts_load(module)
+
     result = dict(changed=False, data={})
     result['data']['taskIds'] = list()
     result['data']['tasks'] = list()
@@ -854,6 +860,7 @@ def main():
 
     if not module.check_mode:
         module.client = tools_cv.cv_connect(module)
+        tools_cv.cv_facts_invalidate_on_failure(module)
 
     # Create list of builtin containers
     create_builtin_containers(facts=module.params['cvp_facts'])
@@ -921,6 +928,10 @@ def main():
     if len(result['data']['taskIds']) > 0:
         result['data']['tasks'] = get_tasks(module=module, taskIds=result['data']['taskIds'])
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['data'].get('changed', False) and not module.check_mode:
+        tools_cv.cv_facts_invalidate(module)
+
     # DEPRECATION: Make a copy to support old namespace.
     result['cv_container'] = result['data']
 
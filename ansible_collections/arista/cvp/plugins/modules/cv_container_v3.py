@@ -56,6 +56,11 @@ options:
     default: 'loose'
     choices: ['loose', 'strict']
     type: str
+  max_workers:
+    description: Maximum number of containers of a same level updated in parallel on CVP server.
+    required: false
+    default: 4
+    type: int
 '''
 
 EXAMPLES = r'''
@@ -150,7 +155,8 @@ def main():
         apply_mode=dict(type='str',
                    required=False,
                    default='loose',
-                   choices=['loose', 'strict'])
+                   choices=['loose', 'strict']),
+        max_workers=dict(type='int', required=False, default=4)
     )
 
     # Make module global to use it in all functions when required
@@ -177,12 +183,17 @@ def main():
         ansible_module.fail_json(
             msg='Error, your input is not valid against current schema:\n {}'.format(*ansible_module.params['topology']))
 
+    if len(user_topology.cyclic_containers) > 0:
+        ansible_module.fail_json(
+            msg='Error, following containers are part of a loop in your topology: {}'.format(str(user_topology.cyclic_containers)))
+
     # Create CVPRAC client
     cv_client = tools_cv.cv_connect(ansible_module)
+    tools_cv.cv_facts_invalidate_on_failure(ansible_module)
 
     # Instantiate data
     cv_topology = CvContainerTools(
-        cv_connection=cv_client, ansible_module=ansible_module)
+        cv_connection=cv_client, ansible_module=ansible_module, max_workers=ansible_module.params['max_workers'])
 
     cv_response: CvAnsibleResponse = cv_topology.build_topology(
         user_topology=user_topology, present=state_present, apply_mode=ansible_module.params['apply_mode'])
@@ -190,6 +201,10 @@ def main():
         'Received response from Topology builder: %s', str(cv_response))
     result = cv_response.content
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not ansible_module.check_mode:
+        tools_cv.cv_facts_invalidate(ansible_module)
+
     ansible_module.exit_json(**result)
 
 
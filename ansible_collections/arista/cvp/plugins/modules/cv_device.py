@@ -42,8 +42,10 @@ options:
     required: true
     type: dict
   cvp_facts:
-    description: Facts from CVP collected by cv_facts module
-    required: true
+    description:
+      - Facts from CVP collected by cv_facts module
+      - If not set, facts shared by last cv_facts execution are used when ANSIBLE_CVP_FACTS_CACHE is enabled.
+    required: false
     type: dict
   device_filter:
     description: Filter to apply intended mode on a set of configlet.
@@ -126,6 +128,7 @@ import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pyl
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
 import ansible_collections.arista.cvp.plugins.module_utils.tools as tools
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsIndex
 import ansible_collections.arista.cvp.plugins.module_utils.schema_v1 as schema
 
 
@@ -138,6 +141,25 @@ MODULE_LOGGER.info('Start cv_device module execution')
 # ------------------------------------------------------------- #
 
 
+def facts_index(module):
+    """
+    Get index of CVP facts built once per module execution.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module.
+
+    Returns
+    -------
+    CvFactsIndex
+        Index of devices, containers and configlets from cv_facts.
+    """
+    if getattr(module, "facts_index", None) is None:
+        module.facts_index = CvFactsIndex(facts=module.params.get("cvp_facts"))
+    return module.facts_index
+
+
 def device_get_from_facts(module, device_name):
     """
     Get device information from CVP facts.
@@ -154,10 +176,7 @@ def device_get_from_facts(module, device_name):
     dict
         Device facts if found, else None.
     """
-    for device in module.params["cvp_facts"]["devices"]:
-        if device["hostname"] == device_name:
-            return device
-    return None
+    return facts_index(module).get_device(search_value=device_name)
 
 
 def facts_devices(module):
@@ -215,15 +234,13 @@ def container_get_facts(container_name, module):
     dict
         [description]
     """
-    if "cvp_facts" in module.params:
-        if "containers" in module.params["cvp_facts"]:
-            for container in module.params["cvp_facts"]["containers"]:
-                if container_name == container["Name"]:
-                    return container
+    container = facts_index(module).get_container(search_value=container_name)
+    if container is not None:
+        return container
     return []
 
 
-def configlet_get_fact_key(configlet_name, cvp_facts):
+def configlet_get_fact_key(configlet_name, index):
     """
     Get Configlet ID provided by CVP in facts.
 
@@ -231,17 +248,17 @@ def configlet_get_fact_key(configlet_name, cvp_facts):
     ----------
     configlet_name : string
         Name of configlet to look for the key field
-    cvp_facts : dict
-        Dictionary from cv_facts
+    index : CvFactsIndex
+        Index of facts from cv_facts
 
     Returns
     -------
     string
         Key value of the configlet.
     """
-    for configlet in cvp_facts["configlets"]:
-        if configlet_name == configlet["name"]:
-            return configlet["key"]
+    configlet = index.get_configlet(search_value=configlet_name)
+    if configlet is not None:
+        return configlet["key"]
     return None
 
 
@@ -289,8 +306,9 @@ def get_unique_from_list(source_list, compare_list):
         List of unique entries
     """
     unique_entries = list()
+    compare_set = set(compare_list)
     for entry in source_list:
-        if entry not in compare_list:
+        if entry not in compare_set:
             unique_entries.append(entry)
     return unique_entries
 
@@ -479,7 +497,7 @@ def build_new_devices_list(module):
     return devices_info
 
 
-def configlet_prepare_cvp_update(configlet_name_list, facts):
+def configlet_prepare_cvp_update(configlet_name_list, index):
     """
     Build configlets structure to configure CV.
 
@@ -488,7 +506,7 @@ def configlet_prepare_cvp_update(configlet_name_list, facts):
 
     Example:
     ----------
-    >>> configlet_prepare_cvp_update(configlet_name_list, facts)
+    >>> configlet_prepare_cvp_update(configlet_name_list, index)
     [
         {
             'name': MyConfiglet,
@@ -500,8 +518,8 @@ def configlet_prepare_cvp_update(configlet_name_list, facts):
     ----------
     configlet_name_list : list
         List of configlets name to build
-    facts : dict
-        Dict from cv_facts
+    index : CvFactsIndex
+        Index of facts from cv_facts
 
     Returns
     -------
@@ -512,7 +530,7 @@ def configlet_prepare_cvp_update(configlet_name_list, facts):
     for configlet_name in configlet_name_list:
         configlet_data = dict()
         configlet_key = configlet_get_fact_key(
-            configlet_name=configlet_name, cvp_facts=facts
+            configlet_name=configlet_name, index=index
         )
         configlet_data["name"] = configlet_name
         configlet_data["key"] = configlet_key
@@ -520,10 +538,10 @@ def configlet_prepare_cvp_update(configlet_name_list, facts):
     return configlets_structure
 
 
-def configlet_check_unknown_from_cvp(configlet_name_list, facts):
+def configlet_check_unknown_from_cvp(configlet_name_list, index):
     unknown_configlets = list()
     for configlet_name in configlet_name_list:
-        if configlet_get_fact_key(configlet_name=configlet_name, cvp_facts=facts) is None:
+        if configlet_get_fact_key(configlet_name=configlet_name, index=index) is None:
             unknown_configlets.append(configlet_name)
     return unknown_configlets
 
@@ -599,7 +617,7 @@ def devices_new(module):
         # Transform output to be CV compliant:
         # [{name: configlet_name, key: configlet_key_from_cv_facts}]
         configlets_add = configlet_prepare_cvp_update(
-            configlet_name_list=configlets_add, facts=module.params["cvp_facts"]
+            configlet_name_list=configlets_add, index=facts_index(module)
         )
 
         # Collect container information
@@ -813,7 +831,7 @@ def devices_update(module, mode="override"):
         # First check all configlets are already on CV side.
         unknown_configlet = configlet_check_unknown_from_cvp(
             configlet_name_list=device_update["configlets"],
-            facts=module.params["cvp_facts"]
+            index=facts_index(module)
         )
         if len(unknown_configlet) > 0:
             MODULE_LOGGER.error(
@@ -853,7 +871,7 @@ def devices_update(module, mode="override"):
                 # Transform output to be CV compliant:
                 # [{name: configlet_name, key: configlet_key_from_cv_facts}]
                 configlets_delete = configlet_prepare_cvp_update(
-                    configlet_name_list=configlets_delete, facts=module.params["cvp_facts"]
+                    configlet_name_list=configlets_delete, index=facts_index(module)
                 )
 
                 # In any case build list of configlet to attach to device
@@ -865,7 +883,7 @@ def devices_update(module, mode="override"):
                 # Transform output to be CV compliant:
                 # [{name: configlet_name, key: configlet_key_from_cv_facts}]
                 configlets_add = configlet_prepare_cvp_update(
-                    configlet_name_list=configlets_add, facts=module.params["cvp_facts"]
+                    configlet_name_list=configlets_add, index=facts_index(module)
                 )
         # Start configlet update in merge mode: add configlets to device and do not update already attached devices.
         if mode == 'merge':
@@ -873,7 +891,7 @@ def devices_update(module, mode="override"):
             configlets_add = device_update["configlets"] + device_update["cv_configlets"]
             # Transform output to be CV compliant:
             # [{name: configlet_name, key: configlet_key_from_cv_facts}]
-            configlets_add = configlet_prepare_cvp_update(configlet_name_list=configlets_add, facts=module.params["cvp_facts"])
+            configlets_add = configlet_prepare_cvp_update(configlet_name_list=configlets_add, index=facts_index(module))
 
         # Start configlet update in delete mode: remove listed configlets to device and do not update already attached devices.
         if mode == 'delete':
@@ -881,12 +899,12 @@ def devices_update(module, mode="override"):
             configlets_add = [x for x in device_update["cv_configlets"] if x not in device_update["configlets"]]
             # Transform output to be CV compliant:
             # [{name: configlet_name, key: configlet_key_from_cv_facts}]
-            configlets_add = configlet_prepare_cvp_update(configlet_name_list=configlets_add, facts=module.params["cvp_facts"])
+            configlets_add = configlet_prepare_cvp_update(configlet_name_list=configlets_add, index=facts_index(module))
             configlets_delete = device_update["configlets"]
             # Transform output to be CV compliant:
             # [{name: configlet_name, key: configlet_key_from_cv_facts}]
             configlets_delete = configlet_prepare_cvp_update(
-                configlet_name_list=configlets_delete, facts=module.params["cvp_facts"]
+                configlet_name_list=configlets_delete, index=facts_index(module)
             )
 
         if len(device_facts) == 0:
@@ -1150,7 +1168,7 @@ def main():
     """
     argument_spec = dict(
         devices=dict(type="dict", required=True),
-        cvp_facts=dict(type="dict", required=True),
+        cvp_facts=dict(type="dict", required=False),
         device_filter=dict(type="list", default="all", elements='str'),
         state=dict(
             type="str", choices=["present", "absent"], default="present", required=False
@@ -1174,11 +1192,21 @@ def main():
         module.fail_json(
             msg='Device input data are not compliant with module.')
 
+    # Load facts shared by cv_facts when not set by playbook
+    if module.params['cvp_facts'] is None:
+        module.params['cvp_facts'] = tools_cv.cv_facts_load(module)
+
     # Connect to CVP instance
     if not module.check_mode:
         module.client = tools_cv.cv_connect(module)
+        tools_cv.cv_facts_invalidate_on_failure(module)
 
     result = devices_action(module=module)
+
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not module.check_mode:
+        tools_cv.cv_facts_invalidate(module)
+
     module.exit_json(**result)
 
 
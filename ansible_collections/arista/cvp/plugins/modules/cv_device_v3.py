@@ -52,6 +52,16 @@ options:
     default: 'loose'
     choices: ['loose', 'strict']
     type: str
+  batch_mode:
+    description: Stage moves and configlets updates for all devices and save topology once per step instead of once per device.
+    required: false
+    default: false
+    type: bool
+  max_workers:
+    description: Maximum number of devices deployed in parallel on CVP server.
+    required: false
+    default: 4
+    type: int
 '''
 
 EXAMPLES = r'''
@@ -95,6 +105,27 @@ EXAMPLES = r'''
         devices: '{{CVP_DEVICES}}'
         state: present
         apply_mode: strict
+
+# task in batch mode
+---
+- name: Device Management in Cloudvision
+  hosts: cv_server
+  connection: local
+  gather_facts: false
+  collections:
+    - arista.cvp
+  vars:
+    CVP_DEVICES:
+      - fqdn: CV-ANSIBLE-EOS01
+        parentContainerName: ANSIBLE
+        configlets:
+            - 'CV-EOS-ANSIBLE01'
+  tasks:
+    - name: "Configure devices on {{inventory_hostname}}"
+      arista.cvp.cv_device_v3:
+        devices: '{{CVP_DEVICES}}'
+        state: present
+        batch_mode: true
 '''
 
 import logging
@@ -144,7 +175,9 @@ def main():
         apply_mode=dict(type='str',
                         required=False,
                         default='loose',
-                        choices=['loose', 'strict'])
+                        choices=['loose', 'strict']),
+        batch_mode=dict(type='bool', required=False, default=False),
+        max_workers=dict(type='int', required=False, default=4)
     )
 
     # Make module global to use it in all functions when required
@@ -170,13 +203,19 @@ def main():
 
     # Create CVPRAC client
     cv_client = tools_cv.cv_connect(ansible_module)
+    tools_cv.cv_facts_invalidate_on_failure(ansible_module)
 
     # Instantiate data
     cv_topology = CvDeviceTools(
-        cv_connection=cv_client, ansible_module=ansible_module, check_mode=ansible_module.check_mode)
+        cv_connection=cv_client, ansible_module=ansible_module, check_mode=ansible_module.check_mode,
+        batch_mode=ansible_module.params['batch_mode'], max_workers=ansible_module.params['max_workers'])
 
     result = cv_topology.manager(user_inventory=user_topology, apply_mode=ansible_module.params['apply_mode'])
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not ansible_module.check_mode:
+        tools_cv.cv_facts_invalidate(ansible_module)
+
     ansible_module.exit_json(**result)
 
 
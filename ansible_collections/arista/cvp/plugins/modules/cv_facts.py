@@ -64,6 +64,62 @@ options:
       - containers
       - configlets
       - tasks
+  max_workers:
+    description:
+      - Maximum number of per-device (configuration and image) and per-container (image) API calls
+      - sent in parallel to CVP.
+    required: false
+    default: 4
+    type: int
+  cache_file:
+    description:
+      - Path of a file where devices and containers image details are saved between executions.
+      - Only image details are cached. When set, image details are collected again for objects changed on CVP and for all objects
+        when image bundles or their assignments to devices and containers changed. Device configuration is always collected.
+      - File is reset when CVP instance or version changes. Use one file per CVP instance.
+    required: false
+    type: path
+  output_file:
+    description:
+      - Path of a file where facts are written as newline-delimited JSON while they are collected.
+      - When set, module only returns cvp_info, path of the file (facts_file) and number of entries per type of facts (facts_summary).
+      - Every line is a JSON document with type of facts and entry, for instance {"facts": "devices", "data": {...}}
+    required: false
+    type: path
+  output_compress:
+    description:
+      - Compress output_file with gzip.
+    required: false
+    default: false
+    type: bool
+  filters:
+    description:
+      - Only collect facts of entries whose name matches one of the patterns.
+      - Keys are types of facts (devices, containers, configlets) and values are lists of patterns
+      - matched against device hostname, container name or configlet name.
+    required: false
+    type: dict
+  filter_mode:
+    description:
+      - Define how filters patterns are matched, using shell-style wildcards (glob) or Python regular expressions search (regex).
+    required: false
+    default: glob
+    type: str
+    choices:
+      - glob
+      - regex
+  container_subtree:
+    description:
+      - Only collect facts of this container and all its children, devices attached to them and configlets applied to them.
+    required: false
+    type: str
+  fields:
+    description:
+      - Fields to return per type of facts. Keys are types of facts (devices, containers, configlets, tasks)
+      - and values are lists of fields name. Details not listed are not collected, for instance device config
+      - and imageBundle are not collected from CVP if they are not listed in devices fields.
+    required: false
+    type: dict
 '''
 
 EXAMPLES = r'''
@@ -98,24 +154,304 @@ EXAMPLES = r'''
     - name: '#10 - Collect ALL facts from {{inventory_hostname}}'
       cv_facts:
       register: FACTS
+
+    - name: '#11 - Collect ALL facts from {{inventory_hostname}} using incremental cache'
+      cv_facts:
+        cache_file: '{{ playbook_dir }}/.cv_facts_{{ inventory_hostname }}.json'
+      register: FACTS
+
+    - name: '#12 - Write devices facts (with config) from {{inventory_hostname}} to a file'
+      cv_facts:
+        gather_subset:
+          config
+        facts:
+          devices
+        output_file: '{{ playbook_dir }}/cv_facts_{{ inventory_hostname }}.ndjson.gz'
+        output_compress: true
+      register: FACTS_FILE
+
+    - name: '#13 - Collect name, mac address and container of DC1 devices from {{inventory_hostname}}'
+      cv_facts:
+        facts:
+          devices
+        filters:
+          devices: ['DC1-*']
+        fields:
+          devices: ['fqdn', 'systemMacAddress', 'parentContainerName']
+      register: FACTS_DC1
+
+    - name: '#14 - Collect configlets name and key without config from {{inventory_hostname}}'
+      cv_facts:
+        facts:
+          configlets
+        fields:
+          configlets: ['name', 'key']
+      register: FACTS_CONFIGLETS_LIGHT
 '''
 
 import logging
 import traceback  # noqa # pylint: disable=unused-import
+from urllib.parse import quote_plus
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.tools_inventory as tools_inventory
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsCache, CvFactsWriter, CvFactsSelector, facts_marker, MARKER_IMAGES, MARKER_FIELDS
 
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_facts')
 MODULE_LOGGER.info('Start cv_facts module execution')
 
+# Number of devices for which details are collected before being added to facts
+DEVICES_CHUNK_SIZE = 100
+# Cloudvision API listing devices and containers an image bundle is applied to
+URI_IMAGE_APPLIED = {
+    'devices': '/image/getImageBundleAppliedDevices.do?imageName={}&startIndex=0&endIndex=0&queryparam=',
+    'containers': '/image/getImageBundleAppliedContainers.do?imageName={}&startIndex=0&endIndex=0&queryparam='
+}
+
+
+def cv_get_once(module, name, function):
+    """
+    Call a Cloudvision API once per module execution.
+
+    Bulk API responses (inventory, containers, configlets) are used by
+    several facts functions: they are saved on the module and reused.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+    name : str
+        Name to save response with
+    function : callable
+        cvprac method to call without argument
+
+    Returns
+    -------
+    any
+        Response of function
+    """
+    if getattr(module, 'cv_responses', None) is None:
+        module.cv_responses = dict()
+    if name not in module.cv_responses:
+        module.cv_responses[name] = function()
+    return module.cv_responses[name]
+
+
+def cv_configlets_and_mappers(module):
+    """
+    Get configlets and mappers once per module execution.
+
+    Configlets config is dropped as soon as it is received when configlets
+    facts are not requested or config is not part of configlets fields.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+
+    Returns
+    -------
+    dict
+        Data section of get_configlets_and_mappers() from cvprac
+    """
+    def get_configlets_and_mappers():
+        data = module.client.api.get_configlets_and_mappers()['data']
+        if (not ('all' in module.params['facts'] or 'configlets' in module.params['facts'])
+                or not facts_selector(module).is_wanted(facts_type='configlets', field='config')):
+            for configlet in data.get('configlets', []):
+                configlet.pop('config', None)
+        return data
+    return cv_get_once(module, 'configlets_and_mappers', get_configlets_and_mappers)
+
+
+def facts_selector(module):
+    """
+    Get selector of facts entries and fields configured for module execution.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+
+    Returns
+    -------
+    CvFactsSelector
+        Selector built from filters and fields options, selecting everything by default
+    """
+    if getattr(module, 'facts_selector', None) is None:
+        module.facts_selector = CvFactsSelector()
+    return module.facts_selector
+
+
+def facts_add(module, facts, facts_type, data):
+    """
+    Add an entry to facts or to facts output file when configured.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+    facts : dict
+        Fact dictionary where entry is inserted when no output file is configured
+    facts_type : str
+        Type of facts (devices, containers, configlets, tasks)
+    data : dict
+        Entry to add to facts
+    """
+    data = facts_selector(module).project(facts_type=facts_type, data=data)
+    writer = getattr(module, 'facts_writer', None)
+    if writer is not None:
+        writer.write(facts_type=facts_type, data=data)
+    else:
+        facts[facts_type].append(data)
+
+
+def facts_cache_init(module, cvp_info):
+    """
+    Load facts cache and set markers of current Cloudvision data.
+
+    Markers must be computed before facts functions update inventory and
+    containers data with collected details.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+    cvp_info : dict
+        Cloudvision version information
+
+    Returns
+    -------
+    CvFactsCache
+        Facts cache for current Cloudvision instance
+    """
+    cache = CvFactsCache(cache_file=module.params['cache_file'],
+                         host=module.client.url_prefix,
+                         version=cvp_info.get('version'))
+    try:
+        cache.set_marker(name=MARKER_IMAGES, data=image_bundles_applied(module=module))
+    except Exception as error:
+        # Without marker, image details are collected again and not reused next time
+        MODULE_LOGGER.warning('Cannot collect image bundles assignments, image details are not cached: %s', str(error))
+    return cache
+
+
+def image_bundles_applied(module):
+    """
+    Get image bundles with devices and containers each bundle is applied to.
+
+    Moving a bundle from one device or container to another does not change
+    the list of bundles, so assignments are part of the images marker.
+    Assignments are collected with 2 API calls per bundle, using a pool of
+    max_workers threads.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+
+    Returns
+    -------
+    list
+        Image bundles from Cloudvision with their assignments under 'applied'
+    """
+    bundles = module.client.api.get_image_bundles()['data']
+    applied = run_concurrently(function=lambda bundle: {applied_type: module.client.get(uri.format(quote_plus(bundle['name'])))
+                                                        for applied_type, uri in URI_IMAGE_APPLIED.items()},
+                               items=bundles,
+                               max_workers=module.params['max_workers'])
+    return [dict(bundle, applied=bundle_applied) for bundle, bundle_applied in zip(bundles, applied)]
+
+
+def device_specific_configlets(configlets_and_mappers):
+    """
+    Build list of configlets applied directly to each device.
+
+    A configlet is device specific when it is mapped to a device and not
+    to any container.
+
+    Parameters
+    ----------
+    configlets_and_mappers : dict
+        Data section of get_configlets_and_mappers() from cvprac
+
+    Returns
+    -------
+    dict
+        List of configlet names indexed by device key
+    """
+    configlet_names = dict()
+    for configlet in configlets_and_mappers.get('configlets', []):
+        configlet_names[configlet['key']] = configlet['name']
+    container_configlets = set()
+    for mapper in configlets_and_mappers.get('configletMappers', []):
+        if mapper['type'] == 'container':
+            container_configlets.add(mapper['configletId'])
+    devices_configlets = dict()
+    for mapper in configlets_and_mappers.get('configletMappers', []):
+        if (mapper['type'] == 'netelement'
+                and mapper['configletId'] in configlet_names
+                and mapper['configletId'] not in container_configlets):
+            devices_configlets.setdefault(mapper['objectId'], []).append(configlet_names[mapper['configletId']])
+    return devices_configlets
+
+
+def facts_device_details(module, device, cached=None):
+    """
+    Collect per-device facts which are not available in bulk APIs.
+
+    Function is thread safe and is executed in parallel for all devices.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+    device : dict
+        Device data from Cloudvision inventory
+    cached : dict, optional
+        Details still valid from facts cache, not collected again, by default None
+
+    Returns
+    -------
+    dict
+        Device designed configuration (config) and image bundle name (imageBundle)
+    """
+    selector = facts_selector(module)
+    details = dict(cached) if cached is not None else dict()
+    # Add designed config for device
+    if ('config' in module.params['gather_subset'] and selector.is_wanted(facts_type='devices', field='config')
+            and device['streamingStatus'] == "active"):
+        if 'config' not in details:
+            details['config'] = module.client.api.get_device_configuration(device['key'])
+    else:
+        details.pop('config', None)
+
+    if 'imageBundle' in details or not selector.is_wanted(facts_type='devices', field='imageBundle'):
+        return details
+    # Add ImageBundle Info
+    details['imageBundle'] = ""
+    deviceInfo = module.client.api.get_device_image_info(
+        device['key'])  # get_device_image_info() from cvprac
+    if deviceInfo is not None and "imageBundleMapper" in deviceInfo:
+        # There should only be one ImageBudle but its id is not decernable
+        # If the Image is applied directly to the device its type will be 'netelement'
+        if len(list(deviceInfo['imageBundleMapper'].values())) > 0:
+            if list(deviceInfo['imageBundleMapper'].values())[0]['type'] == 'netelement':
+                details['imageBundle'] = deviceInfo['bundleName']
+    return details
+
 
 def facts_devices(module, facts):
     """
     Collect facts of all devices.
 
+    Container names and device specific configlets are resolved from bulk
+    API calls. Only configuration and image information are collected per
+    device, using a pool of max_workers threads.
+
     Parameters
     ----------
     module : AnsibleModule
@@ -133,50 +469,111 @@ def facts_devices(module, facts):
 
     facts['devices'] = []
     # Get Inventory Data for All Devices
-    inventory = module.client.api.get_inventory()
+    inventory = cv_get_once(module, 'inventory', module.client.api.get_inventory)
+    selector = facts_selector(module)
+    devices = list()
     for device in inventory:
-        MODULE_LOGGER.info('  -> Working on %s', device['hostname'])
         if 'systemMacAddress' in device and len(device['systemMacAddress']) > 0:
+            if (selector.is_selected(facts_type='devices', name=device.get('hostname'))
+                    and selector.in_subtree(container_key=device.get('parentContainerKey'))):
+                devices.append(device)
+        else:
+            MODULE_LOGGER.error('    ! Device %s is on Cloudvision but System Mac Address is missing ... skipped', device['hostname'])
+
+    # Get configlets applied to devices in a single call
+    devices_configlets = device_specific_configlets(
+        configlets_and_mappers=cv_configlets_and_mappers(module))
+    containers_index = None
+
+    cache = getattr(module, 'facts_cache', None)
+
+    # Collect details per chunk of devices so that only one chunk of
+    # configurations is held in memory when facts are written to a file
+    for start in range(0, len(devices), DEVICES_CHUNK_SIZE):
+        chunk = devices[start:start + DEVICES_CHUNK_SIZE]
+        # Get details still valid from previous execution
+        markers = [facts_marker(device, fields=MARKER_FIELDS['devices']) if cache is not None else None for device in chunk]
+        cached = [cache.get(facts_type='devices', key=device['key'], marker=marker) if cache is not None else None
+                  for device, marker in zip(chunk, markers)]
+
+        details = run_concurrently(function=lambda item: facts_device_details(module=module, device=item[0], cached=item[1]),
+                                   items=zip(chunk, cached),
+                                   max_workers=module.params['max_workers'])
+
+        for device, device_details, marker in zip(chunk, details, markers):
+            MODULE_LOGGER.info('  -> Working on %s', device['hostname'])
+            if cache is not None:
+                cache.set(facts_type='devices', key=device['key'], marker=marker, details=device_details)
+            # Do not update inventory shared with other facts functions
+            device = dict(device)
             device['name'] = device['hostname']
-            # Add designed config for device
-            if 'config' in module.params['gather_subset'] and device['streamingStatus'] == "active":
-                device['config'] = module.client.api.get_device_configuration(device['key'])
+            device.update(device_details)
 
             # Add parent container name
-            container = module.client.api.get_container_by_id(device['parentContainerKey'])
-            device['parentContainerName'] = container['name']
+            if device.get('containerName'):
+                device['parentContainerName'] = device['containerName']
+            else:
+                if containers_index is None:
+                    containers_index = {container['key']: container['name']
+                                        for container in cv_get_once(module, 'containers',
+                                                                     lambda: module.client.api.get_containers()['data'])}
+                device['parentContainerName'] = containers_index.get(device['parentContainerKey'])
 
             # Add Device Specific Configlets
-            configlets = module.client.api.get_configlets_by_device_id(device['key'])
-            device['deviceSpecificConfiglets'] = []
-            for configlet in configlets:
-                if int(configlet['containerCount']) == 0:
-                    device['deviceSpecificConfiglets'].append(configlet['name'])
-
-            # Add ImageBundle Info
-            device['imageBundle'] = ""
-            deviceInfo = module.client.api.get_device_image_info(
-                device['key'])  # get_device_image_info() from cvprac
-            if "imageBundleMapper" in deviceInfo:
-                # There should only be one ImageBudle but its id is not decernable
-                # If the Image is applied directly to the device its type will be 'netelement'
-                if len(list(deviceInfo['imageBundleMapper'].values())) > 0:
-                    if list(deviceInfo['imageBundleMapper'].values())[0]['type'] == 'netelement':
-                        device['imageBundle'] = deviceInfo['bundleName']
+            device['deviceSpecificConfiglets'] = devices_configlets.get(device['key'], [])
 
             # Add device to facts list
-            facts['devices'].append(device)
+            facts_add(module=module, facts=facts, facts_type='devices', data=device)
             MODULE_LOGGER.info('    -> Device added to facts')
-        else:
-            MODULE_LOGGER.error('    ! Device is on Cloudvision but System Mac Address is missing ... skipped')
 
     return facts
 
 
+def configlets_applied_to(configlets_and_mappers, inventory, containers):
+    """
+    Build list of devices and containers each configlet is applied to.
+
+    Devices and containers are indexed by ID once, and mappers are then
+    resolved in a single pass, whatever the number of configlets.
+
+    Parameters
+    ----------
+    configlets_and_mappers : dict
+        Data section of get_configlets_and_mappers() from cvprac
+    inventory : list
+        Inventory list extracted from CVP
+    containers : list
+        Containers list extracted from CVP
+
+    Returns
+    -------
+    dict
+        Devices hostname and containers name ('devices' and 'containers' lists) indexed by configlet key
+    """
+    devices_index = tools_inventory.index_hostname_by_mac(inventory=inventory)
+    containers_index = tools_inventory.index_containerName_by_containerId(containers_list=containers)
+    configlets_applied = {configlet['key']: {'devices': list(), 'containers': list()}
+                          for configlet in configlets_and_mappers.get('configlets', [])}
+    for mapper in configlets_and_mappers.get('configletMappers', []):
+        configlet_applied = configlets_applied.get(mapper['configletId'])
+        if configlet_applied is None:
+            continue
+        # If mapper is for device
+        if mapper['type'] == 'netelement' and mapper['objectId'] in devices_index:
+            configlet_applied['devices'].append(devices_index[mapper['objectId']])
+        # If mapper is for container
+        if mapper['type'] == 'container' and mapper['objectId'] in containers_index:
+            configlet_applied['containers'].append(containers_index[mapper['objectId']])
+    return configlets_applied
+
+
 def facts_configlets_v1(module, facts):
     """
     DEPRECATED - Collect facts of all configlets.
 
+    Per-configlet calls to get applied devices and containers have been
+    replaced by facts_configlets which resolves them from configlet mappers.
+
     Parameters
     ----------
     module : AnsibleModule
@@ -191,34 +588,8 @@ def facts_configlets_v1(module, facts):
     dict
         facts with configlets content added.
     """
-
-    facts['configlets'] = []
-    MODULE_LOGGER.info('Collecting facts v1')
-    configlets = module.client.api.get_configlets()['data']
-    # Reduce configlet data to required fields
-    for configlet in configlets:
-        MODULE_LOGGER.debug('  -> Working on %s', configlet['name'])
-        # Get list of devices attached to configlet.
-        configlet['devices'] = []
-        MODULE_LOGGER.debug('  -> collecting list of attached devices to configlet: %s', str(configlet))
-        applied_devices = module.client.api.get_devices_by_configlet(configlet['name'])
-        for device in applied_devices['data']:
-            configlet['devices'].append(device['hostName'])
-
-        # Get list of containers attached to configlet.
-        configlet['containers'] = []
-        MODULE_LOGGER.debug(
-            '  -> collecting list of attached containers to configlet: %s', str(configlet))
-        applied_containers = module.client.api.get_containers_by_configlet(
-            configlet['name'])
-        for container in applied_containers['data']:
-            configlet['containers'].append(container['containerName'])
-
-        # Add configlet to facts list
-        facts['configlets'].append(configlet)
-    MODULE_LOGGER.info('All configlet facts collected')
-
-    return facts
+    MODULE_LOGGER.warning('facts_configlets_v1 is deprecated, using facts_configlets')
+    return facts_configlets(module=module, facts=facts)
 
 
 def facts_configlets(module, facts):
@@ -241,62 +612,98 @@ def facts_configlets(module, facts):
     """
     facts['configlets'] = []
     MODULE_LOGGER.info('Collecting facts v2')
-    configlets_and_mappers = module.client.api.get_configlets_and_mappers()[
-        'data']
-    # Load data to match ID with human readable name
-    inventory = list()
-    containers = list()
-    if 'devices' in facts:
-        MODULE_LOGGER.info('Devices part of facts, using cached version')
-        inventory = facts['devices']
-    else:
-        MODULE_LOGGER.warning(
-            'Devices not part of facts, collecting CV version')
-        inventory = module.client.api.get_inventory()
-    if 'containers' in facts:
-        MODULE_LOGGER.info('Containers part of facts, using cached version')
-        containers = facts['containers']
-    else:
-        MODULE_LOGGER.warning(
-            'Containers not part of facts, collecting CV version')
-        containers = module.client.api.get_containers()['data']
+    configlets_and_mappers = cv_configlets_and_mappers(module)
+    # Load data to match ID with human readable name. Devices and containers
+    # facts may be filtered or projected: use complete Cloudvision data.
+    inventory = cv_get_once(module, 'inventory', module.client.api.get_inventory)
+    containers = cv_get_once(module, 'containers', lambda: module.client.api.get_containers()['data'])
+    selector = facts_selector(module)
+    subtree_devices = None
+    subtree_containers = None
+    if selector.subtree is not None:
+        subtree_devices = set(tools_inventory.index_hostname_by_mac(
+            inventory=[device for device in inventory if selector.in_subtree(container_key=device.get('parentContainerKey'))]).values())
+        subtree_containers = {container['name'] for container in containers if selector.in_subtree(container_key=container['key'])}
 
     # Create list of configlets
     if 'configlets' in configlets_and_mappers:
+        configlets_applied = configlets_applied_to(configlets_and_mappers=configlets_and_mappers,
+                                                   inventory=inventory,
+                                                   containers=containers)
         for configlet in configlets_and_mappers['configlets']:
-            configlet['devices'] = list()
-            configlet['containers'] = list()
-            # Parse mapper section to locate potential mappings to devices and containers.
-            MODULE_LOGGER.info('building list of mapping with devices and containers for configlet %s', str(configlet['name']))
-            for mapper in configlets_and_mappers['configletMappers']:
-                # If mapper is tied to our configlet
-                if mapper['configletId'] == configlet['key']:
-                    # If mapper is for device
-                    if mapper['type'] == 'netelement':
-                        device_hostname = tools_inventory.find_hostname_by_mac(
-                            inventory=inventory, mac_address=mapper['objectId'])
-                        if device_hostname is not None:
-                            MODULE_LOGGER.debug('found mapping to device %s', str(device_hostname))
-                            configlet['devices'].append(device_hostname)
-                    # If mapper is for container
-                    if mapper['type'] == 'container':
-                        container_name = tools_inventory.find_containerName_by_containerId(containers_list=containers,
-                                                                                           container_id=mapper['objectId'])
-                        if container_name is not None:
-                            MODULE_LOGGER.debug(
-                                'found mapping to container %s', str(container_name))
-                            configlet['containers'].append(container_name)
-            facts['configlets'].append(configlet)
+            if not selector.is_selected(facts_type='configlets', name=configlet['name']):
+                continue
+            MODULE_LOGGER.debug('  -> Working on %s', configlet['name'])
+            configlet.update(configlets_applied.get(configlet['key'], {'devices': list(), 'containers': list()}))
+            # Only keep configlets applied to subtree
+            if (selector.subtree is not None
+                    and subtree_devices.isdisjoint(configlet['devices'])
+                    and subtree_containers.isdisjoint(configlet['containers'])):
+                continue
+            facts_add(module=module, facts=facts, facts_type='configlets', data=configlet)
     else:
         MODULE_LOGGER.error('No configlet found on CVP')
     MODULE_LOGGER.info('All configlets facts collected')
     return facts
 
 
+def container_configlets(configlets_and_mappers):
+    """
+    Build list of configlets applied to each container.
+
+    Parameters
+    ----------
+    configlets_and_mappers : dict
+        Data section of get_configlets_and_mappers() from cvprac
+
+    Returns
+    -------
+    dict
+        List of configlet names indexed by container key
+    """
+    configlet_names = dict()
+    for configlet in configlets_and_mappers.get('configlets', []):
+        configlet_names[configlet['key']] = configlet['name']
+    containers_configlets = dict()
+    mappers = [mapper for mapper in configlets_and_mappers.get('configletMappers', [])
+               if mapper['type'] == 'container' and mapper['configletId'] in configlet_names]
+    for mapper in sorted(mappers, key=lambda mapper: mapper.get('order', 0)):
+        containers_configlets.setdefault(mapper['objectId'], []).append(configlet_names[mapper['configletId']])
+    return containers_configlets
+
+
+def facts_container_image(module, container):
+    """
+    Collect name of image bundle applied to a container.
+
+    Function is thread safe and is executed in parallel for all containers.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters and instances
+    container : dict
+        Container data from Cloudvision
+
+    Returns
+    -------
+    str
+        Name of image bundle applied to container, empty string if none
+    """
+    applied_images = module.client.api.get_image_bundle_by_container_id(container['key'])['imageBundleList']
+    if len(applied_images) > 0:
+        return applied_images[0]['name']
+    return ""
+
+
 def facts_containers(module, facts):
     """
     Collect facts of all containers.
 
+    Devices and configlets attached to containers are resolved from bulk API
+    calls. Only image bundle information is collected per container, using a
+    pool of max_workers threads.
+
     Parameters
     ----------
     module : AnsibleModule
@@ -313,31 +720,48 @@ def facts_containers(module, facts):
     """
 
     facts['containers'] = []
+    cache = getattr(module, 'facts_cache', None)
 
     # Get List of all Containers
-    containers = module.client.api.get_containers()['data']
-    for container in containers:
+    selector = facts_selector(module)
+    containers = [container for container in cv_get_once(module, 'containers', lambda: module.client.api.get_containers()['data'])
+                  if selector.is_selected(facts_type='containers', name=container['name'])
+                  and selector.in_subtree(container_key=container['key'])]
+
+    # Get devices and configlets attached to containers in a single call
+    containers_devices = dict()
+    for device in cv_get_once(module, 'inventory', module.client.api.get_inventory):
+        containers_devices.setdefault(device.get('parentContainerKey'), []).append(device['fqdn'])
+    containers_configlets = container_configlets(
+        configlets_and_mappers=cv_configlets_and_mappers(module))
+
+    # Get image bundles still valid from previous execution
+    images_wanted = selector.is_wanted(facts_type='containers', field='imageBundle')
+    markers = [facts_marker(container, fields=MARKER_FIELDS['containers']) if cache is not None else None for container in containers]
+    images = [cache.get(facts_type='containers', key=container['key'], marker=marker).get('imageBundle')
+              if cache is not None else None
+              for container, marker in zip(containers, markers)]
+    missing = [index for index, image in enumerate(images) if image is None] if images_wanted else []
+    MODULE_LOGGER.debug('  -> Collecting image bundle for %s containers', str(len(missing)))
+    missing_images = run_concurrently(function=lambda index: facts_container_image(module=module, container=containers[index]),
+                                      items=missing,
+                                      max_workers=module.params['max_workers'])
+    for index, image in zip(missing, missing_images):
+        images[index] = image
+
+    for container, image, marker in zip(containers, images, markers):
         MODULE_LOGGER.debug('  -> Working on %s', container['name'])
-        container['devices'] = []
-        # Get list of devices attached to container.
-        applied_devices = module.client.api.get_devices_in_container(container['key'])
-        for device in applied_devices:
-            container['devices'].append(device['fqdn'])
-
-        # Get list of configlets attached to container.
-        container['configlets'] = []
-        applied_configlets = module.client.api.get_configlets_by_container_id(container['key'])['configletList']
-        for configlet in applied_configlets:
-            container['configlets'].append(configlet['name'])
-
-        # Add applied Images
-        container['imageBundle'] = ""
-        applied_images = module.client.api.get_image_bundle_by_container_id(container['key'])['imageBundleList']
-        if len(applied_images) > 0:
-            container['imageBundle'] = applied_images[0]['name']
+        if cache is not None and image is not None:
+            cache.set(facts_type='containers', key=container['key'], marker=marker, details={'imageBundle': image})
+        # Do not update containers shared with other facts functions
+        container = dict(container)
+        container['devices'] = containers_devices.get(container['key'], [])
+        container['configlets'] = containers_configlets.get(container['key'], [])
+        if images_wanted:
+            container['imageBundle'] = image
 
         # Add container to facts list
-        facts['containers'].append(container)
+        facts_add(module=module, facts=facts, facts_type='containers', data=container)
 
     return facts
 
@@ -386,10 +810,32 @@ def facts_tasks(module, facts):
 
     for task in tasks:
         MODULE_LOGGER.debug('  -> Working on %s', task)
-        facts['tasks'].append(task)
+        facts_add(module=module, facts=facts, facts_type='tasks', data=task)
     return facts
 
 
+def facts_store_params(module):
+    """
+    facts_store_params Parameters identifying facts which can be shared with next modules.
+
+    Only complete facts returned to Ansible are shared: facts written to a
+    file or restricted with filters, container_subtree or fields are not.
+
+    Parameters
+    ----------
+    module : AnsibleModule
+        Ansible module with parameters
+
+    Returns
+    -------
+    dict
+        facts and gather_subset parameters, None if facts cannot be shared
+    """
+    if any(module.params[option] is not None for option in ['output_file', 'filters', 'container_subtree', 'fields']):
+        return None
+    return {'facts': sorted(module.params['facts']), 'gather_subset': sorted(module.params['gather_subset'])}
+
+
 def facts_builder(module):
     """
     Method to call every fact module for either devices/containers/configlets.
@@ -412,30 +858,73 @@ def facts_builder(module):
     MODULE_LOGGER.info('** Collecting CVP Information (version)')
     facts['cvp_info'] = module.client.api.get_cvp_info()
 
-    # Extract devices facts
-    if 'all' in module.params['facts'] or 'devices' in module.params['facts']:
-        MODULE_LOGGER.info('** Collecting devices facts ...')
-        facts = facts_devices(module=module, facts=facts)
-
-    # Extract containers information
-    if 'all' in module.params['facts'] or 'containers' in module.params['facts']:
-        MODULE_LOGGER.info('** Collecting containers facts ...')
-        facts = facts_containers(module=module, facts=facts)
-
-    # Extract configlet information
-    if 'all' in module.params['facts'] or 'configlets' in module.params['facts']:
-        MODULE_LOGGER.info('** Collecting configlets facts ...')
-        facts = facts_configlets(module=module, facts=facts)
-
-    # Extract tasks information
-    if 'all' in module.params['facts'] or 'tasks' in module.params['facts']:
-        MODULE_LOGGER.info('** Collecting tasks facts ...')
-        facts = facts_tasks(module=module, facts=facts)
-
-    # Extract imageBundles information
-    if 'all' in module.params['facts'] or 'images' in module.params['facts']:
-        MODULE_LOGGER.info('** Collecting images facts ...')
-        facts['imageBundles'] = list()
+    # Select facts entries and fields to collect
+    try:
+        module.facts_selector = CvFactsSelector(filters=module.params['filters'],
+                                                filter_mode=module.params['filter_mode'],
+                                                fields=module.params['fields'])
+    except ValueError as error:
+        module.fail_json(msg='Invalid facts selection: {}'.format(str(error)))
+    if module.params['container_subtree'] is not None:
+        containers = cv_get_once(module, 'containers', lambda: module.client.api.get_containers()['data'])
+        if not module.facts_selector.set_subtree(containers=containers, container_name=module.params['container_subtree']):
+            module.fail_json(msg='Container {} not found on Cloudvision'.format(module.params['container_subtree']))
+
+    # Write facts to output file instead of returning them
+    if module.params['output_file'] is not None:
+        MODULE_LOGGER.info('** Writing facts to %s', str(module.params['output_file']))
+        try:
+            module.facts_writer = CvFactsWriter(output_file=module.params['output_file'],
+                                                compress=module.params['output_compress'])
+        except (IOError, OSError) as error:
+            module.fail_json(msg='Cannot write facts to {}: {}'.format(module.params['output_file'], str(error)))
+
+    # Temporary output file is removed if collection fails
+    try:
+        if getattr(module, 'facts_writer', None) is not None:
+            module.facts_writer.write(facts_type='cvp_info', data=facts['cvp_info'])
+
+        # Load details collected during previous execution
+        if module.params['cache_file'] is not None:
+            MODULE_LOGGER.info('** Loading facts cache %s', str(module.params['cache_file']))
+            module.facts_cache = facts_cache_init(module=module, cvp_info=facts['cvp_info'])
+
+        # Extract devices facts
+        if 'all' in module.params['facts'] or 'devices' in module.params['facts']:
+            MODULE_LOGGER.info('** Collecting devices facts ...')
+            facts = facts_devices(module=module, facts=facts)
+
+        # Extract containers information
+        if 'all' in module.params['facts'] or 'containers' in module.params['facts']:
+            MODULE_LOGGER.info('** Collecting containers facts ...')
+            facts = facts_containers(module=module, facts=facts)
+
+        # Extract configlet information
+        if 'all' in module.params['facts'] or 'configlets' in module.params['facts']:
+            MODULE_LOGGER.info('** Collecting configlets facts ...')
+            facts = facts_configlets(module=module, facts=facts)
+
+        # Extract tasks information
+        if 'all' in module.params['facts'] or 'tasks' in module.params['facts']:
+            MODULE_LOGGER.info('** Collecting tasks facts ...')
+            facts = facts_tasks(module=module, facts=facts)
+
+        # Extract imageBundles information
+        if 'all' in module.params['facts'] or 'images' in module.params['facts']:
+            MODULE_LOGGER.info('** Collecting images facts ...')
+            facts['imageBundles'] = list()
+
+        if getattr(module, 'facts_cache', None) is not None:
+            module.facts_cache.save()
+
+        if getattr(module, 'facts_writer', None) is not None:
+            module.facts_writer.close()
+            facts = {'cvp_info': facts['cvp_info'],
+                     'facts_file': module.params['output_file'],
+                     'facts_summary': module.facts_writer.summary}
+    finally:
+        if getattr(module, 'facts_writer', None) is not None:
+            module.facts_writer.abort()
 
     # End of Facts module
     MODULE_LOGGER.info('** All facts done')
@@ -464,7 +953,32 @@ def main():
                             'containers',
                             'devices',
                             'tasks'],
-                   default='all'))
+                   default='all'),
+        max_workers=dict(type='int',
+                         required=False,
+                         default=4),
+        cache_file=dict(type='path',
+                        required=False,
+                        default=None),
+        output_file=dict(type='path',
+                         required=False,
+                         default=None),
+        output_compress=dict(type='bool',
+                             required=False,
+                             default=False),
+        filters=dict(type='dict',
+                     required=False,
+                     default=None),
+        filter_mode=dict(type='str',
+                         required=False,
+                         choices=['glob', 'regex'],
+                         default='glob'),
+        container_subtree=dict(type='str',
+                               required=False,
+                               default=None),
+        fields=dict(type='dict',
+                    required=False,
+                    default=None))
 
     module = AnsibleModule(argument_spec=argument_spec,
                            supports_check_mode=True)
@@ -477,12 +991,25 @@ def main():
     result = dict(changed=False, ansible_facts={})
 
     if not module.check_mode:
+        # Reuse facts shared by a previous execution
+        store_params = facts_store_params(module)
+        facts_store = tools_cv.cv_facts_store(module) if store_params is not None else None
+        if facts_store is not None:
+            cached_facts = facts_store.get(params=store_params)
+            if cached_facts is not None:
+                result['ansible_facts'] = cached_facts
+                module.exit_json(**result)
+
         # Connect to CVP Instance
         module.client = tools_cv.cv_connect(module)
 
         # Get Facts from CVP
         result['ansible_facts'] = facts_builder(module)
 
+        # Share facts with next modules
+        if facts_store is not None:
+            facts_store.set(facts=result['ansible_facts'], params=store_params)
+
     # Standard Ansible outputs
     module.exit_json(**result)
 
@@ -76,11 +76,11 @@ EXAMPLES = '''
     wait: 60
 '''
 
-import time
 import logging
 import ansible_collections.arista.cvp.plugins.module_utils.logger   # noqa # pylint: disable=unused-import
 from ansible.module_utils.basic import AnsibleModule
 import ansible_collections.arista.cvp.plugins.module_utils.tools_cv as tools_cv
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import CvTaskWatcher
 
 MODULE_LOGGER = logging.getLogger('arista.cvp.cv_tasks')
 MODULE_LOGGER.info('Start cv_tasks module execution')
@@ -122,13 +122,6 @@ def state_is_different(task, target):
     return get_state(task) != target
 
 
-def update_all_tasks(cvp, data):
-    new_data = dict()
-    for task_id in data.keys():
-        new_data[task_id] = cvp.get_task_by_id(task_id)
-    return new_data
-
-
 def task_action(module):
     '''
     TODO.
@@ -156,15 +149,10 @@ def task_action(module):
             changed = True
             data[get_id(task)] = task
 
-    start = time.time()
-    now = time.time()
-    while (now - start) < wait:
-        data = update_all_tasks(cvp, data)
-        if all([terminal(get_state(t)) for t in data.values()]):
-            break
-        now = time.time()
+    if wait and len(data) > 0:
+        tasks_data = CvTaskWatcher(cv_connection=module.client).wait(task_ids=list(data.keys()), timeout=wait)
+        data.update({task_id: task for task_id, task in tasks_data.items() if task is not None})
 
-    if wait:
         for i, task in data.items():
             if not terminal(get_state(task)):
                 warnings.append("Task {0} has not completed in {1} seconds".format(i, wait))
@@ -191,9 +179,14 @@ def main():
     if not module.check_mode:
         # Connect to CVP instance
         module.client = tools_cv.cv_connect(module)
+        tools_cv.cv_facts_invalidate_on_failure(module)
 
         result['changed'], result['data'], warnings = task_action(module)
 
+        # Facts shared by cv_facts are outdated once Cloudvision has been changed
+        if result['changed']:
+            tools_cv.cv_facts_invalidate(module)
+
         if warnings:
             [module.warn(w) for w in warnings]
 
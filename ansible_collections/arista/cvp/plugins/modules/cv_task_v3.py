@@ -36,6 +36,16 @@ options:
     required: True
     type: list
     elements: str
+  max_workers:
+    description: Maximum number of tasks executed or cancelled in parallel on CVP server.
+    required: false
+    default: 4
+    type: int
+  wait:
+    description: Time in seconds to wait for executed tasks to transition to 'Completed'
+    required: false
+    default: 0
+    type: int
   state:
     description: action to carry out on the task
                  executed - execute tasks
@@ -58,6 +68,11 @@ EXAMPLES = '''
   arista.cvp.cv_task:
     tasks: ['666', '667']
     state: cancelled
+
+- name: Execute tasks and wait up to 5 minutes for completion
+  arista.cvp.cv_task_v3:
+    tasks: "{{ cvp_configlets.taskIds }}"
+    wait: 300
 '''
 
 import logging
@@ -99,6 +114,8 @@ def main():
     argument_spec = dict(
         # Topology to configure on CV side.
         tasks=dict(type='list', required=True, elements='str'),
+        wait=dict(type='int', required=False, default=0),
+        max_workers=dict(type='int', required=False, default=4),
         state=dict(type='str',
                    required=False,
                    default='executed',
@@ -118,13 +135,21 @@ def main():
 
     # Create CVPRAC client
     cv_client = tools_cv.cv_connect(ansible_module)
+    tools_cv.cv_facts_invalidate_on_failure(ansible_module)
 
-    task_manager = CvTaskTools(cv_connection=cv_client, ansible_module=ansible_module)
+    task_manager = CvTaskTools(cv_connection=cv_client,
+                               ansible_module=ansible_module,
+                               max_workers=ansible_module.params['max_workers'])
     ansible_response: CvAnsibleResponse = task_manager.tasker(taskIds_list=ansible_module.params['tasks'],
-                                                              state=ansible_module.params['state'])
+                                                              state=ansible_module.params['state'],
+                                                              wait=ansible_module.params['wait'])
 
     result = ansible_response.content
 
+    # Facts shared by cv_facts are outdated once Cloudvision has been changed
+    if result['changed'] and not ansible_module.check_mode:
+        tools_cv.cv_facts_invalidate(ansible_module)
+
     ansible_module.exit_json(**result)
 
 
@@ -0,0 +1,6 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+
+username = "ansible"
+password = "ansible"
+server = "cv-server-ip"
@@ -0,0 +1,35 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+"""
+Mocked cvprac client and AnsibleModule shared by generic unit tests.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+from unittest import mock
+
+
+def build_module(check_mode: bool = False):
+    """
+    Mocked AnsibleModule: fail_json raises SystemExit as AnsibleModule exits.
+    """
+    ansible_module = mock.MagicMock()
+    ansible_module.check_mode = check_mode
+    ansible_module.fail_json.side_effect = SystemExit
+    return ansible_module
+
+
+def build_cv_client(tasks: dict = None):
+    """
+    Mocked cvprac client: every saveTopology creates a task for each device listed in tasks.
+
+    tasks is a dict of taskId indexed by device systemMacAddress.
+    """
+    client = mock.MagicMock()
+    client.api.get_tasks_by_status.return_value = [{"workOrderId": task_id, "netElementId": mac} for mac, task_id in (tasks or dict()).items()]
+    client.api._save_topology_v2.return_value = {"data": {"status": "success", "taskIds": list((tasks or dict()).values())}}
+    return client
@@ -13,7 +13,8 @@ import pytest
 sys.path.append("./")
 sys.path.append("../")
 sys.path.append("../../")
-from ansible_collections.arista.cvp.plugins.module_utils.container_tools import ContainerInput, FIELD_PARENT_NAME
+from ansible_collections.arista.cvp.plugins.module_utils.container_tools import ContainerInput, CvContainerSnapshot, FIELD_PARENT_NAME
+from ansible_collections.arista.cvp.plugins.module_utils.container_tools import FIELD_KEY, FIELD_NAME, FIELD_COUNT_CONTAINERS
 
 
 # pytest - -html = report.html - -self-contained-html - -cov = . --cov-report = html - -color yes containerInputs.py - v
@@ -29,6 +30,24 @@ CVP_CONTAINERS_1_LEVELS = {"DC2": {"parentContainerName": "Tenant"}}
 CVP_CONTAINERS_01 = {"DC-2": {"parentContainerName": "Tenant"}, "Leafs": {
     "parentContainerName": "DC-2"}}
 
+CVP_CONTAINERS_UNORDERED = {"POD01": {"parentContainerName": "Leafs"}, "Leafs": {"parentContainerName": "DC2"},
+                            "Spines": {"parentContainerName": "DC2"}, "DC2": {"parentContainerName": "Tenant"}}
+
+CVP_CONTAINERS_ORPHAN = {"POD01": {"parentContainerName": "Leafs"}, "Leafs": {"parentContainerName": "DC_ON_CV"},
+                         "DC2": {"parentContainerName": "Tenant"}}
+
+CVP_CONTAINERS_LOOP = {"DC2": {"parentContainerName": "Tenant"}, "Leafs": {"parentContainerName": "POD01"},
+                       "POD01": {"parentContainerName": "Leafs"}}
+
+CV_TOPOLOGY = {"key": "root", "name": "Tenant", "parentContainerId": None, "childContainerCount": 1, "childNetElementCount": 0,
+               "childContainerList": [
+                   {"key": "container_1", "name": "DC2", "parentContainerId": "root", "childContainerCount": 2, "childNetElementCount": 0,
+                    "childContainerList": [
+                        {"key": "container_2", "name": "Leafs", "parentContainerId": "container_1", "childContainerCount": 0,
+                         "childNetElementCount": 2, "childContainerList": []},
+                        {"key": "container_3", "name": "Spines", "parentContainerId": "container_1", "childContainerCount": 0,
+                         "childNetElementCount": 0, "childContainerList": []}]}]}
+
 
 # Generic helpers
 def time_log():
@@ -43,12 +62,15 @@ def get_cv_container_definition():
     return [CVP_CONTAINERS_1_LEVELS, CVP_CONTAINERS_2_LEVELS, CVP_CONTAINERS_3_LEVELS, CVP_CONTAINERS_01]
 
 
+def get_cv_container_sortable():
+    return [CVP_CONTAINERS_3_LEVELS, CVP_CONTAINERS_UNORDERED, CVP_CONTAINERS_ORPHAN]
+
+
 # ---------------------------------------------------------------------------- #
 #   FIXTURES Management
 # ---------------------------------------------------------------------------- #
 
 @pytest.fixture()
-@pytest.mark.parametrize('CVP_CONTAINER', get_cv_container_definition())
 def ContainerInput_Creation(request, CVP_CONTAINER):
     logging.info("Execute fixture to create class elements")
     request.cls.inventory = ContainerInput(user_topology=CVP_CONTAINER)
@@ -112,3 +134,85 @@ class TestContainerInput():
                 assert self.inventory.get_configlets(container_name=entry_name) == entry['configlets']
                 logging.info('Container {} has following configlets: {}'.format(
                     entry_name, self.inventory.get_configlets(container_name=entry_name)))
+
+
+@pytest.mark.generic
+class TestContainerInputSort():
+    @pytest.mark.parametrize('CVP_CONTAINER', get_cv_container_sortable())
+    def test_parent_before_child(self, CVP_CONTAINER):
+        ordered_list = ContainerInput(user_topology=CVP_CONTAINER).ordered_list_containers
+        assert sorted(ordered_list) == sorted(CVP_CONTAINER.keys())
+        for entry_name, entry in CVP_CONTAINER.items():
+            if entry[FIELD_PARENT_NAME] in CVP_CONTAINER:
+                assert ordered_list.index(entry_name) > ordered_list.index(entry[FIELD_PARENT_NAME])
+        logging.info('Containers ordered as: {}'.format(ordered_list))
+
+    @pytest.mark.parametrize('CVP_CONTAINER', get_cv_container_sortable())
+    def test_ordered_levels(self, CVP_CONTAINER):
+        inventory = ContainerInput(user_topology=CVP_CONTAINER)
+        ordered_levels = inventory.ordered_levels_containers
+        assert [name for level in ordered_levels for name in level] == inventory.ordered_list_containers
+        for depth, level in enumerate(ordered_levels):
+            for entry_name in level:
+                parent_name = CVP_CONTAINER[entry_name][FIELD_PARENT_NAME]
+                if parent_name in CVP_CONTAINER:
+                    assert parent_name in ordered_levels[depth - 1]
+                else:
+                    assert depth == 0
+        logging.info('Containers grouped by level as: {}'.format(ordered_levels))
+
+    def test_ordered_levels_3_levels(self):
+        inventory = ContainerInput(user_topology=CVP_CONTAINERS_3_LEVELS)
+        assert inventory.ordered_levels_containers == [['DC2'], ['Leafs', 'Spines'], ['POD01']]
+
+    def test_ordered_list_cached(self):
+        inventory = ContainerInput(user_topology=CVP_CONTAINERS_UNORDERED)
+        assert inventory.ordered_list_containers is inventory.ordered_list_containers
+
+    def test_orphan_containers(self):
+        inventory = ContainerInput(user_topology=CVP_CONTAINERS_ORPHAN)
+        assert inventory.orphan_containers == ['Leafs']
+        assert inventory.cyclic_containers == []
+        assert ContainerInput(user_topology=CVP_CONTAINERS_3_LEVELS).orphan_containers == []
+
+    def test_cyclic_containers(self):
+        inventory = ContainerInput(user_topology=CVP_CONTAINERS_LOOP)
+        assert sorted(inventory.cyclic_containers) == ['Leafs', 'POD01']
+        assert inventory.ordered_list_containers[0] == 'DC2'
+        assert sorted(inventory.ordered_list_containers) == sorted(CVP_CONTAINERS_LOOP.keys())
+        assert inventory.ordered_levels_containers[0] == ['DC2']
+        assert len(inventory.ordered_levels_containers) == 3
+
+
+@pytest.mark.generic
+class TestCvContainerSnapshot():
+    @pytest.mark.parametrize('container_name', ['Tenant', 'DC2', 'Leafs', 'Spines'])
+    def test_get(self, container_name):
+        snapshot = CvContainerSnapshot(data=CV_TOPOLOGY)
+        container = snapshot.get(search_value=container_name)
+        assert container[FIELD_NAME] == container_name
+        assert snapshot.get(search_value=container[FIELD_KEY], search_by=FIELD_KEY) is container
+        assert 'childContainerList' not in container
+
+    def test_get_unknown(self):
+        snapshot = CvContainerSnapshot(data=CV_TOPOLOGY)
+        assert snapshot.get(search_value='POD01') is None
+        assert CvContainerSnapshot(data=None).get(search_value='Tenant') is None
+
+    def test_children(self):
+        snapshot = CvContainerSnapshot(data=CV_TOPOLOGY)
+        assert snapshot.get_children(container_id='root') == ['container_1']
+        assert snapshot.get_children(container_id='container_1') == ['container_2', 'container_3']
+        assert snapshot.get_children(container_id='container_2') == []
+
+    def test_add_remove(self):
+        snapshot = CvContainerSnapshot(data=CV_TOPOLOGY)
+        snapshot.add(container_name='POD01', container_id='container_4', parent_id='container_2')
+        assert snapshot.get(search_value='POD01')[FIELD_KEY] == 'container_4'
+        assert snapshot.get_children(container_id='container_2') == ['container_4']
+        assert snapshot.get(search_value='Leafs')[FIELD_COUNT_CONTAINERS] == 1
+        snapshot.remove(container_name='POD01')
+        assert snapshot.get(search_value='POD01') is None
+        assert snapshot.get(search_value='container_4', search_by=FIELD_KEY) is None
+        assert snapshot.get_children(container_id='container_2') == []
+        assert snapshot.get(search_value='Leafs')[FIELD_COUNT_CONTAINERS] == 0
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+from unittest import mock
+from cvprac.cvp_client_errors import CvpApiError
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.configlet_tools import CvConfigletTools
+from mock_cvp import build_module, build_cv_client
+
+
+CONFIGLET_CV = '\n'.join('alias a{} show version'.format(i) for i in range(50)) + '\n'
+CONFIGLET_ANSIBLE = CONFIGLET_CV.replace('alias a10 ', 'alias a110 ').replace('alias a20 ', 'alias a120 ')
+
+# ---------------------------------------------------------------------------- #
+#   PARAMETRIZE Management
+# ---------------------------------------------------------------------------- #
+
+
+def get_max_diff_lines():
+    return [0, 1, 5, 10]
+
+# ---------------------------------------------------------------------------- #
+#   FIXTURES Management
+# ---------------------------------------------------------------------------- #
+
+
+@pytest.fixture(scope="class")
+def CvConfigletTools_Manager(request):
+    logging.info("Execute fixture to create class elements")
+    request.cls.configlet_tools = CvConfigletTools(cv_connection=None)
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+
+@pytest.mark.usefixtures("CvConfigletTools_Manager")
+@pytest.mark.generic
+class TestCvConfigletToolsCompare():
+
+    def test_compare_identical(self):
+        result = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_CV)
+        assert result == [False, []]
+        logging.info('No diff reported for identical configlets')
+
+    def test_compare_different(self):
+        result = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_ANSIBLE)
+        assert result[0] is True
+        assert '-alias a10 show version\n' in result[1]
+        assert '+alias a110 show version\n' in result[1]
+        logging.info('Diff is: {}'.format(result[1]))
+
+    @pytest.mark.parametrize('max_diff_lines', get_max_diff_lines())
+    def test_compare_truncated(self, max_diff_lines):
+        full_diff = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_ANSIBLE)[1]
+        result = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_ANSIBLE, max_diff_lines=max_diff_lines)
+        assert result[0] is True
+        assert result[1][:-1] == full_diff[:max_diff_lines]
+        assert result[1][-1] == '[diff truncated] 2 line(s) added, 2 line(s) removed\n'
+        logging.info('Truncated diff is: {}'.format(result[1]))
+
+    def test_compare_not_truncated(self):
+        full_diff = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_ANSIBLE)[1]
+        result = self.configlet_tools._compare(fromText=CONFIGLET_CV, toText=CONFIGLET_ANSIBLE, max_diff_lines=len(full_diff))
+        assert result[1] == full_diff
+
+
+@pytest.mark.generic
+class TestCvConfigletToolsPrefetch():
+    def test_prefetch_failure(self):
+        cvp_client = build_cv_client()
+        cvp_client.api.get_configlets_and_mappers.side_effect = CvpApiError('Unauthorized')
+        ansible_module = build_module()
+        configlet_tools = CvConfigletTools(cv_connection=cvp_client, ansible_module=ansible_module)
+        with pytest.raises(SystemExit):
+            configlet_tools.apply(configlet_list=[{'name': 'TEAM01-alias', 'config': 'alias a1 show version'}], present=False)
+        assert 'Unauthorized' in ansible_module.fail_json.call_args[1]['msg']
+        cvp_client.api.delete_configlet.assert_not_called()
+        cvp_client.api.add_configlet.assert_not_called()
+
+    def test_prefetch_failure_not_exiting(self):
+        cvp_client = build_cv_client()
+        cvp_client.api.get_configlets_and_mappers.side_effect = CvpApiError('Unauthorized')
+        configlet_tools = CvConfigletTools(cv_connection=cvp_client, ansible_module=mock.MagicMock())
+        assert configlet_tools.get_configlets_data_cv() is None
@@ -11,10 +11,13 @@ from datetime import datetime
 import sys
 import logging
 import pytest
+from unittest import mock
+from cvprac.cvp_client_errors import CvpApiError
 sys.path.append("../")
 sys.path.append("../../")
 sys.path.append("./")
 from ansible_collections.arista.cvp.plugins.module_utils.container_tools import ContainerInput, CvContainerTools
+from mock_cvp import build_module, build_cv_client
 from cvprac.cvp_client import CvpClient
 import requests
 import config
@@ -34,11 +37,43 @@ STATIC_CONFIGLET_NAME = ['01TRAINING-01']
 
 TOPOLOGY_STATE = ['present', 'absent']
 
+CV_TOPOLOGY = {"key": "root", "name": "Tenant", "parentContainerId": None, "childContainerCount": 1, "childNetElementCount": 0,
+               "childContainerList": [
+                   {"key": "container_1", "name": "DC2", "parentContainerId": "root", "childContainerCount": 2, "childNetElementCount": 0,
+                    "childContainerList": [
+                        {"key": "container_2", "name": "Leafs", "parentContainerId": "container_1", "childContainerCount": 1,
+                         "childNetElementCount": 1, "childContainerList": [
+                             {"key": "container_4", "name": "POD01", "parentContainerId": "container_2", "childContainerCount": 0,
+                              "childNetElementCount": 1, "childContainerList": []}]},
+                        {"key": "container_3", "name": "Spines", "parentContainerId": "container_1", "childContainerCount": 0,
+                         "childNetElementCount": 1, "childContainerList": []}]}]}
+
+CV_INVENTORY = [{"key": "50:00:00:00:00:01", "parentContainerKey": "container_2"},
+                {"key": "50:00:00:00:00:02", "parentContainerKey": "container_4"},
+                {"key": "50:00:00:00:00:03", "parentContainerKey": "container_3"}]
+
+USER_TOPOLOGY_CONFIGLETS = {"DC2": {"parentContainerName": "Tenant", "configlets": ["01TRAINING-01"]},
+                            "Leafs": {"parentContainerName": "DC2", "configlets": ["01TRAINING-01"]},
+                            "Spines": {"parentContainerName": "DC2", "configlets": ["01TRAINING-01"]}}
+
 # Generic helpers
 def time_log():
     now = datetime.now()
     return now.strftime("%H:%M:%S")
 
+
+def build_client(tasks: dict = None):
+    """
+    Mocked cvprac client: every saveTopology creates a task for each device listed in tasks.
+    """
+    client = build_cv_client(tasks=tasks)
+    client.api.filter_topology.return_value = {"topology": CV_TOPOLOGY}
+    client.api.get_configlets_and_mappers.return_value = {"data": {"configlets": [{"name": "01TRAINING-01", "key": "configlet_1"}],
+                                                                   "configletMappers": []}}
+    client.api.get_inventory.return_value = CV_INVENTORY
+    client.api.apply_configlets_to_container.side_effect = lambda app_name, new_configlets, container, create_task: {"data": [{"toId": container["key"]}]}
+    return client
+
 # ---------------------------------------------------------------------------- #
 #   PARAMETRIZE Management
 # ---------------------------------------------------------------------------- #
@@ -272,3 +307,132 @@ class TestCvContainerToolsTopology():
         assert result.success is True
         logging.info(
             'Topology del result is: {}'.format(result.content))
+
+
+@pytest.mark.generic
+class TestCvContainerToolsStaging():
+    def test_save_topology_per_level(self):
+        client = build_client()
+        tools = CvContainerTools(cv_connection=client, ansible_module=build_module())
+        result = tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY_CONFIGLETS))
+        assert result.success is True
+        client.api.add_container.assert_not_called()
+        assert client.api.apply_configlets_to_container.call_count == 3
+        for call in client.api.apply_configlets_to_container.call_args_list:
+            assert call[1]['create_task'] is False
+        # One saveTopology for DC2 and one for Leafs and Spines
+        assert client.api._save_topology_v2.call_count == 2
+
+    def test_strict_mode_configlets(self):
+        client = build_client()
+        configlets = [{"name": "01TRAINING-01", "key": "configlet_1"}, {"name": "OLD-CONFIGLET", "key": "configlet_2"}]
+        client.api.get_configlets_and_mappers.return_value = {"data": {
+            "configlets": configlets, "configletMappers": [{"objectId": "container_1", "configletId": "configlet_2", "type": "container"}]}}
+        # Like cvprac, temp actions are built from configlets saved on Cloudvision and last action of a container wins
+        saved = {"container_1": [configlets[1]]}
+        staged = list()
+
+        def apply_configlets_to_container(app_name, new_configlets, container, create_task):
+            staged.append((container["key"], saved.get(container["key"], []) + new_configlets))
+            return {"data": [{"toId": container["key"]}]}
+
+        def remove_configlets_from_container(app_name, del_configlets, container, create_task):
+            removed = [configlet["key"] for configlet in del_configlets]
+            staged.append((container["key"], [configlet for configlet in saved.get(container["key"], []) if configlet["key"] not in removed]))
+            return {"data": [{"toId": container["key"]}]}
+
+        def save_topology(data):
+            saved.update(staged)
+            del staged[:]
+            return {"data": {"status": "success", "taskIds": []}}
+
+        client.api.apply_configlets_to_container.side_effect = apply_configlets_to_container
+        client.api.remove_configlets_from_container.side_effect = remove_configlets_from_container
+        client.api._save_topology_v2.side_effect = save_topology
+        tools = CvContainerTools(cv_connection=client, ansible_module=build_module())
+        result = tools.build_topology(user_topology=ContainerInput(user_topology={"DC2": {"parentContainerName": "Tenant",
+                                                                                          "configlets": ["01TRAINING-01"]}}),
+                                      apply_mode='strict')
+        assert result.success is True
+        assert [configlet["name"] for configlet in saved["container_1"]] == ["01TRAINING-01"]
+
+    def test_save_topology_tasks(self):
+        client = build_client(tasks={"50:00:00:00:00:01": "1", "50:00:00:00:00:02": "2", "50:00:00:00:00:03": "3"})
+        tools = CvContainerTools(cv_connection=client, ansible_module=build_module())
+        leafs = tools.configlets_attach(container='Leafs', configlets=STATIC_CONFIGLET_NAME, save_topology=False)
+        spines = tools.configlets_attach(container='Spines', configlets=STATIC_CONFIGLET_NAME, save_topology=False)
+        assert leafs.taskIds == [] and spines.taskIds == []
+        assert sorted(tools.save_topology()) == ['1', '2', '3']
+        # Device in POD01 is managed by configlets of Leafs
+        assert sorted(leafs.taskIds) == ['1', '2']
+        assert spines.taskIds == ['3']
+        assert leafs.changed is True and spines.changed is True
+        client.api._save_topology_v2.assert_called_once_with([])
+
+    def test_save_topology_single_container(self):
+        client = build_client(tasks={"50:00:00:00:00:01": "1", "50:00:00:00:00:02": "2"})
+        tools = CvContainerTools(cv_connection=client, ansible_module=build_module())
+        leafs = tools.configlets_attach(container='Leafs', configlets=STATIC_CONFIGLET_NAME, save_topology=False)
+        tools.save_topology()
+        assert sorted(leafs.taskIds) == ['1', '2']
+        client.api.get_inventory.assert_not_called()
+        # Nothing staged anymore
+        assert tools.save_topology() == []
+        client.api._save_topology_v2.assert_called_once_with([])
+
+    def test_save_topology_failure(self):
+        client = build_client()
+        client.api._save_topology_v2.return_value = None
+        ansible_module = build_module()
+        tools = CvContainerTools(cv_connection=client, ansible_module=ansible_module)
+        tools.configlets_attach(container='Leafs', configlets=STATIC_CONFIGLET_NAME, save_topology=False)
+        with pytest.raises(SystemExit):
+            tools.save_topology()
+        ansible_module.fail_json.assert_called_once()
+
+    def test_worker_failure(self):
+        client = build_client()
+
+        def apply_configlets_to_container(app_name, new_configlets, container, create_task):
+            if container['name'] == 'Spines':
+                raise CvpApiError('Unauthorized')
+            return {"data": [{"toId": container["key"]}]}
+
+        client.api.apply_configlets_to_container.side_effect = apply_configlets_to_container
+        ansible_module = build_module()
+        tools = CvContainerTools(cv_connection=client, ansible_module=ansible_module, max_workers=4)
+        with pytest.raises(SystemExit):
+            tools.build_topology(user_topology=ContainerInput(user_topology=USER_TOPOLOGY_CONFIGLETS))
+        # DC2 level is saved, Leafs staged action is never saved and is reported
+        assert client.api._save_topology_v2.call_count == 1
+        client.get.assert_not_called()
+        ansible_module.fail_json.assert_called_once()
+        assert 'Unauthorized' in ansible_module.fail_json.call_args[1]['msg']
+        assert 'not saved: Leafs:01TRAINING-01' in ansible_module.fail_json.call_args[1]['msg']
+
+
+@pytest.mark.generic
+class TestCvContainerToolsCreate():
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.container_tools.time.sleep')
+    def test_create_container_lookup_retry(self, sleep):
+        client = build_client()
+        client.api.add_container.return_value = {"data": {"status": "success", "taskIds": []}}
+        client.api.get_container_by_name.side_effect = [None, {"key": "container_5", "name": "Borders"}]
+        tools = CvContainerTools(cv_connection=client, ansible_module=build_module())
+        result = tools.create_container(container='Borders', parent='DC2')
+        assert result.changed is True
+        assert tools.get_container_id(container_name='Borders') == 'container_5'
+        assert tools.topology.get_children(container_id='container_1') == ['container_2', 'container_3', 'container_5']
+        sleep.assert_called_once()
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.container_tools.time.sleep')
+    def test_create_container_lookup_failure(self, sleep):
+        client = build_client()
+        client.api.add_container.return_value = {"data": {"status": "success", "taskIds": []}}
+        client.api.get_container_by_name.return_value = None
+        ansible_module = build_module()
+        tools = CvContainerTools(cv_connection=client, ansible_module=ansible_module)
+        with pytest.raises(SystemExit):
+            tools.create_container(container='Borders', parent='DC2')
+        assert client.api.get_container_by_name.call_count == 3
+        ansible_module.fail_json.assert_called_once_with(msg='Container Borders is created but not found on CV')
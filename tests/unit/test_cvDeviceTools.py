@@ -12,12 +12,14 @@ import pytest
 import logging
 from datetime import datetime
 import sys
+from cvprac.cvp_client_errors import CvpApiError
 sys.path.append("./")
 sys.path.append("../")
 sys.path.append("../../")
 from cvprac.cvp_client import CvpClient
 from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceInventory, CvDeviceTools, FIELD_CONTAINER_NAME
 from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_FQDN, FIELD_SYSMAC, FIELD_ID, FIELD_PARENT_NAME, FIELD_PARENT_ID
+from mock_cvp import build_module, build_cv_client
 # from ansible_collections.arista.cvp.plugins.module_utils.response import CvApiResult, CvManagerResult
 import config
 
@@ -95,12 +97,53 @@ CVP_DEVICES_SCHEMA_TEST = [
 
 CHECK_MODE = True
 
+CV_INVENTORY = [
+    {"fqdn": "DC1-LEAF1", "hostname": "DC1-LEAF1", "systemMacAddress": "50:00:00:00:00:01", "key": "50:00:00:00:00:01",
+     "containerName": "DC1_LEAFS", "parentContainerId": "container_2"},
+    {"fqdn": "DC1-LEAF2", "hostname": "DC1-LEAF2", "systemMacAddress": "50:00:00:00:00:02", "key": "50:00:00:00:00:02",
+     "containerName": "Undefined", "parentContainerId": "undefined_container"},
+    {"fqdn": "DC1-LEAF3", "hostname": "DC1-LEAF3", "systemMacAddress": "50:00:00:00:00:03", "key": "50:00:00:00:00:03",
+     "containerName": "Undefined", "parentContainerId": "undefined_container"},
+    {"fqdn": "DC1-SPINE1", "hostname": "DC1-SPINE1", "systemMacAddress": "50:00:00:00:00:04", "key": "50:00:00:00:00:04",
+     "containerName": "DC1_LEAFS", "parentContainerId": "container_2"}
+]
+
+CV_CONTAINERS = {"DC1_LEAFS": "container_2", "DC1_SPINES": "container_3"}
+
+CV_CONFIGLETS = {"LEAF": "configlet_1", "SPINE": "configlet_2", "OLD": "configlet_3"}
+
+CV_DEVICES_CONFIGLETS = {"50:00:00:00:00:01": ["LEAF", "OLD"], "50:00:00:00:00:04": ["SPINE"]}
+
 # Generic helpers
 
 def time_log():
     now = datetime.now()
     return now.strftime('%H:%M:%S.%f')
 
+
+def build_client(tasks: dict = None):
+    """
+    Mocked cvprac client serving CV_INVENTORY: every saveTopology creates a task for each device listed in tasks.
+    """
+    client = build_cv_client(tasks=tasks)
+    client.api.get_inventory.side_effect = lambda: [dict(device) for device in CV_INVENTORY]
+    client.api.get_configlets_and_mappers.return_value = {"data": {
+        "configlets": [{"name": name, "key": key} for name, key in CV_CONFIGLETS.items()],
+        # Mappers are not sorted by Cloudvision
+        "configletMappers": [{"objectId": mac, "configletId": CV_CONFIGLETS[name], "type": "netelement", "order": order}
+                             for mac, names in CV_DEVICES_CONFIGLETS.items() for order, name in reversed(list(enumerate(names)))]}}
+    client.api.get_container_by_name.side_effect = lambda name: {"name": name, "key": CV_CONTAINERS[name]} if name in CV_CONTAINERS else None
+    for function in ['move_device_to_container', 'apply_configlets_to_device', 'remove_configlets_from_device']:
+        getattr(client.api, function).return_value = {"data": {"status": "success", "taskIds": ["666"]}}
+    return client
+
+
+def user_device(fqdn: str, container: str, configlets: list, system_mac: str = None):
+    device = {"fqdn": fqdn, "parentContainerName": container, "configlets": configlets}
+    if system_mac is not None:
+        device["systemMacAddress"] = system_mac
+    return device
+
 # ---------------------------------------------------------------------------- #
 #   PARAMETRIZE Management
 # ---------------------------------------------------------------------------- #
@@ -366,3 +409,220 @@ class TestCvDeviceTools():
                     device.fqdn, device.system_mac))
             else:
                 pytest.skip('Skipped as device {} has no {} field'.format(device.fqdn, FIELD_SYSMAC))
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsDeploy():
+    def test_deploy_device_failure(self):
+        client = build_client(tasks={"50:00:00:00:00:02": "2"})
+
+        def deploy_device(app_name, device, container, configlets, create_task):
+            if device["fqdn"] == "DC1-LEAF3":
+                raise CvpApiError("Unable to apply configlets")
+
+        client.api.deploy_device.side_effect = deploy_device
+        ansible_module = build_module()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=ansible_module, max_workers=4)
+        with pytest.raises(SystemExit):
+            tools.deploy_device(user_inventory=DeviceInventory(data=[user_device("DC1-LEAF2", "DC1_LEAFS", ["LEAF"], "50:00:00:00:00:02"),
+                                                                     user_device("DC1-LEAF3", "DC1_LEAFS", ["LEAF"], "50:00:00:00:00:03")]))
+        # All devices are staged, but staged actions are never saved nor discarded once a device fails
+        assert sorted(call[1]["device"]["fqdn"] for call in client.api.deploy_device.call_args_list) == ["DC1-LEAF2", "DC1-LEAF3"]
+        client.api._save_topology_v2.assert_not_called()
+        client.get.assert_not_called()
+        ansible_module.fail_json.assert_called_once()
+        error_message = ansible_module.fail_json.call_args[1]["msg"]
+        assert "DC1-LEAF3 to container DC1_LEAFS: Unable to apply configlets" in error_message
+        assert "not saved for: DC1-LEAF2, DC1-LEAF3" in error_message
+        assert tools.get_container_current(device_mac="50:00:00:00:00:02")["name"] == "Undefined"
+
+    def test_deploy_device_parallel(self):
+        client = build_client(tasks={"50:00:00:00:00:02": "2", "50:00:00:00:00:03": "3"})
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module(), max_workers=4)
+        results = tools.deploy_device(user_inventory=DeviceInventory(data=[user_device("DC1-LEAF2", "DC1_LEAFS", ["LEAF"], "50:00:00:00:00:02"),
+                                                                           user_device("DC1-LEAF3", "DC1_LEAFS", ["LEAF"], "50:00:00:00:00:03")]))
+        assert [(result.name, result.success) for result in results] == [("DC1-LEAF2_deployed", True), ("DC1-LEAF3_deployed", True)]
+        assert [result.taskIds for result in results] == [["2"], ["3"]]
+        for call in client.api.deploy_device.call_args_list:
+            assert call[1]["create_task"] is False
+        client.api._save_topology_v2.assert_called_once_with([])
+        assert tools.get_container_current(device_mac="50:00:00:00:00:02")["name"] == "DC1_LEAFS"
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsConfiglets():
+    def test_get_device_configlets(self):
+        client = build_client()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module())
+        assert [configlet.name for configlet in tools.get_device_configlets(device_lookup="DC1-LEAF1")] == ["LEAF", "OLD"]
+        assert [configlet.name for configlet in tools.get_device_configlets(device_lookup="DC1-SPINE1")] == ["SPINE"]
+        assert tools.get_device_configlets(device_lookup="DC1-LEAF2") == []
+        client.api.get_configlets_and_mappers.assert_called_once()
+        client.api.get_configlets_by_device_id.assert_not_called()
+
+    def test_configlets_updated(self):
+        client = build_client()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module())
+        tools.detach_configlets(user_inventory=DeviceInventory(data=[user_device("DC1-LEAF1", "DC1_LEAFS", ["LEAF"], "50:00:00:00:00:01")]))
+        assert [configlet.name for configlet in tools.get_device_configlets(device_lookup="DC1-LEAF1")] == ["LEAF"]
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsSaveTopology():
+    def test_save_topology_tasks(self):
+        client = build_client(tasks={"50:00:00:00:00:01": "1", "50:00:00:00:00:04": "4"})
+        # Pending task created before this run is not reported
+        client.api.get_tasks_by_status.return_value.append({"workOrderId": "99", "netElementId": "50:00:00:00:00:01"})
+        client.api.move_device_to_container.return_value = None
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module(), batch_mode=True)
+        results = tools.move_device(user_inventory=DeviceInventory(data=[user_device("DC1-LEAF1", "DC1_SPINES", ["LEAF"], "50:00:00:00:00:01"),
+                                                                         user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"], "50:00:00:00:00:04")]))
+        assert [result.taskIds for result in results] == [[], []]
+        assert tools.save_topology() == {"DC1-LEAF1": ["1"], "DC1-SPINE1": ["4"]}
+        assert [result.taskIds for result in results] == [["1"], ["4"]]
+        client.api._save_topology_v2.assert_called_once_with([])
+        client.api.get_tasks_by_status.assert_called_once_with('Pending')
+
+    def test_save_topology_empty(self):
+        client = build_client()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module(), batch_mode=True)
+        assert tools.save_topology() == dict()
+        client.api._save_topology_v2.assert_not_called()
+        client.api.get_tasks_by_status.assert_not_called()
+
+    def test_save_topology_no_task(self):
+        client = build_client()
+        client.api.move_device_to_container.return_value = None
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module(), batch_mode=True)
+        tools.move_device(user_inventory=DeviceInventory(data=[user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"], "50:00:00:00:00:04")]))
+        assert tools.save_topology() == {"DC1-SPINE1": []}
+        client.api.get_tasks_by_status.assert_not_called()
+
+    @pytest.mark.parametrize('SAVE_RESPONSE', [{"data": {"status": "failure", "taskIds": []}}, None])
+    def test_save_topology_failure(self, SAVE_RESPONSE):
+        client = build_client()
+        client.api.move_device_to_container.return_value = None
+        client.api._save_topology_v2.return_value = SAVE_RESPONSE
+        ansible_module = build_module()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=ansible_module, batch_mode=True)
+        tools.move_device(user_inventory=DeviceInventory(data=[user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"], "50:00:00:00:00:04")]))
+        with pytest.raises(SystemExit):
+            tools.save_topology()
+        assert 'Error saving topology on Cloudvision' in ansible_module.fail_json.call_args[1]['msg']
+        client.api.get_tasks_by_status.assert_not_called()
+
+    def test_save_topology_unsupported_cvprac(self):
+        client = build_client()
+        client.api.move_device_to_container.return_value = None
+        del client.api._save_topology_v2
+        ansible_module = build_module()
+        tools = CvDeviceTools(cv_connection=client, ansible_module=ansible_module, batch_mode=True)
+        tools.move_device(user_inventory=DeviceInventory(data=[user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"], "50:00:00:00:00:04")]))
+        with pytest.raises(SystemExit):
+            tools.save_topology()
+        assert 'cannot save staged actions' in ansible_module.fail_json.call_args[1]['msg']
+
+
+@pytest.mark.generic
+class TestCvDeviceToolsManager():
+    WRITE_CALLS = ['deploy_device', 'move_device_to_container', 'apply_configlets_to_device', 'remove_configlets_from_device', '_save_topology_v2']
+
+    def user_inventory(self):
+        return DeviceInventory(data=[user_device("DC1-LEAF1", "DC1_LEAFS", ["LEAF", "SPINE"]),
+                                     user_device("DC1-LEAF2", "DC1_LEAFS", ["LEAF"]),
+                                     user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"])])
+
+    def assert_no_write(self, client):
+        for function in self.WRITE_CALLS:
+            getattr(client.api, function).assert_not_called()
+
+    @pytest.mark.parametrize('APPLY_MODE', ['loose', 'strict'])
+    def test_plan(self, APPLY_MODE):
+        client = build_client()
+        user_inventory = self.user_inventory()
+        devices_plan = CvDeviceTools(cv_connection=client, ansible_module=build_module()).plan(user_inventory=user_inventory, apply_mode=APPLY_MODE)
+        assert devices_plan == {
+            "DC1-LEAF1": {"systemMacAddress": "50:00:00:00:00:01", "container_current": "DC1_LEAFS", "container_target": "DC1_LEAFS",
+                          "deploy": False, "move": False, "configlets_attach": ["SPINE"],
+                          "configlets_detach": ["OLD"] if APPLY_MODE == 'strict' else []},
+            "DC1-LEAF2": {"systemMacAddress": "50:00:00:00:00:02", "container_current": "Undefined", "container_target": "DC1_LEAFS",
+                          "deploy": True, "move": False, "configlets_attach": [], "configlets_detach": []},
+            "DC1-SPINE1": {"systemMacAddress": "50:00:00:00:00:04", "container_current": "DC1_LEAFS", "container_target": "DC1_SPINES",
+                           "deploy": False, "move": True, "configlets_attach": [], "configlets_detach": []}
+        }
+        # Missing systemMacAddress are updated in user inventory
+        assert [device.system_mac for device in user_inventory.devices] == ["50:00:00:00:00:01", "50:00:00:00:00:02", "50:00:00:00:00:04"]
+        # Configlets of all devices are resolved from configlet mappers collected once
+        client.api.get_configlets_and_mappers.assert_called_once()
+        client.api.get_configlets_by_device_id.assert_not_called()
+        self.assert_no_write(client)
+
+    @pytest.mark.parametrize('USER_DEVICE', [user_device("DC1-LEAF1", "DC1_BORDERS", ["LEAF"]),
+                                             user_device("DC1-LEAF1", "DC1_LEAFS", ["LEAF", "BORDER"]),
+                                             user_device("DC1-BORDER1", "DC1_LEAFS", ["LEAF"])])
+    def test_manager_fail_before_write(self, USER_DEVICE):
+        client = build_client()
+        ansible_module = build_module()
+        user_inventory = DeviceInventory(data=[user_device("DC1-SPINE1", "DC1_SPINES", ["SPINE"]), USER_DEVICE])
+        with pytest.raises(SystemExit):
+            CvDeviceTools(cv_connection=client, ansible_module=ansible_module).manager(user_inventory=user_inventory, apply_mode='strict')
+        ansible_module.fail_json.assert_called_once()
+        self.assert_no_write(client)
+
+    def test_manager(self):
+        client = build_client(tasks={"50:00:00:00:00:02": "2"})
+        tools = CvDeviceTools(cv_connection=client, ansible_module=build_module())
+        result = tools.manager(user_inventory=self.user_inventory(), apply_mode='strict')
+        assert result['devices_plan'] == CvDeviceTools(cv_connection=build_client(), ansible_module=build_module()).plan(
+            user_inventory=self.user_inventory(), apply_mode='strict')
+        assert result['devices_deployed']['devices_deployed_list'] == ['DC1-LEAF2_deployed']
+        assert result['devices_deployed']['taskIds'] == ['2']
+        assert [name.split('_')[0] for name in result['devices_moved']['devices_moved_list']] == ['DC1-SPINE1']
+        assert result['configlets_attached']['configlets_attached_list'] == ['DC1-LEAF1_configlet_attached']
+        assert result['configlets_detached']['configlets_detached_list'] == ['DC1-LEAF1_configlet_removed - OLD']
+        assert result['changed'] is True
+        assert 'devices_taskIds' not in result
+        client.api.deploy_device.assert_called_once()
+        assert client.api.deploy_device.call_args[1]['container'] == 'DC1_LEAFS'
+        # Only deployment is staged, other steps save topology for every device
+        client.api._save_topology_v2.assert_called_once_with([])
+        assert client.api.move_device_to_container.call_args[1]['container']['name'] == 'DC1_SPINES'
+        assert client.api.move_device_to_container.call_args[1]['create_task'] is True
+        assert [configlet['name'] for configlet in client.api.apply_configlets_to_device.call_args[1]['new_configlets']] == ['SPINE']
+        assert [configlet['name'] for configlet in client.api.remove_configlets_from_device.call_args[1]['del_configlets']] == ['OLD']
+
+    def test_manager_strict_deployed(self):
+        client = build_client(tasks={"50:00:00:00:00:02": "2"})
+        deployed_configlets = dict(CV_DEVICES_CONFIGLETS)
+        # Deployment keeps configlet proposed by Cloudvision for DC1-LEAF2
+        deployed_configlets["50:00:00:00:00:02"] = ["LEAF", "OLD"]
+        client.api.get_configlets_and_mappers.side_effect = [
+            client.api.get_configlets_and_mappers.return_value,
+            {"data": {"configlets": [{"name": name, "key": key} for name, key in CV_CONFIGLETS.items()],
+                      "configletMappers": [{"objectId": mac, "configletId": CV_CONFIGLETS[name], "type": "netelement", "order": order}
+                                           for mac, names in deployed_configlets.items() for order, name in enumerate(names)]}}]
+        result = CvDeviceTools(cv_connection=client, ansible_module=build_module()).manager(user_inventory=self.user_inventory(), apply_mode='strict')
+        assert result['devices_plan']['DC1-LEAF2']['configlets_detach'] == ['OLD']
+        assert sorted(result['configlets_detached']['configlets_detached_list']) == ['DC1-LEAF1_configlet_removed - OLD',
+                                                                                     'DC1-LEAF2_configlet_removed - OLD']
+        # Configlets index is collected once for plan and once after deployment
+        assert client.api.get_configlets_and_mappers.call_count == 2
+        client.api.get_configlets_by_device_id.assert_not_called()
+
+    def test_manager_loose(self):
+        client = build_client()
+        result = CvDeviceTools(cv_connection=client, ansible_module=build_module()).manager(user_inventory=self.user_inventory())
+        assert result['configlets_detached']['configlets_detached_list'] == []
+        client.api.remove_configlets_from_device.assert_not_called()
+
+    def test_manager_check_mode(self):
+        client = build_client()
+        result = CvDeviceTools(cv_connection=client, ansible_module=build_module(), check_mode=True).manager(user_inventory=self.user_inventory(),
+                                                                                                           apply_mode='strict')
+        assert result['configlets_attached']['configlets_attached_list'] == ['DC1-LEAF1_configlet_attached']
+        assert result['configlets_attached']['taskIds'] == ['unsupported_in_check_mode']
+        assert result['configlets_detached']['configlets_detached_list'] == ['DC1-LEAF1_configlet_removed - OLD']
+        assert result['configlets_detached']['changed'] is True
+        assert result['devices_moved']['changed'] is True
+        assert result['devices_deployed']['changed'] is True
+        self.assert_no_write(client)
@@ -0,0 +1,179 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import time
+import logging
+import threading
+import pytest
+from unittest import mock
+from cvprac.cvp_client_errors import CvpApiError
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.task_tools import CvTaskWatcher, CvTaskTools, FIELD_TASK_ID, FIELD_TASK_STATUS
+from mock_cvp import build_module, build_cv_client
+
+
+# Generic helpers
+def task(task_id, status):
+    return {FIELD_TASK_ID: str(task_id), FIELD_TASK_STATUS: status}
+
+
+def build_client(polls_before_completion: dict, listed: list = None):
+    """
+    Mocked cvprac client: task listed in polls_before_completion is Pending for
+    this number of polls and then Completed. Extra tasks in listed are always Pending.
+    """
+    client = build_cv_client()
+    client.polls = 0
+
+    def get_tasks_by_status(status):
+        if status == 'Pending':
+            client.polls += 1
+            return [task(task_id, 'Pending') for task_id, count in polls_before_completion.items() if client.polls <= count] + (listed or [])
+        return list()
+
+    client.api.get_tasks_by_status.side_effect = get_tasks_by_status
+    client.api.get_task_by_id.side_effect = lambda task_id: task(task_id, 'Completed') if task_id in polls_before_completion else None
+    return client
+
+
+def build_tasker_client(pending: list, failing: list = None):
+    """
+    Mocked cvprac client listing pending tasks. Execution of tasks in failing raises CvpApiError.
+    """
+    client = build_cv_client()
+    client.api.get_tasks_by_status.return_value = [task(task_id, 'Pending') for task_id in pending]
+    client.running = 0
+    client.max_running = 0
+    lock = threading.Lock()
+
+    def execute_task(task_id):
+        with lock:
+            client.running += 1
+            client.max_running = max(client.max_running, client.running)
+        time.sleep(0.02)
+        with lock:
+            client.running -= 1
+        if task_id in (failing or []):
+            raise CvpApiError('Task {} cannot be executed'.format(task_id))
+        return {'data': 'success'}
+
+    client.api.execute_task.side_effect = execute_task
+    return client
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+
+@pytest.mark.generic
+class TestCvTaskWatcher():
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_backoff_bounds(self, sleep):
+        client = build_client(polls_before_completion={'666': 6})
+        watcher = CvTaskWatcher(cv_connection=client, initial_delay=1, max_delay=10, backoff=2)
+        result = watcher.wait(task_ids=['666'], timeout=3600)
+        assert result['666'][FIELD_TASK_STATUS] == 'Completed'
+        delays = [call[0][0] for call in sleep.call_args_list]
+        assert len(delays) == 6
+        for delay, expected in zip(delays, [1, 2, 4, 8, 10, 10]):
+            assert expected / 2 <= delay <= expected
+        logging.info('Delays between polls: {}'.format(delays))
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_max_delay(self, sleep):
+        client = build_client(polls_before_completion={'666': 10})
+        CvTaskWatcher(cv_connection=client, initial_delay=1, max_delay=3, backoff=4).wait(task_ids=['666'], timeout=3600)
+        assert max(call[0][0] for call in sleep.call_args_list) <= 3
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_local_filtering(self, sleep):
+        client = build_client(polls_before_completion={'666': 2, '667': 0},
+                              listed=[task('999', 'Pending'), {FIELD_TASK_ID: '667', FIELD_TASK_STATUS: 'Completed'}])
+        result = CvTaskWatcher(cv_connection=client).wait(task_ids=['666', 667], timeout=3600)
+        assert sorted(result.keys(), key=str) == sorted(['666', 667], key=str)
+        assert result[667][FIELD_TASK_STATUS] == 'Completed'
+        assert '999' not in result
+        # One bulk query per active status and per poll
+        assert client.api.get_tasks_by_status.call_count == 3 * 2
+        # Task listed with a wrong status and task which left active states are fetched individually
+        assert [call[0][0] for call in client.api.get_task_by_id.call_args_list] == ['667', '666']
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_get_task_by_id_fallback(self, sleep):
+        client = build_client(polls_before_completion={'666': 0})
+        result = CvTaskWatcher(cv_connection=client).wait(task_ids=['666', '668'], timeout=3600)
+        assert result['666'][FIELD_TASK_STATUS] == 'Completed'
+        # Unknown task is not watched anymore
+        assert result['668'] is None
+        sleep.assert_not_called()
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_timeout(self, sleep):
+        client = build_client(polls_before_completion={'666': 100})
+        result = CvTaskWatcher(cv_connection=client).wait(task_ids=['666'], timeout=0)
+        assert result['666'][FIELD_TASK_STATUS] == 'Pending'
+        assert client.polls == 1
+        sleep.assert_not_called()
+
+
+@pytest.mark.generic
+class TestCvTaskToolsTasker():
+    def test_execute_concurrently(self):
+        client = build_tasker_client(pending=['1', '2', '3', '4'])
+        tasker = CvTaskTools(cv_connection=client, ansible_module=build_module(), max_workers=4)
+        result = tasker.tasker(taskIds_list=['1', '2', '3', '4', '5']).content
+        assert result['changed'] is True
+        assert result['actions_manager']['actions_manager_list'] == ['task_1', 'task_2', 'task_3', 'task_4']
+        assert sorted(call[0][0] for call in client.api.add_note_to_task.call_args_list) == ['1', '2', '3', '4']
+        assert client.max_running > 1
+        # Pending tasks are collected once, whatever the number of tasks
+        assert client.api.get_tasks_by_status.call_count == 1
+        logging.info('{} tasks executed in parallel'.format(client.max_running))
+
+    def test_cancel(self):
+        client = build_tasker_client(pending=['1'])
+        CvTaskTools(cv_connection=client, ansible_module=build_module()).tasker(taskIds_list=['1'], state='cancelled')
+        client.api.cancel_task.assert_called_once_with('1')
+        client.api.execute_task.assert_not_called()
+
+    def test_check_mode(self):
+        client = build_tasker_client(pending=['1'])
+        result = CvTaskTools(cv_connection=client, ansible_module=build_module(check_mode=True)).tasker(taskIds_list=['1'], wait=60).content
+        assert result['changed'] is False
+        client.api.add_note_to_task.assert_not_called()
+        client.api.execute_task.assert_not_called()
+
+    def test_worker_failure(self):
+        client = build_tasker_client(pending=['1', '2', '3'], failing=['2'])
+        ansible_module = build_module()
+        with pytest.raises(SystemExit):
+            CvTaskTools(cv_connection=client, ansible_module=ansible_module, max_workers=4).tasker(taskIds_list=['1', '2', '3'])
+        # Other workers are not stopped by the failure
+        assert sorted(call[0][0] for call in client.api.execute_task.call_args_list) == ['1', '2', '3']
+        ansible_module.fail_json.assert_called_once_with(msg='Error actioning task 2: Task 2 cannot be executed')
+
+    @mock.patch('ansible_collections.arista.cvp.plugins.module_utils.task_tools.time.sleep')
+    def test_wait(self, sleep):
+        client = build_tasker_client(pending=['1', '2'])
+        client.api.get_task_by_id.side_effect = lambda task_id: task(task_id, 'Completed' if task_id == '1' else 'Failed')
+        ansible_module = build_module()
+        tasker = CvTaskTools(cv_connection=client, ansible_module=ansible_module)
+        # Tasks are not listed as Pending anymore once executed
+        client.api.execute_task.side_effect = lambda task_id: setattr(client.api.get_tasks_by_status, 'return_value', list())
+        result = tasker.tasker(taskIds_list=['1', '2'], wait=60).content
+        assert result['tasks_completed']['tasks_completed_list'] == ['task_1']
+        ansible_module.warn.assert_called_once_with('Task 2 is Failed')
+
+    def test_no_wait(self):
+        client = build_tasker_client(pending=['1'])
+        result = CvTaskTools(cv_connection=client, ansible_module=build_module()).tasker(taskIds_list=['1']).content
+        assert 'tasks_completed' not in result
+        client.api.get_task_by_id.assert_not_called()
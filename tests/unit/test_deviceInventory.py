@@ -14,8 +14,9 @@ import logging
 sys.path.append("./")
 sys.path.append("../")
 sys.path.append("../../")
-from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceElement, DeviceInventory   # noqa # pylint: disable=unused-import
-from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_FQDN, FIELD_SERIAL, FIELD_SYSMAC   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import DeviceElement, DeviceInventory, CvInventorySnapshot, CvConfigletIndex   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_FQDN, FIELD_SERIAL, FIELD_SYSMAC, FIELD_HOSTNAME   # noqa # pylint: disable=unused-import
+from ansible_collections.arista.cvp.plugins.module_utils.device_tools import FIELD_CONTAINER_NAME, FIELD_PARENT_ID, FIELD_ID, FIELD_NAME   # noqa # pylint: disable=unused-import
 
 
 CVP_INVENTORY_VALID = [
@@ -65,6 +66,41 @@ CVP_INVENTORY_INVALID = [
     }]
 ]
 
+CV_INVENTORY = [
+    {
+        "fqdn": "DC1-SPINE1.eve.emea.lab",
+        "hostname": "DC1-SPINE1",
+        "serialNumber": "ddddddd",
+        "systemMacAddress": "ccccccc",
+        "key": "ccccccc",
+        "containerName": "DC1_SPINES",
+        "parentContainerId": "container_1"
+    },
+    {
+        "fqdn": "DC1-LEAF1A.eve.emea.lab",
+        "hostname": "DC1-LEAF1A",
+        "serialNumber": "eeeeeee",
+        "systemMacAddress": "fffffff",
+        "key": "fffffff",
+        "containerName": "Undefined",
+        "parentContainerId": "undefined_container"
+    }
+]
+
+CV_CONFIGLETS_MAPPERS = {
+    "configlets": [
+        {"key": "configlet_1", "name": "01TRAINING-01"},
+        {"key": "configlet_2", "name": "AVD_DC1-SPINE1"},
+        {"key": "configlet_3", "name": "AVD_DC1-LEAF1A"}
+    ],
+    "configletMappers": [
+        {"objectId": "container_1", "configletId": "configlet_1", "type": "container"},
+        {"objectId": "ccccccc", "configletId": "configlet_2", "type": "netelement"},
+        {"objectId": "fffffff", "configletId": "configlet_3", "type": "netelement"},
+        {"objectId": "fffffff", "configletId": "configlet_unknown", "type": "netelement"}
+    ]
+}
+
 # ---------------------------------------------------------------------------- #
 #   PARAMETRIZE Management
 # ---------------------------------------------------------------------------- #
@@ -177,3 +213,86 @@ class TestDeviceInventory():
                 device_string=dev_data[FIELD_FQDN],
                 search_method='test')
             assert dev_data[FIELD_FQDN] == dev_inventory.fqdn
+
+
+@pytest.mark.generic
+class TestCvInventorySnapshot():
+
+    @pytest.mark.parametrize('search_by', [FIELD_FQDN, FIELD_HOSTNAME, FIELD_SYSMAC, FIELD_SERIAL])
+    def test_get_by_field(self, search_by):
+        snapshot = CvInventorySnapshot(data=CV_INVENTORY)
+        for cv_device in CV_INVENTORY:
+            assert snapshot.get(search_value=cv_device[search_by], search_by=search_by) == cv_device
+        logging.info('All devices found using {}'.format(search_by))
+
+    def test_get_unknown_device(self):
+        snapshot = CvInventorySnapshot(data=CV_INVENTORY)
+        assert snapshot.get(search_value='unknown') is None
+        assert snapshot.get(search_value=CV_INVENTORY[0][FIELD_FQDN], search_by='test') is None
+
+    def test_empty_inventory(self):
+        snapshot = CvInventorySnapshot(data=None)
+        assert snapshot.devices == []
+        assert snapshot.get(search_value=CV_INVENTORY[0][FIELD_FQDN]) is None
+
+    def test_update_container(self):
+        snapshot = CvInventorySnapshot(data=[dict(device) for device in CV_INVENTORY])
+        snapshot.update_container(device_mac='fffffff', container_name='DC1_LEAFS', container_id='container_2')
+        device = snapshot.get(search_value='DC1-LEAF1A.eve.emea.lab')
+        assert device[FIELD_CONTAINER_NAME] == 'DC1_LEAFS'
+        assert device[FIELD_PARENT_ID] == 'container_2'
+        assert snapshot.get(search_value='fffffff', search_by=FIELD_SYSMAC) is device
+
+
+@pytest.mark.generic
+class TestCvConfigletIndex():
+
+    @pytest.mark.parametrize('search_by', [FIELD_NAME, FIELD_ID])
+    def test_get_by_field(self, search_by):
+        index = CvConfigletIndex(data=CV_CONFIGLETS_MAPPERS)
+        for configlet in CV_CONFIGLETS_MAPPERS['configlets']:
+            assert index.get(search_value=configlet[search_by], search_by=search_by) == configlet
+        logging.info('All configlets found using {}'.format(search_by))
+
+    def test_get_unknown_configlet(self):
+        index = CvConfigletIndex(data=CV_CONFIGLETS_MAPPERS)
+        assert index.get(search_value='unknown') is None
+        assert index.get(search_value='01TRAINING-01', search_by='test') is None
+
+    def test_empty_index(self):
+        index = CvConfigletIndex(data=None)
+        assert index.configlets == []
+        assert index.get(search_value='01TRAINING-01') is None
+        assert index.get_device_configlets(device_id='ccccccc') == []
+
+    def test_mappers(self):
+        index = CvConfigletIndex(data=CV_CONFIGLETS_MAPPERS)
+        assert [x[FIELD_NAME] for x in index.get_device_configlets(device_id='ccccccc')] == ['AVD_DC1-SPINE1']
+        assert [x[FIELD_NAME] for x in index.get_device_configlets(device_id='fffffff')] == ['AVD_DC1-LEAF1A']
+        assert [x[FIELD_NAME] for x in index.get_container_configlets(container_id='container_1')] == ['01TRAINING-01']
+        assert index.get_container_configlets(container_id='container_2') == []
+
+    def test_mappers_order(self):
+        data = dict(CV_CONFIGLETS_MAPPERS, configletMappers=[
+            {"objectId": "ccccccc", "configletId": "configlet_3", "type": "netelement", "order": 2},
+            {"objectId": "ccccccc", "configletId": "configlet_2", "type": "netelement", "order": 1}])
+        index = CvConfigletIndex(data=data)
+        assert [x[FIELD_NAME] for x in index.get_device_configlets(device_id='ccccccc')] == ['AVD_DC1-SPINE1', 'AVD_DC1-LEAF1A']
+
+    def test_update_device_configlets(self):
+        index = CvConfigletIndex(data=CV_CONFIGLETS_MAPPERS)
+        configlet = index.get(search_value='01TRAINING-01')
+        index.update_device_configlets(device_id='ccccccc', configlets=[configlet])
+        assert [x[FIELD_NAME] for x in index.get_device_configlets(device_id='ccccccc')] == ['AVD_DC1-SPINE1', '01TRAINING-01']
+        index.update_device_configlets(device_id='ccccccc', configlets=[configlet])
+        assert len(index.get_device_configlets(device_id='ccccccc')) == 2
+        index.update_device_configlets(device_id='ccccccc', configlets=[configlet], remove=True)
+        assert [x[FIELD_NAME] for x in index.get_device_configlets(device_id='ccccccc')] == ['AVD_DC1-SPINE1']
+
+    def test_update_container_configlets(self):
+        index = CvConfigletIndex(data=CV_CONFIGLETS_MAPPERS)
+        index.update_container_configlets(container_id='container_1', configlets=[{'key': 'configlet_2', 'name': 'AVD_DC1-SPINE1'}])
+        assert [x[FIELD_NAME] for x in index.get_container_configlets(container_id='container_1')] == ['01TRAINING-01', 'AVD_DC1-SPINE1']
+        assert index.get_container_configlets(container_id='container_1')[1] is index.get(search_value='configlet_2', search_by=FIELD_ID)
+        index.update_container_configlets(container_id='container_1', configlets=[{'key': 'configlet_1', 'name': '01TRAINING-01'}], remove=True)
+        assert [x[FIELD_NAME] for x in index.get_container_configlets(container_id='container_1')] == ['AVD_DC1-SPINE1']
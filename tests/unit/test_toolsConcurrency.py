@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import time
+import random
+import threading
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.tools_concurrency import run_concurrently, ThreadSafeModule, WorkerFailure
+
+
+# ---------------------------------------------------------------------------- #
+#   PARAMETRIZE Management
+# ---------------------------------------------------------------------------- #
+
+def get_max_workers():
+    return [None, 0, 1, 2, 4, 16]
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestRunConcurrently():
+    @pytest.mark.parametrize('max_workers', get_max_workers())
+    def test_results_ordering(self, max_workers):
+        def worker(item):
+            time.sleep(random.random() / 100)
+            return item * 2
+        items = list(range(32))
+        results = run_concurrently(function=worker, items=items, max_workers=max_workers)
+        assert results == [item * 2 for item in items]
+        logging.info('Results are ordered with {} workers: {}'.format(max_workers, results))
+
+    @pytest.mark.parametrize('max_workers', get_max_workers())
+    def test_empty_list(self, max_workers):
+        assert run_concurrently(function=str, items=[], max_workers=max_workers) == []
+
+    def test_serial_execution(self):
+        threads = set()
+        run_concurrently(function=lambda item: threads.add(threading.current_thread().name), items=range(8), max_workers=1)
+        assert threads == {threading.current_thread().name}
+        logging.info('Items processed serially in thread {}'.format(threads))
+
+    def test_workers_bound(self):
+        lock = threading.Lock()
+        counters = {'running': 0, 'max': 0}
+
+        def worker(item):
+            with lock:
+                counters['running'] += 1
+                counters['max'] = max(counters['max'], counters['running'])
+            time.sleep(0.01)
+            with lock:
+                counters['running'] -= 1
+            return item
+        run_concurrently(function=worker, items=range(20), max_workers=3)
+        assert 1 < counters['max'] <= 3
+        logging.info('Max number of parallel workers is {}'.format(counters['max']))
+
+    def test_exception_is_raised(self):
+        def worker(item):
+            if item == 3:
+                raise ValueError('item 3')
+            return item
+        with pytest.raises(ValueError):
+            run_concurrently(function=worker, items=range(6), max_workers=2)
+
+
+class FakeAnsibleModule():
+    check_mode = True
+
+    def fail_json(self, **kwargs):
+        raise SystemExit(kwargs)
+
+
+@pytest.mark.generic
+class TestThreadSafeModule():
+    def test_attributes_proxy(self):
+        assert ThreadSafeModule(FakeAnsibleModule()).check_mode is True
+
+    def test_fail_json_raises(self):
+        proxy = ThreadSafeModule(FakeAnsibleModule())
+
+        def worker(item):
+            if item == 3:
+                proxy.fail_json(msg='item 3')
+            return item
+        with pytest.raises(WorkerFailure) as failure:
+            run_concurrently(function=worker, items=range(6), max_workers=2)
+        assert failure.value.fail_args == {'msg': 'item 3'}
+        logging.info('Worker failure is reported with {}'.format(failure.value.fail_args))
@@ -0,0 +1,196 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import os
+import json
+import time
+import logging
+import pytest
+import requests
+from unittest import mock
+from cvprac.cvp_client_errors import CvpApiError, CvpLoginError
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import session_cache_key, session_cache_get, session_cache_update, session_cache_delete
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import CvpPooledClient, cv_restore_session, cv_save_topology
+from ansible_collections.arista.cvp.plugins.module_utils.tools_cv import cv_facts_store, cv_facts_invalidate_on_failure
+from mock_cvp import build_module, build_cv_client
+
+
+SESSION = {'session_id': 'session-1234', 'cookies': {'session_id': 'session-1234'}}
+
+# ---------------------------------------------------------------------------- #
+#   FIXTURES Management
+# ---------------------------------------------------------------------------- #
+
+@pytest.fixture()
+def cache_file(tmp_path):
+    return str(tmp_path / 'arista.cvp.sessions.json')
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestSessionCache():
+    def test_key_per_user(self):
+        assert session_cache_key('cvp', 443, 'ansible') == session_cache_key('cvp', 443, 'ansible')
+        assert session_cache_key('cvp', 443, 'ansible') != session_cache_key('cvp', 443, 'admin')
+        assert session_cache_key('cvp', 443, 'ansible') != session_cache_key('cvp2', 443, 'ansible')
+
+    def test_missing_cache(self, cache_file):
+        assert session_cache_get(cache_file=cache_file, key='key') is None
+        assert os.path.exists(cache_file) is False
+
+    def test_save_and_get(self, cache_file):
+        session = dict(SESSION, expiry=time.time() + 60)
+        session_cache_update(cache_file=cache_file, key='key', session=session)
+        assert session_cache_get(cache_file=cache_file, key='key') == session
+        assert session_cache_get(cache_file=cache_file, key='other') is None
+        assert oct(os.stat(cache_file).st_mode & 0o777) == oct(0o600)
+        logging.info('Session cache content: {}'.format(open(cache_file).read()))
+
+    def test_expired_session(self, cache_file):
+        session_cache_update(cache_file=cache_file, key='expired', session=dict(SESSION, expiry=time.time() - 1))
+        session_cache_update(cache_file=cache_file, key='valid', session=dict(SESSION, expiry=time.time() + 60))
+        assert session_cache_get(cache_file=cache_file, key='expired') is None
+        with open(cache_file) as cache:
+            assert list(json.load(cache).keys()) == ['valid']
+
+    def test_delete_session(self, cache_file):
+        session_cache_update(cache_file=cache_file, key='key', session=dict(SESSION, expiry=time.time() + 60))
+        session_cache_delete(cache_file=cache_file, key='key')
+        assert session_cache_get(cache_file=cache_file, key='key') is None
+
+    def test_corrupted_cache(self, cache_file):
+        with open(cache_file, 'w') as cache:
+            cache.write('not a json content')
+        assert session_cache_get(cache_file=cache_file, key='key') is None
+
+
+@pytest.mark.generic
+class TestRestoreSession():
+    CONNECT_ARGS = {'nodes': ['cvp'], 'username': 'ansible', 'password': 'ansible'}
+
+    def build_client(self):
+        client = build_cv_client()
+        client.headers = {}
+        def connect(**kwargs):
+            client.api_token = kwargs.get('api_token')
+            client.headers['Authorization'] = 'Bearer {}'.format(kwargs.get('api_token'))
+        client.connect.side_effect = connect
+        return client
+
+    def test_restore(self):
+        client = self.build_client()
+        assert cv_restore_session(client=client, session=SESSION, connect_args=self.CONNECT_ARGS)
+        client.connect.assert_called_once_with(api_token='session-1234', **self.CONNECT_ARGS)
+        assert client.api_token is None
+        assert client.headers == {'APP_SESSION_ID': 'session-1234'}
+        assert client.cookies['session_id'] == 'session-1234'
+
+    def test_rejected(self):
+        client = self.build_client()
+        client.api.get_cvp_info.side_effect = CvpApiError('Unauthorized')
+        assert cv_restore_session(client=client, session=SESSION, connect_args=self.CONNECT_ARGS) is False
+
+    def test_login_error(self):
+        client = self.build_client()
+        client.connect.side_effect = CvpLoginError('Unauthorized')
+        assert cv_restore_session(client=client, session=SESSION, connect_args=self.CONNECT_ARGS) is False
+
+
+@pytest.mark.generic
+class TestCvpPooledClient():
+    def test_session_tuned(self):
+        client = CvpPooledClient(pool_connections=2, pool_maxsize=16, pool_block=True)
+        assert client.session is None
+        client.session = requests.Session()
+        adapter = client.session.get_adapter('https://cv.example.com/web')
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 16
+        assert adapter._pool_block is True
+        assert client.session.headers['Connection'] == 'keep-alive'
+
+    def test_session_reset(self):
+        client = CvpPooledClient()
+        client.session = None
+        assert client.session is None
+
+
+@pytest.mark.generic
+class TestSaveTopology():
+    def test_save(self):
+        client = build_cv_client(tasks={'50:00:00:00:00:01': '1'})
+        assert cv_save_topology(client)['data']['taskIds'] == ['1']
+        client.api._save_topology_v2.assert_called_once_with([])
+
+    def test_unsupported_cvprac(self):
+        client = build_cv_client()
+        client.api = mock.MagicMock(spec=[])
+        with pytest.raises(CvpApiError):
+            cv_save_topology(client)
+
+
+@pytest.mark.generic
+class TestFactsInvalidation():
+    TOOLS_CV = 'ansible_collections.arista.cvp.plugins.module_utils.tools_cv'
+
+    @mock.patch(TOOLS_CV + '.cv_facts_invalidate')
+    @mock.patch(TOOLS_CV + '.FACTS_STORE_ENABLED', True)
+    def test_invalidate_on_failure(self, invalidate):
+        module = build_module()
+        fail_json = module.fail_json
+        cv_facts_invalidate_on_failure(module)
+        with pytest.raises(SystemExit):
+            module.fail_json(msg='Partial change')
+        invalidate.assert_called_once_with(module)
+        fail_json.assert_called_once_with(msg='Partial change')
+
+    @mock.patch(TOOLS_CV + '.cv_facts_invalidate')
+    @mock.patch(TOOLS_CV + '.FACTS_STORE_ENABLED', True)
+    def test_invalidate_error(self, invalidate):
+        invalidate.side_effect = OSError('Permission denied')
+        module = build_module()
+        fail_json = module.fail_json
+        cv_facts_invalidate_on_failure(module)
+        with pytest.raises(SystemExit):
+            module.fail_json(msg='Partial change')
+        fail_json.assert_called_once_with(msg='Partial change')
+
+    @mock.patch(TOOLS_CV + '.cv_facts_invalidate')
+    @mock.patch(TOOLS_CV + '.FACTS_STORE_ENABLED', True)
+    def test_check_mode(self, invalidate):
+        module = build_module(check_mode=True)
+        cv_facts_invalidate_on_failure(module)
+        with pytest.raises(SystemExit):
+            module.fail_json(msg='Error')
+        invalidate.assert_not_called()
+
+    @mock.patch(TOOLS_CV + '.FACTS_STORE_ENABLED', False)
+    def test_store_disabled(self):
+        module = build_module()
+        fail_json = module.fail_json
+        cv_facts_invalidate_on_failure(module)
+        assert module.fail_json is fail_json
+        assert cv_facts_store(module) is None
+
+    @mock.patch(TOOLS_CV + '.Connection')
+    @mock.patch(TOOLS_CV + '.FACTS_STORE_ENABLED', True)
+    def test_store_per_user(self, connection, tmp_path):
+        module = build_module()
+        module._socket_path = str(tmp_path / 'socket')
+        users = iter(['cvpadmin', 'operator'])
+        connection.return_value.get_option.side_effect = lambda option: {'host': 'cv.example.com', 'port': 443}.get(option) or next(users)
+        admin_store = cv_facts_store(module)
+        operator_store = cv_facts_store(module)
+        admin_store.set(facts={'devices': []}, params={'facts': ['all'], 'gather_subset': ['default']})
+        assert admin_store.get() is not None
+        assert operator_store.get() is None
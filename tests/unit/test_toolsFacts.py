@@ -0,0 +1,281 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import gzip
+import json
+import time
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsIndex, FIELD_KEY, FIELD_SYSMAC, FIELD_CONTAINER_KEY
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsCache, CvFactsWriter, facts_marker, MARKER_IMAGES, MARKER_FIELDS
+from ansible_collections.arista.cvp.plugins.module_utils.tools_facts import CvFactsSelector, CvFactsStore
+
+
+CV_FACTS = {
+    "devices": [
+        {"hostname": "veos01", "key": "50:8d:00:e3:78:aa", "systemMacAddress": "50:8d:00:e3:78:aa", "containerName": "DC1_VEOS"},
+        {"hostname": "veos02", "key": "50:8d:00:e3:78:bb", "systemMacAddress": "50:8d:00:e3:78:bb", "containerName": "Undefined"}
+    ],
+    "containers": [
+        {"Name": "Tenant", "Key": "root", "name": "Tenant", "key": "root"},
+        {"Name": "DC1_VEOS", "Key": "container_1", "name": "DC1_VEOS", "key": "container_1"}
+    ],
+    "configlets": [
+        {"name": "veos01-basic-configuration", "key": "configlet_1"},
+        {"name": "SYS_TelemetryBuilderV2", "key": "configlet_2"},
+        {"name": "veos01-basic-configuration", "key": "configlet_3"}
+    ]
+}
+
+CV_HOST = 'https://cv.example.com:443/web'
+CV_VERSION = '2021.1.0'
+DEVICE_DETAILS = {'config': 'hostname veos01', 'imageBundle': 'EOS-4.25.0F'}
+DEVICE_CACHED_DETAILS = {'imageBundle': 'EOS-4.25.0F'}
+
+# Generic helpers
+def build_cache(cache_file, images_marker=1, host=CV_HOST, version=CV_VERSION):
+    cache = CvFactsCache(cache_file=cache_file, host=host, version=version)
+    cache.set_marker(name=MARKER_IMAGES, data=images_marker)
+    return cache
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestCvFactsIndex():
+    @pytest.mark.parametrize('device', CV_FACTS['devices'])
+    def test_get_device(self, device):
+        index = CvFactsIndex(facts=CV_FACTS)
+        assert index.get_device(search_value=device['hostname']) is device
+        assert index.get_device(search_value=device['key'], search_by=FIELD_KEY) is device
+        assert index.get_device(search_value=device['systemMacAddress'], search_by=FIELD_SYSMAC) is device
+        logging.info('Device {} found in facts index'.format(device['hostname']))
+
+    def test_get_container(self):
+        index = CvFactsIndex(facts=CV_FACTS)
+        assert index.get_container(search_value='DC1_VEOS')['Key'] == 'container_1'
+        assert index.get_container(search_value='root', search_by=FIELD_CONTAINER_KEY)['Name'] == 'Tenant'
+        assert index.get_container(search_value='DC2_VEOS') is None
+
+    def test_get_configlet_first_entry(self):
+        index = CvFactsIndex(facts=CV_FACTS)
+        assert index.get_configlet(search_value='veos01-basic-configuration')['key'] == 'configlet_1'
+        assert index.get_configlet(search_value='configlet_3', search_by=FIELD_KEY)['key'] == 'configlet_3'
+
+    def test_unknown_search_method(self):
+        index = CvFactsIndex(facts=CV_FACTS)
+        assert index.get_device(search_value='veos01', search_by='fqdn') is None
+
+    def test_empty_facts(self):
+        index = CvFactsIndex(facts=None)
+        assert index.get_device(search_value='veos01') is None
+        assert CvFactsIndex(facts=dict()).get_configlet(search_value='veos01-basic-configuration') is None
+
+
+@pytest.mark.generic
+class TestCvFactsCache():
+    def save_device(self, cache_file):
+        device = CV_FACTS['devices'][0]
+        cache = build_cache(cache_file=cache_file)
+        cache.set(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices']), details=DEVICE_DETAILS)
+        cache.save()
+        return device
+
+    def test_missing_file(self, tmp_path):
+        cache = build_cache(cache_file=str(tmp_path / 'facts.json'))
+        assert cache.get(facts_type='devices', key='50:8d:00:e3:78:aa', marker='marker') == {}
+
+    def test_unchanged(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file)
+        # Running configuration is never cached
+        assert cache.get(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices'])) == DEVICE_CACHED_DETAILS
+        assert cache.hits == 1
+
+    def test_object_changed(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file)
+        marker = facts_marker(dict(device, parentContainerKey='container_2'), fields=MARKER_FIELDS['devices'])
+        assert cache.get(facts_type='devices', key=device['key'], marker=marker) == {}
+        assert cache.hits == 0
+
+    def test_volatile_field_changed(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file)
+        marker = facts_marker(dict(device, status='Registered', lastSyncUp=1624000000000), fields=MARKER_FIELDS['devices'])
+        assert cache.get(facts_type='devices', key=device['key'], marker=marker) == DEVICE_CACHED_DETAILS
+        assert facts_marker(dict(device, status='Registered')) != facts_marker(device)
+
+    def test_marker_changed(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file, images_marker=2)
+        assert cache.get(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices'])) == {}
+
+    def test_image_assignment_changed(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = CV_FACTS['devices'][0]
+        marker = facts_marker(device, fields=MARKER_FIELDS['devices'])
+        bundles = [{'name': 'EOS-4.25.0F', 'applied': {'devices': ['veos01'], 'containers': []}},
+                   {'name': 'EOS-4.26.0F', 'applied': {'devices': ['veos02'], 'containers': []}}]
+        cache = build_cache(cache_file=cache_file, images_marker=bundles)
+        cache.set(facts_type='devices', key=device['key'], marker=marker, details=DEVICE_DETAILS)
+        cache.save()
+        # Bundles swapped between devices: same list of bundles, different assignments
+        bundles[0]['applied']['devices'], bundles[1]['applied']['devices'] = ['veos02'], ['veos01']
+        cache = build_cache(cache_file=cache_file, images_marker=bundles)
+        assert cache.get(facts_type='devices', key=device['key'], marker=marker) == {}
+
+    def test_marker_missing(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = CvFactsCache(cache_file=cache_file, host=CV_HOST, version=CV_VERSION)
+        assert cache.get(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices'])) == {}
+
+    @pytest.mark.parametrize('host, version', [(CV_HOST, '2021.2.0'), ('https://cv2.example.com:443/web', CV_VERSION)])
+    def test_cloudvision_changed(self, tmp_path, host, version):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file, host=host, version=version)
+        assert cache.get(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices'])) == {}
+
+    def test_keep_sections_not_collected(self, tmp_path):
+        cache_file = str(tmp_path / 'facts.json')
+        device = self.save_device(cache_file=cache_file)
+        cache = build_cache(cache_file=cache_file)
+        cache.set(facts_type='containers', key='root', marker='marker', details={'imageBundle': ''})
+        cache.save()
+        cache = build_cache(cache_file=cache_file)
+        assert cache.get(facts_type='devices', key=device['key'], marker=facts_marker(device, fields=MARKER_FIELDS['devices'])) == DEVICE_CACHED_DETAILS
+        assert cache.get(facts_type='containers', key='root', marker='marker') == {'imageBundle': ''}
+
+    def test_corrupted_file(self, tmp_path):
+        cache_file = tmp_path / 'facts.json'
+        cache_file.write_text('{not json')
+        cache = build_cache(cache_file=str(cache_file))
+        assert cache.get(facts_type='devices', key='50:8d:00:e3:78:aa', marker='marker') == {}
+
+
+@pytest.mark.generic
+class TestCvFactsWriter():
+    @pytest.mark.parametrize('compress', [False, True])
+    def test_write(self, tmp_path, compress):
+        output_file = str(tmp_path / 'facts.ndjson')
+        writer = CvFactsWriter(output_file=output_file, compress=compress)
+        for facts_type in ['devices', 'containers', 'configlets']:
+            for entry in CV_FACTS[facts_type]:
+                writer.write(facts_type=facts_type, data=entry)
+        writer.close()
+        assert writer.summary == {'devices': 2, 'containers': 2, 'configlets': 3}
+        with (gzip.open(output_file, 'rt') if compress else open(output_file, 'r')) as output:
+            lines = [json.loads(line) for line in output]
+        assert [line['data'] for line in lines if line['facts'] == 'devices'] == CV_FACTS['devices']
+        assert len(lines) == 7
+
+    def test_no_partial_output(self, tmp_path):
+        output_file = tmp_path / 'facts.ndjson'
+        writer = CvFactsWriter(output_file=str(output_file))
+        writer.write(facts_type='devices', data=CV_FACTS['devices'][0])
+        assert not output_file.exists()
+        writer.close()
+        assert output_file.exists()
+        # Output already moved to destination file is kept
+        writer.abort()
+        assert [path.name for path in tmp_path.iterdir()] == ['facts.ndjson']
+
+    @pytest.mark.parametrize('compress', [False, True])
+    def test_abort(self, tmp_path, compress):
+        output_file = tmp_path / 'facts.ndjson'
+        output_file.write_text('previous facts')
+        writer = CvFactsWriter(output_file=str(output_file), compress=compress)
+        writer.write(facts_type='devices', data=CV_FACTS['devices'][0])
+        writer.abort()
+        assert [path.name for path in tmp_path.iterdir()] == ['facts.ndjson']
+        assert output_file.read_text() == 'previous facts'
+        writer.abort()
+
+
+@pytest.mark.generic
+class TestCvFactsStore():
+    STORE_PARAMS = {'facts': ['all'], 'gather_subset': ['default']}
+
+    def test_set_get(self, tmp_path):
+        CvFactsStore(store_dir=str(tmp_path), host=CV_HOST).set(facts=CV_FACTS, params=self.STORE_PARAMS)
+        store = CvFactsStore(store_dir=str(tmp_path), host=CV_HOST)
+        assert store.get() == CV_FACTS
+        assert store.get(params=self.STORE_PARAMS) == CV_FACTS
+        assert store.get(params={'facts': ['devices'], 'gather_subset': ['default']}) is None
+        assert CvFactsStore(store_dir=str(tmp_path), host='https://cv2.example.com:443/web').get() is None
+
+    def test_expired(self, tmp_path):
+        CvFactsStore(store_dir=str(tmp_path), host=CV_HOST).set(facts=CV_FACTS, params=self.STORE_PARAMS)
+        assert CvFactsStore(store_dir=str(tmp_path), host=CV_HOST, ttl=-1).get() is None
+
+    def test_invalidate(self, tmp_path):
+        store = CvFactsStore(store_dir=str(tmp_path), host=CV_HOST)
+        store.set(facts=CV_FACTS, params=self.STORE_PARAMS)
+        store.invalidate()
+        assert CvFactsStore(store_dir=str(tmp_path), host=CV_HOST).get() is None
+
+    def test_changed_during_collection(self, tmp_path):
+        store = CvFactsStore(store_dir=str(tmp_path), host=CV_HOST)
+        time.sleep(0.01)
+        CvFactsStore(store_dir=str(tmp_path), host=CV_HOST).invalidate()
+        store.set(facts=CV_FACTS, params=self.STORE_PARAMS)
+        assert store.get() is None
+
+
+@pytest.mark.generic
+class TestCvFactsSelector():
+    @pytest.mark.parametrize('filter_mode, patterns', [('glob', ['veos0[1]', 'SYS_*']), ('regex', ['^veos01$', '^SYS_'])])
+    def test_is_selected(self, filter_mode, patterns):
+        selector = CvFactsSelector(filters={'devices': patterns, 'configlets': patterns}, filter_mode=filter_mode)
+        assert [device['hostname'] for device in CV_FACTS['devices']
+                if selector.is_selected(facts_type='devices', name=device['hostname'])] == ['veos01']
+        assert [configlet['key'] for configlet in CV_FACTS['configlets']
+                if selector.is_selected(facts_type='configlets', name=configlet['name'])] == ['configlet_2']
+        assert selector.is_selected(facts_type='containers', name='DC1_VEOS')
+
+    @pytest.mark.parametrize('options', [{'filter_mode': 'shell'}, {'filters': {'tasks': ['*']}},
+                                         {'filters': {'devices': 'veos01'}}, {'fields': {'images': ['name']}},
+                                         {'filters': {'devices': ['(']}, 'filter_mode': 'regex'}])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            CvFactsSelector(**options)
+
+    def test_fields(self):
+        selector = CvFactsSelector(fields={'devices': ['hostname', 'imageBundle']})
+        assert selector.is_wanted(facts_type='devices', field='imageBundle')
+        assert not selector.is_wanted(facts_type='devices', field='config')
+        assert selector.is_wanted(facts_type='configlets', field='config')
+        device = dict(CV_FACTS['devices'][0], **DEVICE_DETAILS)
+        assert selector.project(facts_type='devices', data=device) == {'hostname': 'veos01', 'imageBundle': 'EOS-4.25.0F'}
+        assert selector.project(facts_type='configlets', data=CV_FACTS['configlets'][0]) is CV_FACTS['configlets'][0]
+
+    def test_subtree(self):
+        containers = CV_FACTS['containers'] + [
+            {"name": "DC1_LEAFS", "key": "container_2", "parentName": "DC1_VEOS"},
+            {"name": "DC2", "key": "container_3", "parentId": "root"}]
+        containers[1] = dict(containers[1], parentName='Tenant')
+        selector = CvFactsSelector()
+        assert selector.subtree is None
+        assert selector.in_subtree(container_key='container_3')
+        assert selector.set_subtree(containers=containers, container_name='DC1_VEOS')
+        assert selector.subtree == {'container_1', 'container_2'}
+        assert not selector.in_subtree(container_key='container_3')
+        assert selector.set_subtree(containers=containers, container_name='Tenant')
+        assert selector.subtree == {'root', 'container_1', 'container_2', 'container_3'}
+        assert not selector.set_subtree(containers=containers, container_name='DC3')
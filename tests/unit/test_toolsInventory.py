@@ -0,0 +1,50 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.tools_inventory import find_hostname_by_mac, find_containerName_by_containerId
+from ansible_collections.arista.cvp.plugins.module_utils.tools_inventory import index_hostname_by_mac, index_containerName_by_containerId
+
+
+CV_INVENTORY = [
+    {"hostname": "veos01", "name": "veos01", "systemMacAddress": "50:8d:00:e3:78:aa"},
+    {"hostname": "veos02", "systemMacAddress": "50:8d:00:e3:78:bb"},
+    {"hostname": "veos03-duplicate", "systemMacAddress": "50:8d:00:e3:78:aa"},
+    {"systemMacAddress": "50:8d:00:e3:78:cc"},
+    {"hostname": "veos04"}
+]
+
+CV_CONTAINERS = [
+    {"Key": "root", "Name": "Tenant"},
+    {"Key": "container_1", "Name": "DC1_VEOS"},
+    {"Key": "container_1", "Name": "DC1_VEOS-duplicate"},
+    {"key": "container_2", "name": "DC2_VEOS"}
+]
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestToolsInventory():
+    @pytest.mark.parametrize('mac_address', ['50:8d:00:e3:78:aa', '50:8d:00:e3:78:bb', '50:8d:00:e3:78:cc', '50:8d:00:e3:78:dd'])
+    def test_index_hostname_by_mac(self, mac_address):
+        index = index_hostname_by_mac(inventory=CV_INVENTORY)
+        assert index.get(mac_address) == find_hostname_by_mac(inventory=CV_INVENTORY, mac_address=mac_address)
+        logging.info('Mac address {} indexed as {}'.format(mac_address, index.get(mac_address)))
+
+    @pytest.mark.parametrize('container_id', ['root', 'container_1', 'container_2'])
+    def test_index_containerName_by_containerId(self, container_id):
+        index = index_containerName_by_containerId(containers_list=CV_CONTAINERS)
+        assert index.get(container_id) == find_containerName_by_containerId(containers_list=CV_CONTAINERS, container_id=container_id)
+        logging.info('Container ID {} indexed as {}'.format(container_id, index.get(container_id)))
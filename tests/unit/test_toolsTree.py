@@ -0,0 +1,71 @@
+#!/usr/bin/python
+# coding: utf-8 -*-
+# pylint: disable=logging-format-interpolation
+# pylint: disable=dangerous-default-value
+# flake8: noqa: W503
+# flake8: noqa: W1202
+
+from __future__ import (absolute_import, division, print_function)
+import sys
+import json
+import logging
+import pytest
+sys.path.append("./")
+sys.path.append("../")
+sys.path.append("../../")
+from ansible_collections.arista.cvp.plugins.module_utils.tools_tree import tree_build_from_dict, tree_build_from_list, tree_to_list, tree_check_detached
+
+
+CONTAINERS_DICT = {'Fabric': {'parent_container': 'Tenant'},
+                   'Spines': {'parent_container': 'Fabric'},
+                   'MLAG02': {'parent_container': 'Leaves'},
+                   'Leaves': {'parent_container': 'Fabric'},
+                   'MLAG01': {'parent_container': 'Leaves'}}
+
+CONTAINERS_LIST = [{'name': 'MLAG02', 'parentName': 'Leaves'},
+                   {'name': 'Tenant', 'parentName': None},
+                   {'name': 'Leaves', 'parentName': 'Fabric'},
+                   {'name': 'Fabric', 'parentName': 'Tenant'},
+                   {'name': 'MLAG01', 'parentName': 'Leaves'},
+                   {'name': 'Spines', 'parentName': 'Fabric'}]
+
+CONTAINERS_TREE = {"Tenant": {"children": [{"Fabric": {"children": [{"Leaves": {"children": ["MLAG01", "MLAG02"]}}, "Spines"]}}]}}
+
+CONTAINERS_DETACHED = {'DC2': {'parent_container': 'Tenant'},
+                       'Leafs': {'parent_container': 'DC_ON_CV'},
+                       'POD01': {'parent_container': 'POD02'},
+                       'POD02': {'parent_container': 'POD01'}}
+
+# ---------------------------------------------------------------------------- #
+#   PYTEST
+# ---------------------------------------------------------------------------- #
+
+@pytest.mark.generic
+class TestTreeBuild():
+    def test_tree_build_from_dict(self):
+        tree = tree_build_from_dict(containers=CONTAINERS_DICT)
+        assert json.loads(tree) == CONTAINERS_TREE
+        logging.info('Tree built from dict: {}'.format(tree))
+
+    def test_tree_build_from_list(self):
+        tree = tree_build_from_list(containers=CONTAINERS_LIST)
+        assert json.loads(tree) == CONTAINERS_TREE
+        logging.info('Tree built from list: {}'.format(tree))
+
+    def test_tree_build_root_only(self):
+        assert json.loads(tree_build_from_dict(containers={})) == 'Tenant'
+        assert json.loads(tree_build_from_list(containers=[{'name': 'Tenant', 'parentName': None}])) == 'Tenant'
+
+    def test_tree_to_list(self):
+        ordered_list = tree_to_list(json_data=tree_build_from_dict(containers=CONTAINERS_DICT), myList=list())
+        assert ordered_list == ['Tenant', 'Fabric', 'Leaves', 'MLAG01', 'MLAG02', 'Spines']
+
+    def test_tree_build_detached(self):
+        tree = tree_build_from_dict(containers=CONTAINERS_DETACHED)
+        assert json.loads(tree) == {"Tenant": {"children": ["DC2"]}}
+
+    def test_tree_check_detached(self):
+        parents = {name: info['parent_container'] for name, info in CONTAINERS_DETACHED.items()}
+        orphans, cycles = tree_check_detached(parents=parents, detached=['Leafs', 'POD01', 'POD02'])
+        assert orphans == ['Leafs']
+        assert cycles == ['POD01', 'POD02']